@@ -0,0 +1,178 @@
+"""This module provides a stand-in for the Axis camera.
+
+It serves recorded JPEG files over HTTP at a fixed frame rate, using the same
+URLs as the camera:
+
+    /jpg/image.jpg      a single JPEG frame per request
+    /mjpg/video.mjpg    a continuous MJPEG stream
+
+The time each frame is served is recorded so the latency benchmark can match
+frames to the targets the robot receives.
+
+NOTE: THIS IS FOR TESTING ON A PC, NOT FOR THE ROBOT.
+
+"""
+
+import argparse
+import glob
+import os
+import threading
+import time
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+except ImportError:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+
+
+class _CameraServer(ThreadingMixIn, HTTPServer):
+    """HTTP server with a reference to the FakeCamera."""
+    daemon_threads = True
+    camera = None
+
+
+class _CameraHandler(BaseHTTPRequestHandler):
+    """Serves frames from the FakeCamera."""
+
+    BOUNDARY = 'myboundary'
+
+    def do_GET(self):
+        """Handle a request for a frame or a stream."""
+        camera = self.server.camera
+        path = self.path.split('?')[0]
+        if not camera.enabled:
+            self.send_error(503, "Camera not ready")
+        elif path == '/jpg/image.jpg':
+            frame = camera.next_frame()
+            self.send_response(200)
+            self.send_header('Content-Type', 'image/jpeg')
+            self.send_header('Content-Length', str(len(frame)))
+            self.end_headers()
+            self.wfile.write(frame)
+        elif path == '/mjpg/video.mjpg':
+            self.send_response(200)
+            self.send_header('Content-Type',
+                             'multipart/x-mixed-replace; boundary=' +
+                             self.BOUNDARY)
+            self.end_headers()
+            try:
+                while camera.enabled:
+                    frame = camera.next_frame()
+                    header = ('--%s\r\nContent-Type: image/jpeg\r\n'
+                              'Content-Length: %d\r\n\r\n' %
+                              (self.BOUNDARY, len(frame)))
+                    self.wfile.write(header.encode('ascii'))
+                    self.wfile.write(frame)
+                    self.wfile.write(b'\r\n')
+            except (IOError, OSError):
+                pass
+        else:
+            self.send_error(404)
+
+    def log_message(self, format, *args):
+        """Don't log every request."""
+        pass
+
+
+class FakeCamera(threading.Thread):
+    """An HTTP server that serves recorded frames at a fixed rate.
+
+    Attributes:
+        enabled: False to answer every request with an error.
+        frame_times: the time each frame was served, by frame number.
+
+    """
+    enabled = True
+    frame_times = None
+
+    _frames = None
+    _period = None
+    _next_frame_time = None
+    _lock = None
+    _server = None
+
+    def __init__(self, image_files, frame_rate=30.0, host='127.0.0.1', port=0):
+        """Create a fake camera.
+
+        Args:
+            image_files: a List of JPEG filenames to serve in order.
+            frame_rate: the most frames per second to serve.
+            host: the address to listen on.
+            port: the port to listen on (0 picks a free port).
+
+        """
+        threading.Thread.__init__(self)
+        self.daemon = True
+        self.enabled = True
+        self.frame_times = []
+        self._frames = []
+        for filename in image_files:
+            with open(filename, 'rb') as image:
+                self._frames.append(image.read())
+        if not self._frames:
+            raise ValueError("No frames to serve")
+        self._period = 1.0 / frame_rate
+        self._next_frame_time = 0.0
+        self._lock = threading.Lock()
+        self._server = _CameraServer((host, port), _CameraHandler)
+        self._server.camera = self
+
+    @property
+    def url(self):
+        """The single-frame URL of this camera."""
+        host, port = self._server.server_address[:2]
+        return 'http://%s:%d/jpg/image.jpg' % (host, port)
+
+    @property
+    def stream_url(self):
+        """The MJPEG stream URL of this camera."""
+        host, port = self._server.server_address[:2]
+        return 'http://%s:%d/mjpg/video.mjpg' % (host, port)
+
+    def next_frame(self):
+        """Wait for the next frame time and return the frame.
+
+        Returns:
+            The JPEG data for the frame.
+
+        """
+        with self._lock:
+            now = time.time()
+            if now < self._next_frame_time:
+                time.sleep(self._next_frame_time - now)
+                now = self._next_frame_time
+            self._next_frame_time = now + self._period
+            frame_number = len(self.frame_times)
+            self.frame_times.append(time.time())
+        return self._frames[frame_number % len(self._frames)]
+
+    def run(self):
+        """Serve requests until shutdown() is called."""
+        self._server.serve_forever()
+
+    def shutdown(self):
+        """Stop the server."""
+        self.enabled = False
+        self._server.shutdown()
+        self._server.server_close()
+
+
+# This lets us run this as a script
+if __name__ == '__main__':
+    default_images = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                  '..', '..', 'tests', 'files', 'input_*.jpg')
+    parser = argparse.ArgumentParser(description="Serve recorded camera "
+                                                 "frames over HTTP.")
+    parser.add_argument("images", nargs='*',
+                        help="JPEG files to serve (default: the test images)")
+    parser.add_argument("--host", default='127.0.0.1')
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--rate", type=float, default=30.0,
+                        help="frames per second")
+    args = parser.parse_args()
+    camera = FakeCamera(args.images or sorted(glob.glob(default_images)),
+                        args.rate, args.host, args.port)
+    print("Serving %s" % camera.url)
+    camera.run()
@@ -0,0 +1,160 @@
+"""This module measures the latency from camera capture to the robot.
+
+It starts a FakeCamera, a RobotHarness running the real target server, and
+optionally a DelayProxy between them, then runs the driver station's
+image_processor.py against them.  Each frame the camera serves produces one
+target message, so the k-th List of Targets put into the robot's queue is
+matched with the k-th frame.  Lists the robot never consumed (because a newer
+one replaced them in the queue) are counted as dropped.
+
+Example:
+    python3 latency_benchmark.py --python python2 --duration 20 --delay 0.02
+
+NOTE: THIS IS FOR TESTING ON A PC, NOT FOR THE ROBOT.
+
+"""
+
+import argparse
+import glob
+import os
+import subprocess
+import time
+
+import fake_camera
+import robot_harness
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+DRIVER_STATION_DIR = os.path.join(BENCH_DIR, '..', 'driver_station')
+DEFAULT_IMAGES = os.path.join(BENCH_DIR, '..', '..', 'tests', 'files',
+                              'input_*.jpg')
+
+
+def percentile(values, fraction):
+    """Return a percentile of a sorted List using the nearest rank.
+
+    Args:
+        values: the sorted List of values.
+        fraction: the percentile as a fraction (0.0 to 1.0).
+
+    Returns:
+        The value at the percentile.
+
+    """
+    index = int(round(fraction * (len(values) - 1)))
+    return values[index]
+
+
+def summarize(frame_times, records, duration):
+    """Build a report of latency and throughput.
+
+    Args:
+        frame_times: the time each frame was served, by frame number.
+        records: the RobotHarness records.
+        duration: the length of the measurement in seconds.
+
+    Returns:
+        A List of lines for the report.
+
+    """
+    capture_latency = []
+    queue_latency = []
+    for sequence, put_time, consume_time, targets in records:
+        if sequence >= len(frame_times):
+            continue
+        capture_latency.append(consume_time - frame_times[sequence])
+        queue_latency.append(consume_time - put_time)
+    lines = ["Frames served:       %d (%.1f/s)" %
+             (len(frame_times), len(frame_times) / duration),
+             "Messages consumed:   %d (%.1f/s)" %
+             (len(records), len(records) / duration)]
+    if records:
+        sent = records[-1][0] + 1
+        lines.append("Messages dropped:    %d" % (sent - len(records)))
+    for name, values in (("Capture to robot", capture_latency),
+                         ("Queue to robot", queue_latency)):
+        if not values:
+            continue
+        values.sort()
+        lines.append("%-20s min %6.1f  p50 %6.1f  p90 %6.1f  p99 %6.1f  "
+                     "max %6.1f ms" %
+                     (name + ':', values[0] * 1000,
+                      percentile(values, 0.5) * 1000,
+                      percentile(values, 0.9) * 1000,
+                      percentile(values, 0.99) * 1000,
+                      values[-1] * 1000))
+    return lines
+
+
+def run(args):
+    """Run the benchmark.
+
+    Args:
+        args: the parsed command line arguments.
+
+    Returns:
+        A List of lines for the report.
+
+    """
+    images = args.images or sorted(glob.glob(DEFAULT_IMAGES))
+    camera = fake_camera.FakeCamera(images, args.rate)
+    harness = robot_harness.RobotHarness(port=args.port,
+                                         loop_period=args.loop_period)
+    robot_address = ('127.0.0.1', args.port)
+    proxy = None
+    if args.delay > 0:
+        proxy = robot_harness.DelayProxy(robot_address, args.delay)
+        robot_address = proxy.address
+        proxy.start()
+
+    # Refuse frames until the driver station has had time to connect to the
+    # robot, so every frame served produces a message.
+    camera.enabled = False
+    camera.start()
+    harness.start()
+    processor = subprocess.Popen([args.python, 'image_processor.py',
+                                  '--robot-host', robot_address[0],
+                                  '--port', str(robot_address[1]),
+                                  '--camera-url', camera.url],
+                                 cwd=DRIVER_STATION_DIR,
+                                 stdout=subprocess.DEVNULL,
+                                 stderr=subprocess.DEVNULL)
+    try:
+        time.sleep(args.warmup)
+        camera.enabled = True
+        time.sleep(args.duration)
+        camera.enabled = False
+        # Let the last messages through before stopping
+        time.sleep(max(0.5, args.delay * 2))
+    finally:
+        processor.terminate()
+        processor.wait()
+        harness.stop()
+        camera.shutdown()
+        if proxy:
+            proxy.close()
+    return summarize(camera.frame_times, harness.records, args.duration)
+
+
+# This lets us run this as a script
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Measure the latency from "
+                                                 "camera capture to the "
+                                                 "robot.")
+    parser.add_argument("images", nargs='*',
+                        help="JPEG files to serve (default: the test images)")
+    parser.add_argument("--python", default='python2',
+                        help="the interpreter for the driver station code")
+    parser.add_argument("--port", type=int, default=1180,
+                        help="the port for the target server")
+    parser.add_argument("--rate", type=float, default=30.0,
+                        help="camera frames per second")
+    parser.add_argument("--delay", type=float, default=0.0,
+                        help="artificial delay to the robot in seconds")
+    parser.add_argument("--loop-period", type=float, default=0.01,
+                        help="the simulated robot loop period in seconds")
+    parser.add_argument("--warmup", type=float, default=2.0,
+                        help="seconds to let the driver station connect")
+    parser.add_argument("--duration", type=float, default=10.0,
+                        help="seconds to measure for")
+    for line in run(parser.parse_args()):
+        print(line)
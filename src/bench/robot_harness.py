@@ -0,0 +1,236 @@
+"""This module runs the robot's target server on a PC.
+
+The real target_server.ImageServer is started on the loopback interface with
+a queue that timestamps every List of Targets put into it.  A consumer thread
+stands in for the robot's control loop and records when each List is taken
+off the queue.  A DelayProxy can be placed between the driver station and the
+server to add artificial network delay.
+
+NOTE: THIS IS FOR TESTING ON A PC, NOT FOR THE ROBOT.
+
+"""
+
+import argparse
+import os
+import queue
+import select
+import socket
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..', 'robot'))
+
+import target_server
+
+
+class TimestampedQueue(queue.Queue):
+    """A Queue that records when each item was put into it.
+
+    Items are stored as (sequence number, put time, item) tuples.
+
+    """
+
+    _sequence = 0
+
+    def put(self, item, block=True, timeout=None):
+        """Put an item into the queue with its sequence number and time."""
+        queue.Queue.put(self, (self._sequence, time.time(), item), block,
+                        timeout)
+        self._sequence += 1
+
+
+class RobotHarness(object):
+    """Runs the target server and consumes Targets like the robot loop.
+
+    Attributes:
+        records: a List of (sequence number, put time, consume time, targets)
+            for every List of Targets the simulated robot consumed.
+
+    """
+    records = None
+
+    _server = None
+    _queue = None
+    _loop_period = None
+    _stop = None
+    _consumer = None
+
+    def __init__(self, host='127.0.0.1', port=1180, loop_period=0.01,
+                 telemetry_store=None):
+        """Create the harness (nothing runs until start() is called).
+
+        Args:
+            host: the address for the target server to listen on.
+            port: the port for the target server to listen on.
+            loop_period: the period of the simulated robot loop in seconds.
+            telemetry_store: the telemetry.Telemetry sent back to clients.
+
+        """
+        self.records = []
+        # The robot uses a queue of size 1 so it always sees the latest
+        self._queue = TimestampedQueue(1)
+        self._server = target_server.ImageServer(self._queue, port,
+                                                 telemetry_store, host=host)
+        self._server.daemon = True
+        self._loop_period = loop_period
+        self._stop = threading.Event()
+        self._consumer = threading.Thread(target=self._consume)
+        self._consumer.daemon = True
+
+    def start(self):
+        """Start the target server and the simulated robot loop."""
+        self._server.start()
+        self._consumer.start()
+
+    def stop(self):
+        """Stop the simulated robot loop and the target server."""
+        self._stop.set()
+        self._consumer.join()
+        self._server.shutdown()
+
+    def _consume(self):
+        """Take Targets off the queue once per loop, like the robot does."""
+        while not self._stop.is_set():
+            try:
+                sequence, put_time, targets = self._queue.get_nowait()
+            except queue.Empty:
+                pass
+            else:
+                self.records.append((sequence, put_time, time.time(),
+                                     targets))
+            self._stop.wait(self._loop_period)
+
+
+class DelayProxy(threading.Thread):
+    """A TCP proxy that delays data sent to the robot.
+
+    Data from the client is held for the delay before being forwarded; data
+    from the server is forwarded immediately.
+
+    """
+
+    _listener = None
+    _target_address = None
+    _delay = None
+
+    def __init__(self, target_address, delay, host='127.0.0.1', port=0):
+        """Create a proxy.
+
+        Args:
+            target_address: the (host, port) to forward connections to.
+            delay: the delay to add in seconds.
+            host: the address to listen on.
+            port: the port to listen on (0 picks a free port).
+
+        """
+        threading.Thread.__init__(self)
+        self.daemon = True
+        self._target_address = target_address
+        self._delay = delay
+        self._listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._listener.bind((host, port))
+        self._listener.listen(1)
+
+    @property
+    def address(self):
+        """The (host, port) the proxy listens on."""
+        return self._listener.getsockname()
+
+    def run(self):
+        """Accept connections and forward them until the listener closes."""
+        while True:
+            try:
+                client, _ = self._listener.accept()
+            except OSError:
+                break
+            try:
+                server = socket.create_connection(self._target_address)
+            except OSError:
+                client.close()
+                continue
+            for sock in (client, server):
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            pending = queue.Queue()
+            for thread in (threading.Thread(target=self._read_delayed,
+                                            args=(client, pending)),
+                           threading.Thread(target=self._write_delayed,
+                                            args=(server, pending)),
+                           threading.Thread(target=self._forward,
+                                            args=(server, client))):
+                thread.daemon = True
+                thread.start()
+
+    def close(self):
+        """Stop accepting connections."""
+        self._listener.close()
+
+    def _read_delayed(self, source, pending):
+        """Queue data from the source with the time it should be sent."""
+        while True:
+            try:
+                data = source.recv(4096)
+            except OSError:
+                data = b''
+            pending.put((time.time() + self._delay, data))
+            if not data:
+                break
+
+    def _write_delayed(self, destination, pending):
+        """Send queued data once its delay has passed."""
+        while True:
+            send_time, data = pending.get()
+            delay = send_time - time.time()
+            if delay > 0:
+                time.sleep(delay)
+            if not data:
+                self._finish(destination)
+                break
+            try:
+                destination.sendall(data)
+            except OSError:
+                break
+
+    def _forward(self, source, destination):
+        """Forward data from the source without delay."""
+        while True:
+            try:
+                select.select([source], [], [])
+                data = source.recv(4096)
+                if not data:
+                    break
+                destination.sendall(data)
+            except OSError:
+                break
+        self._finish(destination)
+
+    def _finish(self, sock):
+        """Pass on the end of the stream.
+
+        Another thread may be waiting on the socket, so shutdown() is used to
+        send the end of the stream; close() alone wouldn't send it.
+
+        """
+        try:
+            sock.shutdown(socket.SHUT_WR)
+        except OSError:
+            pass
+
+
+# This lets us run this as a script
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Run the robot's target "
+                                                 "server on this PC.")
+    parser.add_argument("--host", default='127.0.0.1')
+    parser.add_argument("--port", type=int, default=1180)
+    args = parser.parse_args()
+    harness = RobotHarness(args.host, args.port)
+    harness.start()
+    try:
+        while True:
+            time.sleep(1)
+            print("Consumed %d target messages" % len(harness.records))
+    except KeyboardInterrupt:
+        harness.stop()
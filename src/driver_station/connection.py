@@ -0,0 +1,276 @@
+"""This module provides non-blocking connection helpers.
+
+NOTE: THIS RUNS ON THE DRIVER STATION, NOT ON THE ROBOT.
+
+DO NOT UPLOAD TO THE ROBOT!!
+
+"""
+
+import errno
+import logging
+import os
+import random
+import select
+import socket
+import time
+
+# Results from a non-blocking connect() that mean it's still in progress
+_CONNECT_IN_PROGRESS = (errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EALREADY,
+                        getattr(errno, 'WSAEWOULDBLOCK', errno.EWOULDBLOCK))
+
+
+class Backoff(object):
+    """Bounded exponential backoff with jitter for reconnect attempts.
+
+    Each failure doubles the delay (up to a maximum) before the next attempt
+    is allowed.  A random jitter keeps retries from falling into lockstep.
+
+    Attributes:
+        failures: the number of failures since the last reset.
+
+    """
+    failures = 0
+
+    _initial_delay = None
+    _maximum_delay = None
+    _factor = None
+    _jitter = None
+    _delay = None
+    _next_attempt = None
+
+    def __init__(self, initial_delay=0.05, maximum_delay=2.0, factor=2.0,
+                 jitter=0.25):
+        """Create a Backoff.
+
+        Args:
+            initial_delay: the delay after the first failure, in seconds.
+            maximum_delay: the largest delay between attempts, in seconds.
+            factor: the multiplier applied to the delay after each failure.
+            jitter: the fraction of the delay to randomly add or remove.
+
+        """
+        self._initial_delay = initial_delay
+        self._maximum_delay = maximum_delay
+        self._factor = factor
+        self._jitter = jitter
+        self.reset()
+
+    def reset(self):
+        """Clear the backoff after a successful connection."""
+        self.failures = 0
+        self._delay = 0.0
+        self._next_attempt = 0.0
+
+    def failed(self, now=None):
+        """Record a failure and schedule the next attempt.
+
+        Args:
+            now: the current time (defaults to time.time()).
+
+        Returns:
+            The delay in seconds before the next attempt.
+
+        """
+        if now is None:
+            now = time.time()
+        if self._delay:
+            self._delay = min(self._delay * self._factor, self._maximum_delay)
+        else:
+            self._delay = self._initial_delay
+        delay = self._delay * (1.0 + random.uniform(-self._jitter,
+                                                    self._jitter))
+        self._next_attempt = now + delay
+        self.failures += 1
+        return delay
+
+    def ready(self, now=None):
+        """Return True if the next attempt is allowed."""
+        if now is None:
+            now = time.time()
+        return now >= self._next_attempt
+
+    def time_until_ready(self, now=None):
+        """Return the number of seconds until the next attempt is allowed."""
+        if now is None:
+            now = time.time()
+        return max(0.0, self._next_attempt - now)
+
+
+class RobotConnection(object):
+    """A TCP connection to the robot that reconnects without blocking.
+
+    Call poll() regularly; it starts a non-blocking connect when the backoff
+    allows it and finishes the connect when the socket becomes writable.
+    Any send failure closes the socket and schedules a reconnect.
+
+    """
+    DISCONNECTED = 0
+    CONNECTING = 1
+    CONNECTED = 2
+
+    state = DISCONNECTED
+
+    # Largest amount of unterminated data kept while waiting for a newline
+    MAX_LINE_LENGTH = 4096
+
+    _logger = None
+    _sock = None
+    _backoff = None
+    _connect_started = None
+    _receive_buffer = None
+
+    def __init__(self, host, port, connect_timeout=0.5, send_timeout=0.2,
+                 backoff=None, logger=None):
+        """Create a connection to the robot (it isn't opened until polled).
+
+        Args:
+            host: the robot's address.
+            port: the robot's target server port.
+            connect_timeout: seconds to wait for a connect to finish.
+            send_timeout: seconds to wait for a send to finish.
+            backoff: the Backoff used between connect attempts.
+            logger: the logger to report connection changes to.
+
+        """
+        self.host = host
+        self.port = port
+        self.connect_timeout = connect_timeout
+        self.send_timeout = send_timeout
+        self.state = self.DISCONNECTED
+        self._sock = None
+        self._connect_started = None
+        self._receive_buffer = b''
+        self._backoff = backoff if backoff else Backoff()
+        self._logger = logger if logger else logging.getLogger(__name__)
+
+    def is_connected(self):
+        """Return True if the connection is ready to send."""
+        return self.state == self.CONNECTED
+
+    def poll(self, now=None):
+        """Advance the connection without blocking.
+
+        Args:
+            now: the current time (defaults to time.time()).
+
+        Returns:
+            True if the connection is ready to send.
+
+        """
+        if self.state == self.CONNECTED:
+            return True
+        if now is None:
+            now = time.time()
+        if self.state == self.DISCONNECTED:
+            if not self._backoff.ready(now):
+                return False
+            self._start_connect(now)
+        if self.state == self.CONNECTING:
+            self._check_connect(now)
+        return self.state == self.CONNECTED
+
+    def send(self, data):
+        """Send data to the robot.
+
+        Args:
+            data: the bytes to send.
+
+        Returns:
+            True if the data was sent; False if not connected or it failed.
+
+        """
+        if self.state != self.CONNECTED:
+            return False
+        try:
+            self._sock.sendall(data)
+        except socket.error as excep:
+            self._failed("Connection error, disconnected: " + str(excep))
+            return False
+        return True
+
+    def read_lines(self):
+        """Read any complete lines the robot has sent, without blocking.
+
+        Returns:
+            A List of lines (without newlines) decoded as text.
+
+        """
+        if self.state != self.CONNECTED:
+            return []
+        try:
+            readable, _, _ = select.select([self._sock], [], [], 0)
+            if not readable:
+                return []
+            data = self._sock.recv(self.MAX_LINE_LENGTH)
+        except (select.error, socket.error) as excep:
+            self._failed("Connection error, disconnected: " + str(excep))
+            return []
+        if not data:
+            self._failed("Robot closed the connection.")
+            return []
+        lines = (self._receive_buffer + data).split(b'\n')
+        self._receive_buffer = lines.pop()
+        if len(self._receive_buffer) > self.MAX_LINE_LENGTH:
+            self._receive_buffer = b''
+        return [line.decode('utf-8') for line in lines if line]
+
+    def close(self):
+        """Close the connection."""
+        if self._sock:
+            try:
+                self._sock.close()
+            except socket.error:
+                pass
+        self._sock = None
+        self._receive_buffer = b''
+        self.state = self.DISCONNECTED
+
+    def _start_connect(self, now):
+        """Start a non-blocking connect to the robot."""
+        self._logger.info("Attempting to connect to robot...")
+        try:
+            self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self._sock.setblocking(0)
+            result = self._sock.connect_ex((self.host, self.port))
+        except socket.error as excep:
+            self._failed("Robot connection failed: " + str(excep))
+            return
+        if result == 0:
+            self._connected()
+        elif result in _CONNECT_IN_PROGRESS:
+            self._connect_started = now
+            self.state = self.CONNECTING
+        else:
+            self._failed("Robot connection failed: " + os.strerror(result))
+
+    def _check_connect(self, now):
+        """Check if a connect in progress has finished."""
+        try:
+            _, writable, errored = select.select([], [self._sock],
+                                                 [self._sock], 0)
+        except (select.error, socket.error) as excep:
+            self._failed("Robot connection failed: " + str(excep))
+            return
+        if writable or errored:
+            error = self._sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+            if error:
+                self._failed("Robot connection failed: " +
+                             os.strerror(error))
+            else:
+                self._connected()
+        elif now - self._connect_started > self.connect_timeout:
+            self._failed("Robot connection timed out.")
+
+    def _connected(self):
+        """Finish setting up a new connection."""
+        self._sock.settimeout(self.send_timeout)
+        self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.state = self.CONNECTED
+        self._backoff.reset()
+        self._logger.info("Connected to robot.")
+
+    def _failed(self, message):
+        """Close the socket and schedule the next connect attempt."""
+        self.close()
+        delay = self._backoff.failed()
+        self._logger.warn(message + " Retrying in %.2f seconds." % delay)
@@ -6,23 +6,50 @@ DO NOT UPLOAD TO THE ROBOT!!
 
 """
 
+import argparse
+import connection
 import json_helper
 import logging
-import socket
 import sys
 import target
 import targeting
+import telemetry
 import time
 
+# Targets are encoded using their declared fields
+json_helper.register_schema(target.Target, target.Target.FIELDS)
+
 
 class ImageProcessor(object):
-    """Gets targets and sends them to a tcp server."""
+    """Gets targets and sends them to a tcp server.
+
+    The camera and the robot connections recover independently: frames keep
+    being captured while the robot reconnects, and the robot link stays up
+    while the camera is retried.  Both retry with a bounded exponential
+    backoff instead of a fixed delay.
+
+    """
+    # Longest time to sleep while waiting to retry the camera
+    IDLE_SLEEP = 0.02
 
     _logger = None
     _targeting = None
+    _robot = None
+    _camera_backoff = None
+    _telemetry = None
+
+    def __init__(self, port=1180, log_handler=None, robot_host="10.0.94.2",
+                 camera_url=None):
+        """Initialize the image processor.
+
+        Args:
+            port: the robot's target server port.
+            log_handler: the logging handler to use (defaults to stdout).
+            robot_host: the robot's address.
+            camera_url: the URL of the camera image (defaults to the
+                Targeting.CAMERA_URL).
 
-    def __init__(self, port=1180, log_handler=None):
-        """Initialize the image processor."""
+        """
         self._logger = logging.getLogger(__name__)
         handler = None
         if log_handler:
@@ -37,91 +64,97 @@ class ImageProcessor(object):
         self._logger.setLevel(logging.DEBUG)
 
         self.port = port
-        self._sock = None
-        self._targeting = targeting.Targeting()
+        self._send_buffer = bytearray()
+        self._targeting = targeting.Targeting(camera_url=camera_url)
+        self._robot = connection.RobotConnection(robot_host, port,
+                                                 logger=self._logger)
+        self._camera_backoff = connection.Backoff()
+        self._telemetry = telemetry.TelemetryDecoder()
+
+    def get_telemetry(self):
+        """Return the latest telemetry values received from the robot.
+
+        Returns:
+            A dictionary of telemetry values (gyro_angle, range,
+            encoder_count, program_state and loop_time), or None if the
+            robot's telemetry isn't available.
+
+        """
+        if not self._robot.is_connected() or not self._telemetry.synchronized:
+            return None
+        return self._telemetry.values
 
     def process(self):
         """Gets images and sends them to the server."""
-        robot_connected = False
         camera_connected = False
         # Loop continuously
         while True:
-            # Try to connect to the robot
-            if not robot_connected:
-                try:
-                    self._logger.info("Attempting to connect to robot...")
-                    if self._sock == None:
-                        # Create a socket (SOCK_STREAM means a TCP socket)
-                        self._sock = socket.socket(socket.AF_INET,
-                                                   socket.SOCK_STREAM)
-                    # Connect to server and send data
-                    address = ("10.0.94.2", self.port)
-                    self._sock.connect(address)
-                    robot_connected = True
-                except KeyboardInterrupt:
-                    raise
-                except Exception as excep:
-                    self._logger.warn("Robot connection failed: " + str(excep))
-                    self._sock = None
-                    robot_connected = False
-            # Try to connect to the camera
-            if not camera_connected:
-                self._logger.info("Attempting to connect to the camera...")
-                if not self._targeting.open():
-                    self._logger.warn("Camera connection failed.")
-                    camera_connected = False
-                else:
-                    camera_connected = True
-            # If one of the two isn't connected, we can't continue yet
-            if not camera_connected or not robot_connected:
-                self._logger.info("Retrying in 5 seconds.")
-                time.sleep(5)
+            now = time.time()
+            # Keep the robot connection moving without blocking the camera
+            if self._robot.poll(now):
+                self._receive_telemetry()
+            else:
+                self._telemetry.synchronized = False
+
+            # Wait to retry the camera if it recently failed
+            if not self._camera_backoff.ready(now):
+                time.sleep(min(self._camera_backoff.time_until_ready(now),
+                               self.IDLE_SLEEP))
+                continue
+
+            # Get an image from the webcam
+            img = self._targeting.get_image()
+            if img is None:
+                if camera_connected:
+                    self._logger.warn("Camera connection lost.")
+                camera_connected = False
+                delay = self._camera_backoff.failed()
+                self._logger.info("Retrying camera in %.2f seconds." % delay)
                 continue
-            # Both connections are active; time to get to work
-            self._logger.info("Connected to both! Processing targets...")
-            # Loop as long as we're connected
-            while True:
-                try:
-                    data = None
-                    # Get an image from the webcam and process it into a List of
-                    # Targets
-                    targets = self._targeting.get_targets()
-                    if not targets:
-                        self._logger.debug("Got None from get_targets()")
-                        targets = []
-                    # If there weren't any targets, create a 'no targets' object
-                    if len(targets) <= 0:
-                        self._logger.debug("No targets found.")
-                        no_target = target.Target()
-                        no_target.no_targets = True
-                        targets.append(no_target)
-                    # Convert Target list to JSON and send it to the robot
-                    data = json_helper.to_json(targets)
-                    self._logger.debug("Sending: " + str(data))
-                    if data:
-                        # Python3
-                        #self._sock.send(bytes(data + '\n', "utf-8"))
-                        # Python2
-                        self._sock.send(bytes(data + '\n'))
-                # If anything fails, bail out and try to reconnect
-                except KeyboardInterrupt:
-                    raise
-                except Exception as excep:
-                    self._logger.error("Connection error, disconnected: " +
-                                       str(excep))
-                    if self._sock:
-                        self._sock.close()
-                    #self._targeting.close()
-                    self._sock = None
-                    break
-                # Wait before getting new targets
-                #time.sleep(0.2)
-            # Wait before trying to reconnect
-            time.sleep(1)
+            if not camera_connected:
+                self._logger.info("Connected to camera! Processing targets...")
+                camera_connected = True
+                self._camera_backoff.reset()
+
+            # Process the image into a List of Targets
+            try:
+                targets = self._targeting.find_targets(img)
+            except KeyboardInterrupt:
+                raise
+            except Exception as excep:
+                self._logger.error("Error finding targets: " + str(excep))
+                targets = []
+            if not targets:
+                self._logger.debug("No targets found.")
+                # If there weren't any targets, create a 'no targets' object
+                no_target = target.Target()
+                no_target.no_targets = True
+                targets = [no_target]
+
+            # Convert Target list to JSON and send it to the robot
+            if self._robot.poll():
+                if json_helper.write_json(targets, self._send_buffer):
+                    self._logger.debug("Sending: %s", self._send_buffer)
+                    self._robot.send(self._send_buffer)
+
+    def _receive_telemetry(self):
+        """Decode any telemetry records the robot has sent."""
+        for line in self._robot.read_lines():
+            if self._telemetry.decode(line):
+                self._logger.debug("Telemetry: %s", self._telemetry.values)
 
 # This lets us run this as a script
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Find vision targets and "
+                                                 "send them to the robot.")
+    parser.add_argument("--robot-host", default="10.0.94.2",
+                        help="the robot's address")
+    parser.add_argument("--port", type=int, default=1180,
+                        help="the robot's target server port")
+    parser.add_argument("--camera-url", default=targeting.Targeting.CAMERA_URL,
+                        help="the URL of the camera image")
+    args = parser.parse_args()
     # Create the Image Processor and start it
-    iproc = ImageProcessor()
+    iproc = ImageProcessor(port=args.port, robot_host=args.robot_host,
+                           camera_url=args.camera_url)
     iproc.process()
-
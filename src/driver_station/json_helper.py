@@ -2,47 +2,180 @@
 
 import json
 
+# Registered schemas: class -> tuple of field names, in output order
+_schemas = {}
+
+
+def _encode_float(value):
+    """Encode a float the same way json.dumps() does."""
+    if value != value:
+        return 'NaN'
+    elif value == float('inf'):
+        return 'Infinity'
+    elif value == -float('inf'):
+        return '-Infinity'
+    return repr(value)
+
+# Fast encoders for the scalar types found in a registered object.  These
+# produce exactly what json.dumps(_serialize(value)) would, including None
+# going out as the string "None" like every other unknown type.
+_SCALAR_ENCODERS = {
+    type(None): lambda value: '"None"',
+    bool: lambda value: 'true' if value else 'false',
+    int: int.__repr__,
+    float: _encode_float,
+}
+
+# Writes encoded text into a bytearray.  json.dumps() escapes everything to
+# ASCII, so on Python 2 the text can go straight into the buffer.
+if str is bytes:
+    def _buffer_writer(buf):
+        return buf.extend
+else:
+    def _buffer_writer(buf):
+        return lambda text: buf.extend(text.encode('ascii'))
+
+
+def register_schema(cls, fields):
+    """Register the fields that describe objects of a class.
+
+    Objects of a registered class are encoded straight from their attributes
+    in the order given, without copying their dictionary first.
+
+    Args:
+        cls: the class to register.
+        fields: a sequence of attribute names to encode.
+    """
+    _schemas[cls] = tuple(fields)
+
+
+def _serialize(obj):
+    """Recursive method to iterate through an object's properties.
+
+    Args:
+        obj: the object to iterate on.
+
+    Returns:
+        The JSON string representation of the object.
+    """
+    # Base types are fine
+    if isinstance(obj, (bool, int, float, str)):
+        return obj
+    # Recursively iterate through dictionaries
+    elif isinstance(obj, dict):
+        obj = obj.copy()
+        for key in obj:
+            obj[key] = _serialize(obj[key])
+        return obj
+    # Recursively iterate through lists
+    elif isinstance(obj, list):
+        return [_serialize(item) for item in obj]
+    # Recursively iterate through tuples
+    elif isinstance(obj, tuple):
+        return tuple(_serialize([item for item in obj]))
+    # Registered objects only contain their registered fields
+    elif type(obj) in _schemas:
+        return dict((field, _serialize(getattr(obj, field)))
+                    for field in _schemas[type(obj)])
+    # For other objects, serialize the dictionary of its properties
+    elif hasattr(obj, '__dict__'):
+        return _serialize(obj.__dict__)
+    # All else just pass through as a string
+    else:
+        return repr(obj)
+
+
+def _is_registered(obj):
+    """Check if an object (or every item of a List) has a registered schema."""
+    if isinstance(obj, list):
+        for item in obj:
+            if type(item) not in _schemas:
+                return False
+        return True
+    return type(obj) in _schemas
+
+
+def _write_object(obj, write):
+    """Write the JSON text for a registered object.
+
+    Args:
+        obj: the object to encode.
+        write: the callable that receives each piece of text.
+    """
+    separator = '{'
+    for field in _schemas[type(obj)]:
+        write(separator)
+        write(json.dumps(field))
+        write(': ')
+        value = getattr(obj, field)
+        encoder = _SCALAR_ENCODERS.get(type(value))
+        if encoder:
+            write(encoder(value))
+        else:
+            write(json.dumps(_serialize(value)))
+        separator = ', '
+    write('}' if separator == ', ' else '{}')
+
+
+def _write_registered(obj, write):
+    """Write a registered object, or a List of them, in a single pass.
+
+    Args:
+        obj: the object or List of objects to encode.
+        write: the callable that receives each piece of text.
+    """
+    if isinstance(obj, list):
+        write('[')
+        for index, item in enumerate(obj):
+            if index:
+                write(', ')
+            _write_object(item, write)
+        write(']')
+    else:
+        _write_object(obj, write)
+
 
 def to_json(obj):
     """Convert an object to JSON.
 
+    Registered objects (and Lists of them) are encoded directly from their
+    fields; everything else is walked recursively first.
+
     Args:
         obj: the object to convert.
 
     Returns:
         JSON-encoded object string.
     """
-    def serialize(obj):
-        """Recursive method to iterate through an object's properties.
-
-        Args:
-            obj: the object to iterate on.
-
-        Returns:
-            The JSON string representation of the object.
-        """
-        # Base types are fine
-        if isinstance(obj, (bool, int, float, str)):
-            return obj
-        # Recursively iterate through dictionaries
-        elif isinstance(obj, dict):
-            obj = obj.copy()
-            for key in obj:
-                obj[key] = serialize(obj[key])
-            return obj
-        # Recursively iterate through lists
-        elif isinstance(obj, list):
-            return [serialize(item) for item in obj]
-        # Recursively iterate through tuples
-        elif isinstance(obj, tuple):
-            return tuple(serialize([item for item in obj]))
-        # For other objects, serialize the dictionary of its properties
-        elif hasattr(obj, '__dict__'):
-            return serialize(obj.__dict__)
-        # All else just pass through as a string
-        else:
-            return repr(obj)
+    if _is_registered(obj):
+        pieces = []
+        _write_registered(obj, pieces.append)
+        return ''.join(pieces)
 
     # Serialize the object and convert to JSON
-    return json.dumps(serialize(obj))
+    return json.dumps(_serialize(obj))
+
+
+def write_json(obj, buf, suffix='\n'):
+    """Convert an object to JSON and write it into a reusable buffer.
+
+    The buffer is cleared first, so the same bytearray can be reused for
+    every message sent.
 
+    Args:
+        obj: the object to convert.
+        buf: the bytearray to write the encoded bytes into.
+        suffix: text appended after the JSON (a newline by default).
+
+    Returns:
+        The number of bytes in the buffer.
+    """
+    del buf[:]
+    write = _buffer_writer(buf)
+    if _is_registered(obj):
+        _write_registered(obj, write)
+    else:
+        write(json.dumps(_serialize(obj)))
+    if suffix:
+        write(suffix)
+    return len(buf)
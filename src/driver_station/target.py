@@ -1,5 +1,7 @@
 """This module describes information about vision targets."""
 
+import json
+
 
 class Side(object):
     """Enumeration for which side of the wall a target is on."""
@@ -10,27 +12,171 @@ class Side(object):
 
 
 class Target(object):
-    """Target information."""
-    side = None
-    distance = None
-    angle = None
-    is_hot = False
-    confidence = None
-    no_targets = False
+    """Target information.
+
+    Targets are created for every message sent between the driver station and
+    the robot, so they use slots instead of a dictionary.
+
+    """
+    # The fields sent to the robot, in order
+    FIELDS = ('side', 'distance', 'angle', 'is_hot', 'confidence', 'no_targets')
+
+    __slots__ = FIELDS
+
+    def __init__(self, side=None, distance=None, angle=None, is_hot=None,
+                 confidence=None, no_targets=False):
+        """Create a target.
+
+        The values can be passed by position (in FIELDS order) or by keyword.
+
+        Args:
+            side: the Side of the wall the target is on.
+            distance: the distance to the target.
+            angle: the angle to the target in degrees.
+            is_hot: True if the target is 'hot'.
+            confidence: the confidence score of the target.
+            no_targets: True if this marks a message with no targets.
+
+        """
+        self.side = side
+        self.distance = distance
+        self.angle = angle
+        self.is_hot = is_hot
+        self.confidence = confidence
+        self.no_targets = no_targets
+
+    @classmethod
+    def from_dict(cls, values):
+        """Create a target from a dictionary, ignoring unknown keys.
+
+        A target that doesn't say if it's hot isn't hot, so a missing
+        'is_hot' is False.
+
+        Args:
+            values: a dictionary with the values.
+
+        Returns:
+            The new Target.
+
+        """
+        get = values.get
+        return cls(get('side'), get('distance'), get('angle'),
+                   get('is_hot', False), get('confidence'),
+                   get('no_targets', False))
+
+
+def _more_confident(trg, best):
+    """Return True if trg has a higher confidence than best (or no best)."""
+    return best is None or (trg.confidence or 0) > (best.confidence or 0)
+
 
-    def __init__(self, **values):
-        """Create a target using a dictionary.
+class TargetSnapshot(object):
+    """The targets from one message, with the common selections made once.
+
+    A snapshot is built when a targets message arrives and isn't changed
+    afterwards, so every routine that reads it during a loop sees the same
+    targets without sorting or searching the list again.
+
+    Attributes:
+        targets: the tuple of Targets in the message.
+        nearest: the Target we're most closely facing, or None.
+        any_hot: True if any target is 'hot'.
+
+    """
+    __slots__ = ('targets', 'nearest', 'any_hot', '_best', '_hot')
+
+    def __init__(self, targets=()):
+        """Create a snapshot of a List of targets.
 
         Args:
-            **values: a keyword dictionary with the values.
+            targets: the Targets to include ('no targets' markers are left
+                out).
 
         """
-        if values:
-            self.__dict__.update(values)
-        else:
-            self.side = None
-            self.distance = None
-            self.angle = None
-            self.is_hot = None
-            self.confidence = None
-            self.no_targets = False
+        self.targets = tuple(trg for trg in targets if not trg.no_targets)
+        self.nearest = None
+        self.any_hot = False
+        self._best = {}
+        self._hot = set()
+        for trg in self.targets:
+            if (trg.angle is not None and
+                (self.nearest is None or
+                 abs(trg.angle) < abs(self.nearest.angle))):
+                self.nearest = trg
+            if _more_confident(trg, self._best.get(trg.side)):
+                self._best[trg.side] = trg
+            if _more_confident(trg, self._best.get(Side.EITHER)):
+                self._best[Side.EITHER] = trg
+            if trg.is_hot:
+                self.any_hot = True
+                self._hot.add(trg.side)
+
+    @classmethod
+    def from_message(cls, message):
+        """Create a snapshot from a message received from the driver station.
+
+        A message that isn't a List, or that only holds the 'no targets'
+        marker, gives an empty snapshot.
+
+        Args:
+            message: the List of Targets that was received.
+
+        Returns:
+            The new TargetSnapshot.
+
+        """
+        if not isinstance(message, list):
+            return cls()
+        return cls(message)
+
+    def __len__(self):
+        return len(self.targets)
+
+    def __repr__(self):
+        return "TargetSnapshot(%d targets, any_hot=%s)" % (len(self.targets),
+                                                          self.any_hot)
+
+    def get_best(self, side):
+        """Get the target on a side with the highest confidence.
+
+        Args:
+            side: the Side of the wall (Side.EITHER for any side).
+
+        Returns:
+            The Target, or None if there isn't one on that side.
+
+        """
+        return self._best.get(side)
+
+    def is_hot(self, side):
+        """Return True if a target on a side is 'hot'.
+
+        Args:
+            side: the Side of the wall (Side.EITHER for any side).
+
+        """
+        if side == Side.EITHER:
+            return self.any_hot
+        return side in self._hot
+
+
+def decode_targets(data):
+    """Build a List of Targets straight from a JSON message.
+
+    Each JSON object is turned into a Target while it's being parsed, so no
+    intermediate dictionaries are kept.
+
+    Args:
+        data: the JSON string containing a List of targets.
+
+    Returns:
+        A List of Targets, or None if the message isn't a List.
+
+    Raises:
+        ValueError: if the message isn't valid JSON.
+
+    """
+    decoded = json.loads(data, object_hook=Target.from_dict)
+    if not isinstance(decoded, list):
+        return None
+    return [item for item in decoded if isinstance(item, Target)]
@@ -43,6 +43,7 @@ class Targeting(object):
     #              "resolution=640x480&dummy=param.mjpg")
     #CAMERA_URL = r"http://10.0.94.11/mjpg/video.mjpg"
     CAMERA_URL = r"http://10.0.94.11/jpg/image.jpg"
+    CAMERA_TIMEOUT = 1
     CAMERA_VIEW_ANGLE = 49
     CAMERA_RES_HEIGHT = 640
     CAMERA_RES_WIDTH = 480
@@ -52,6 +53,7 @@ class Targeting(object):
     ASPECT_RATIO_THRESHOLD = 55
 
     _logger = None
+    _camera_url = None
 
     #_vcap = None
 
@@ -59,7 +61,15 @@ class Targeting(object):
         #"""Create a Targeting object and Video Capture for the camera."""
         #self._vcap = cv2.VideoCapture()
 
-    def __init__(self, log_handler=None):
+    def __init__(self, log_handler=None, camera_url=None):
+        """Create a Targeting object.
+
+        Args:
+            log_handler: the logging handler to use (defaults to stdout).
+            camera_url: the URL of the camera image (defaults to CAMERA_URL).
+
+        """
+        self._camera_url = camera_url if camera_url else self.CAMERA_URL
         self._logger = logging.getLogger(__name__)
         handler = None
         if log_handler:
@@ -79,7 +89,8 @@ class Targeting(object):
         #return self._vcap.open(self.CAMERA_URL)
         retval = False
         try:
-            stream = urllib2.urlopen(self.CAMERA_URL, None, 1)
+            stream = urllib2.urlopen(self._camera_url, None,
+                                     self.CAMERA_TIMEOUT)
             stream.close()
             retval = True
         except Exception as excep:
@@ -101,7 +112,8 @@ class Targeting(object):
         #return cv2.imread('input.jpg')
         img = None
         try:
-            stream = urllib2.urlopen(self.CAMERA_URL, None, 1)
+            stream = urllib2.urlopen(self._camera_url, None,
+                                     self.CAMERA_TIMEOUT)
             data = stream.read()
             stream.close()
             img = cv2.imdecode(np.fromstring(data, dtype=np.uint8),
@@ -170,7 +182,10 @@ class Targeting(object):
         img = self.get_image()
         if img == None:
             return []
+        return self.find_targets(img)
 
+    def find_targets(self, img):
+        """Search an image for targets and return a list of Targets."""
         # Convert to HSV
         hsv = cv2.cvtColor(img, cv2.cv.CV_BGR2HSV)
 
@@ -0,0 +1,164 @@
+"""This module describes the telemetry the robot sends to the driver station.
+
+Telemetry records are sent back over the target connection as one compact
+JSON object per line.  Values are quantized to integers and each record only
+contains the fields that changed since the previous one, as differences.
+Every so often (and whenever a field appears or disappears) a key record with
+the full values is sent instead.
+
+"""
+
+import json
+import threading
+
+
+# Telemetry fields: (name, wire key, resolution)
+FIELDS = (('gyro_angle', 'g', 0.1),
+          ('range', 'r', 0.1),
+          ('encoder_count', 'e', 1),
+          ('program_state', 's', 1),
+          ('loop_time', 'l', 0.0001))
+
+
+class Telemetry(object):
+    """Thread-safe store of the latest telemetry values.
+
+    The robot updates the values from its control loop, and the target server
+    reads them from its connection threads.
+
+    """
+    _lock = None
+    _values = None
+
+    def __init__(self):
+        """Create a Telemetry store with no values."""
+        self._lock = threading.Lock()
+        self._values = dict.fromkeys(field[0] for field in FIELDS)
+
+    def update(self, **values):
+        """Store new telemetry values.
+
+        Args:
+            **values: the telemetry field names and their values.
+
+        """
+        with self._lock:
+            self._values.update(values)
+
+    def get_values(self):
+        """Return a copy of the latest telemetry values."""
+        with self._lock:
+            return dict(self._values)
+
+
+class TelemetryEncoder(object):
+    """Delta-encodes telemetry values into JSON lines."""
+
+    _key_interval = None
+    _sequence = 0
+    _previous = None
+
+    def __init__(self, key_interval=50):
+        """Create an encoder.
+
+        Args:
+            key_interval: the number of records between key records.
+
+        """
+        self._key_interval = key_interval
+        self._sequence = 0
+        self._previous = None
+
+    def encode(self, values):
+        """Encode telemetry values into a record.
+
+        Args:
+            values: a dictionary of telemetry field names and values.
+
+        Returns:
+            The JSON string for the record (without a newline).
+
+        """
+        current = {}
+        for name, key, resolution in FIELDS:
+            value = values.get(name)
+            if value is not None:
+                current[key] = int(round(value / resolution))
+
+        record = {'n': self._sequence}
+        if (self._previous is None or
+            self._sequence % self._key_interval == 0 or
+            set(current) != set(self._previous)):
+            record['k'] = 1
+            record.update(current)
+        else:
+            for key, value in current.items():
+                if value != self._previous[key]:
+                    record[key] = value - self._previous[key]
+
+        self._previous = current
+        self._sequence += 1
+        return json.dumps(record, separators=(',', ':'), sort_keys=True)
+
+
+class TelemetryDecoder(object):
+    """Rebuilds telemetry values from encoded records.
+
+    Attributes:
+        values: the latest decoded telemetry values.
+        synchronized: True once a key record has been received and no records
+            have been missed since.
+
+    """
+    values = None
+    synchronized = False
+
+    _quantized = None
+    _next_sequence = None
+
+    def __init__(self):
+        """Create a decoder with no values."""
+        self.values = dict.fromkeys(field[0] for field in FIELDS)
+        self.synchronized = False
+        self._quantized = {}
+        self._next_sequence = None
+
+    def decode(self, line):
+        """Apply an encoded record to the current values.
+
+        Args:
+            line: the JSON string for the record.
+
+        Returns:
+            True if the values were updated.
+
+        """
+        try:
+            record = json.loads(line)
+        except ValueError:
+            return False
+        if not isinstance(record, dict) or 'n' not in record:
+            return False
+
+        if record.get('k'):
+            self._quantized = {}
+            for name, key, resolution in FIELDS:
+                if key in record:
+                    self._quantized[key] = record[key]
+            self.synchronized = True
+        elif not self.synchronized or record['n'] != self._next_sequence:
+            # Deltas are useless after a missed record; wait for a key record
+            self.synchronized = False
+            return False
+        else:
+            for key in self._quantized:
+                if key in record:
+                    self._quantized[key] += record[key]
+
+        self._next_sequence = record['n'] + 1
+        for name, key, resolution in FIELDS:
+            if key in self._quantized:
+                self.values[name] = self._quantized[key] * resolution
+            else:
+                self.values[name] = None
+        return True
@@ -4,6 +4,7 @@ Packages required:
     - os
     - csv
     - glob
+    - inspect
     - text_utilities
 
 """
@@ -12,6 +13,7 @@ Packages required:
 import os
 import csv
 import glob
+import inspect
 from text_utilities import convert_to_number
 
 
@@ -39,6 +41,266 @@ class AutoScriptCommand(object):
         self.parameters = p
 
 
+# Commands that start and end a group of concurrent commands
+GROUP_ALL = 'group_all'
+GROUP_ANY = 'group_any'
+END_GROUP = 'end_group'
+
+
+class AutoScriptStep(object):
+    """A compiled autoscript command that is ready to run.
+
+    The method is either called once per loop until it returns True, or, if
+    it's a generator function, its generator is advanced once per loop until
+    it finishes.
+
+    Attributes:
+        command: the autonomous command.
+        method: the bound method that performs the command.
+        parameters: the tuple of parameters passed to the method.
+        reset: the bound method called before the command starts, or None.
+        requirements: the tuple of subsystems the command uses.
+        stop_hooks: the tuple of methods that stop the command's subsystems.
+
+    """
+    # Public member variables
+    command = None
+    method = None
+    parameters = None
+    reset = None
+    requirements = ()
+    stop_hooks = ()
+
+    # Private member variables
+    _is_generator = False
+    _generator = None
+
+    def __init__(self, command, method, parameters, reset=None,
+                 requirements=(), stop_hooks=()):
+        """Create and initialize an AutoScriptStep.
+
+        Args:
+            command: the autonomous command.
+            method: the bound method that performs the command.
+            parameters: the tuple of parameters passed to the method.
+            reset: the bound method called before the command starts.
+            requirements: the tuple of subsystems the command uses.
+            stop_hooks: the methods that stop the command's subsystems.
+
+        """
+        self.command = command
+        self.method = method
+        self.parameters = parameters
+        self.reset = reset
+        self.requirements = tuple(requirements)
+        self.stop_hooks = tuple(stop_hooks)
+        self._is_generator = inspect.isgeneratorfunction(method)
+        self._generator = None
+
+    def start(self):
+        """Prepare to run the command."""
+        if self.reset:
+            self.reset()
+        if self._is_generator:
+            self._generator = self.method(*self.parameters)
+
+    def run(self):
+        """Run the command for one loop.
+
+        Returns:
+            True when the command is complete.
+
+        """
+        if not self._is_generator:
+            return self.method(*self.parameters)
+        if not self._generator:
+            self._generator = self.method(*self.parameters)
+        try:
+            next(self._generator)
+        except StopIteration:
+            self._generator = None
+            return True
+        return False
+
+    def stop(self):
+        """Stop the command's subsystems before it has finished."""
+        if self._generator:
+            self._generator.close()
+            self._generator = None
+        for hook in self.stop_hooks:
+            hook()
+
+
+class GroupStep(object):
+    """A group of autoscript steps that run at the same time.
+
+    Every member runs once per loop until it completes.  A 'group_all'
+    finishes when all of its members have finished; a 'group_any' finishes
+    as soon as one of them does, and stops the rest.
+
+    Attributes:
+        command: 'group_all' or 'group_any'.
+        members: the List of AutoScriptSteps in the group.
+        wait_for_all: True if every member has to finish.
+        requirements: the tuple of subsystems used by the members.
+
+    """
+    # Public member variables
+    command = None
+    members = None
+    wait_for_all = True
+    requirements = ()
+
+    # Private member variables
+    _finished = None
+
+    def __init__(self, command, members):
+        """Create and initialize a GroupStep.
+
+        Args:
+            command: 'group_all' or 'group_any'.
+            members: the List of AutoScriptSteps in the group.
+
+        """
+        self.command = command
+        self.members = members
+        self.wait_for_all = (command == GROUP_ALL)
+        requirements = []
+        for member in members:
+            requirements.extend(member.requirements)
+        self.requirements = tuple(requirements)
+        self._finished = [False] * len(members)
+
+    def start(self):
+        """Prepare every member to run."""
+        self._finished = [False] * len(self.members)
+        for member in self.members:
+            member.start()
+
+    def run(self):
+        """Run each unfinished member for one loop.
+
+        Returns:
+            True when the group is complete.
+
+        """
+        for index, member in enumerate(self.members):
+            if not self._finished[index]:
+                self._finished[index] = bool(member.run())
+        if self.wait_for_all:
+            return all(self._finished)
+        if any(self._finished):
+            self.stop()
+            return True
+        return False
+
+    def stop(self):
+        """Stop the members that haven't finished."""
+        for index, member in enumerate(self.members):
+            if not self._finished[index]:
+                member.stop()
+
+
+class AutoScriptPlan(object):
+    """A compiled autoscript.
+
+    Attributes:
+        steps: the List of AutoScriptSteps, in order.
+        errors: a List of messages for commands that couldn't be compiled.
+
+    """
+    # Public member variables
+    steps = None
+    errors = None
+
+    # Private member variables
+    _index = 0
+
+    def __init__(self, steps, errors):
+        """Create and initialize an AutoScriptPlan.
+
+        Args:
+            steps: the List of AutoScriptSteps, in order.
+            errors: a List of messages for commands that couldn't be compiled.
+
+        """
+        self.steps = steps
+        self.errors = errors
+        self._index = 0
+
+    def restart(self):
+        """Start again from the first step."""
+        self._index = 0
+
+    def get_next_step(self):
+        """Get the next step of the plan.
+
+        Returns:
+            The next AutoScriptStep, or None if there are no more steps.
+
+        """
+        if self._index >= len(self.steps):
+            return None
+        step = self.steps[self._index]
+        self._index += 1
+        return step
+
+
+def _check_arity(method, count):
+    """Check if a method can be called with a number of parameters.
+
+    Args:
+        method: the bound method.
+        count: the number of parameters.
+
+    Returns:
+        An error message, or None if the parameters fit (or the signature
+        can't be inspected).
+
+    """
+    try:
+        spec = inspect.getfullargspec(method)
+    except TypeError:
+        return None
+    # Bound methods still list 'self'
+    maximum = len(spec.args) - (1 if inspect.ismethod(method) else 0)
+    minimum = maximum - len(spec.defaults or ())
+    if count < minimum or (count > maximum and not spec.varargs):
+        if minimum == maximum or spec.varargs:
+            expected = str(minimum)
+        else:
+            expected = "%d to %d" % (minimum, maximum)
+        return "expects %s parameters, got %d" % (expected, count)
+    return None
+
+
+def _check_group(members):
+    """Check that the members of a group can run at the same time.
+
+    Args:
+        members: the List of AutoScriptSteps in the group.
+
+    Returns:
+        An error message, or None if there are no conflicts.
+
+    """
+    used = {}
+    timers = {}
+    for member in members:
+        for subsystem in member.requirements:
+            if subsystem in used:
+                return ("'%s' and '%s' both use the %s" %
+                        (used[subsystem], member.command, subsystem))
+            used[subsystem] = member.command
+        if member.reset:
+            timer = id(member.reset.__self__)
+            if timer in timers:
+                return ("'%s' and '%s' share a timer" %
+                        (timers[timer], member.command))
+            timers[timer] = member.command
+    return None
+
+
 class AutoScript(object):
     """Reads autonomous robot sequences from a file into memory."""
 
@@ -93,7 +355,7 @@ class AutoScript(object):
                             cmd = column
                         else:
                             num = convert_to_number(column)
-                            if num:
+                            if num is not None:
                                 params.append(num)
                             else:
                                 params.append(column)
@@ -107,6 +369,127 @@ class AutoScript(object):
         self._command_iterator = iter(self._commands)
         return self._commands
 
+    def compile(self, owners, reset_name='reset_and_start_timer',
+                subsystems=None, requirements=None, stop_hooks=None):
+        """Resolve the parsed commands into a plan of ready-to-run steps.
+
+        Each command is looked up as a public method of the first owner that
+        has it, and its parameters are checked against the method's
+        signature.  Commands with '_time' in their name also get the owner's
+        timer reset method, which is called before the command starts.
+        Compiling stops at an 'end' or 'invalid' command.
+
+        Commands between 'group_all' or 'group_any' and 'end_group' are
+        compiled into a GroupStep.  Members of a group may not use the same
+        subsystem or the same timer.
+
+        Args:
+            owners: the objects to search for command methods, in order.
+            reset_name: the name of the timer reset method.
+            subsystems: a dictionary of owner object to the name of the
+                subsystem all of its commands use.
+            requirements: a dictionary of command name to a tuple of the
+                subsystems it uses (overrides the owner's subsystem).
+            stop_hooks: a dictionary of subsystem name to the method that
+                stops it.
+
+        Returns:
+            The AutoScriptPlan.  Commands that couldn't be compiled are left
+            out of the steps and described in the errors.
+
+        """
+        steps = []
+        errors = []
+        group = None
+        group_command = None
+        group_number = None
+        for number, cmd in enumerate(self._commands or [], 1):
+            if cmd.command in ('end', 'invalid'):
+                break
+
+            if cmd.command in (GROUP_ALL, GROUP_ANY):
+                if group is not None:
+                    errors.append("Command %d: groups can't be nested" %
+                                  number)
+                    continue
+                group = []
+                group_command = cmd.command
+                group_number = number
+            elif cmd.command == END_GROUP:
+                if group is None:
+                    errors.append("Command %d: '%s' without a group" %
+                                  (number, END_GROUP))
+                    continue
+                error = _check_group(group)
+                if error:
+                    errors.append("Command %d: %s" % (group_number, error))
+                elif group:
+                    steps.append(GroupStep(group_command, group))
+                group = None
+            else:
+                step, error = self._compile_command(cmd, owners, reset_name,
+                                                    subsystems or {},
+                                                    requirements or {},
+                                                    stop_hooks or {})
+                if error:
+                    errors.append("Command %d: %s" % (number, error))
+                elif group is not None:
+                    group.append(step)
+                else:
+                    steps.append(step)
+
+        if group is not None:
+            errors.append("Command %d: '%s' has no '%s'" %
+                          (group_number, group_command, END_GROUP))
+        return AutoScriptPlan(steps, errors)
+
+    def _compile_command(self, cmd, owners, reset_name, subsystems,
+                         requirements, stop_hooks):
+        """Compile a single command into an AutoScriptStep.
+
+        Returns:
+            A tuple of the AutoScriptStep (or None) and an error message (or
+            None).
+
+        """
+        # Drop empty trailing columns (e.g. from a trailing comma)
+        parameters = list(cmd.parameters)
+        while parameters and parameters[-1] == '':
+            parameters.pop()
+        parameters = tuple(parameters)
+
+        owner = None
+        method = None
+        if not cmd.command.startswith('_'):
+            for obj in owners:
+                candidate = getattr(obj, cmd.command, None)
+                if obj is not None and callable(candidate):
+                    owner = obj
+                    method = candidate
+                    break
+        if not method:
+            return None, "unknown command '%s'" % cmd.command
+
+        error = _check_arity(method, len(parameters))
+        if error:
+            return None, "'%s' %s" % (cmd.command, error)
+
+        reset = None
+        if '_time' in cmd.command:
+            reset = getattr(owner, reset_name, None)
+            if not callable(reset):
+                return None, "'%s' has no %s" % (cmd.command, reset_name)
+
+        if cmd.command in requirements:
+            needs = tuple(requirements[cmd.command])
+        elif owner in subsystems:
+            needs = (subsystems[owner],)
+        else:
+            needs = ()
+        hooks = [stop_hooks[name] for name in needs if name in stop_hooks]
+        return AutoScriptStep(cmd.command, method, parameters, reset, needs,
+                              hooks), None
+
     def get_available_scripts(self, path=None):
         """Get a list of autoscript files in the current directory.
 
@@ -134,3 +517,104 @@ class AutoScript(object):
                 cmd = None
         return cmd
 
+
+class AutoScriptLibrary(object):
+    """Keeps every autoscript in a directory parsed and compiled.
+
+    Compiled plans are cached by filename along with the file's modification
+    time, so refreshing only parses files that are new or have changed.
+    Getting a plan never touches the disk.
+
+    """
+    # Private member variables
+    _path = None
+    _owners = None
+    _subsystems = None
+    _requirements = None
+    _stop_hooks = None
+    _plans = None
+    _mtimes = None
+    _filenames = None
+
+    def __init__(self, path, owners, subsystems=None, requirements=None,
+                 stop_hooks=None):
+        """Create and initialize an AutoScriptLibrary.
+
+        Args:
+            path: the directory containing the autoscript files.
+            owners: the objects to search for command methods, in order.
+            subsystems: a dictionary of owner object to subsystem name.
+            requirements: a dictionary of command name to the subsystems it
+                uses.
+            stop_hooks: a dictionary of subsystem name to the method that
+                stops it.
+
+        """
+        self._path = path
+        self._owners = owners
+        self._subsystems = subsystems
+        self._requirements = requirements
+        self._stop_hooks = stop_hooks
+        self._plans = {}
+        self._mtimes = {}
+        self._filenames = []
+
+    def refresh(self):
+        """Parse and compile any scripts that are new or have changed.
+
+        Returns:
+            A List of the filenames that were compiled.
+
+        """
+        script = AutoScript()
+        filenames = sorted(script.get_available_scripts(self._path))
+        compiled = []
+        for filename in filenames:
+            try:
+                mtime = os.path.getmtime(filename)
+            except OSError:
+                continue
+            if filename in self._plans and self._mtimes[filename] == mtime:
+                continue
+            if script.parse(filename) is None:
+                continue
+            self._plans[filename] = script.compile(self._owners,
+                                        subsystems=self._subsystems,
+                                        requirements=self._requirements,
+                                        stop_hooks=self._stop_hooks)
+            self._mtimes[filename] = mtime
+            compiled.append(filename)
+
+        # Forget scripts that have been removed
+        for filename in list(self._plans):
+            if filename not in filenames:
+                del self._plans[filename]
+                del self._mtimes[filename]
+        self._filenames = [filename for filename in filenames
+                           if filename in self._plans]
+        return compiled
+
+    def get_filenames(self):
+        """Get the filenames of the compiled scripts.
+
+        Returns:
+            A sorted List of filenames.
+
+        """
+        return self._filenames
+
+    def get_plan(self, filename):
+        """Get the compiled plan for a script, ready to start.
+
+        Args:
+            filename: the script's filename.
+
+        Returns:
+            The AutoScriptPlan (restarted), or None if the script isn't in
+            the library.
+
+        """
+        plan = self._plans.get(filename)
+        if plan:
+            plan.restart()
+        return plan
@@ -10,9 +10,11 @@ except ImportError:
     from pyfrc import wpilib
 import common
 import datalog
+import motionprofile
+import odometry
 import parameters
+import pid
 import stopwatch
-import time
 import ultrasonic
 
 
@@ -22,6 +24,10 @@ class DriveTrain(object):
     Provides an interface to manually or autonomously drive the robot, including
     the use of sensors to faciliatate driving.
 
+    The sensor based movements (turning to a heading, driving a distance or
+    to a range) slow down near the goal using far/medium/near speed ratios,
+    or, if PID_CONTROL_ENABLED is set, using PID controllers.
+
     Attributes:
         drivetrain_enabled: True if the DriveTrain is fully functional
             (default False).
@@ -47,6 +53,14 @@ class DriveTrain(object):
     _acceleration_timer = None
     _range_finder = None
     _movement_timer = None
+    _stop_action = None
+    _sampler = None
+    _odometry = None
+    _heading_pid = None
+    _distance_pid = None
+    _range_pid = None
+    _profile_pid = None
+    _profile_timer = None
 
     # Private parameters
     _normal_linear_speed_ratio = 0
@@ -77,6 +91,32 @@ class DriveTrain(object):
     _auto_medium_heading_threshold = 0
     _auto_far_heading_threshold = 0
     _accelerometer_axis = 0
+    _acceleration_scale = 0
+    _odometry_acceleration_variance = 0
+    _odometry_range_variance = 0
+    _odometry_range_heading_tolerance = 0
+    _odometry_range_max_speed = 0
+    _drive_distance_lookahead = 0
+    _range_filter_window = 0
+    _range_filter_percentile = 0
+    _range_filter_decimation = 0
+    _range_filter_decimation_period = 0
+    _range_filter_floor = 0
+    _pid_control_enabled = False
+    _heading_pid_p = 0
+    _heading_pid_i = 0
+    _heading_pid_d = 0
+    _heading_pid_feed_forward = 0
+    _heading_pid_integral_limit = 0
+    _distance_pid_p = 0
+    _distance_pid_i = 0
+    _distance_pid_d = 0
+    _distance_pid_feed_forward = 0
+    _distance_pid_integral_limit = 0
+    _drive_profile_max_velocity = 0
+    _drive_profile_max_acceleration = 0
+    _drive_profile_velocity_gain = 0
+    _drive_profile_settle_time = 0
 
     # Private member variables
     _log_enabled = False
@@ -90,6 +130,9 @@ class DriveTrain(object):
     _previous_turn_speed = 0
     _adjustment_in_progress = False
     _range = None
+    _last_acceleration_time = None
+    _drive_profile = None
+    _drive_profile_start = 0.0
 
     def __init__(self, params="drivetrain.par", logging_enabled=False):
         """Create and initialize a DriveTrain.
@@ -122,6 +165,9 @@ class DriveTrain(object):
         self._accelerometer = None
         self._gyro = None
         self._movement_timer = None
+        self._profile_timer = None
+        self._stop_action = None
+        self._sampler = None
         self._acceleration_timer = None
         self._range_finder = None
 
@@ -153,6 +199,14 @@ class DriveTrain(object):
         self._gyro = None
         self._acceleration_timer = None
         self._movement_timer = None
+        self._profile_timer = None
+        self._stop_action = None
+        self._sampler = None
+        self._odometry = None
+        self._heading_pid = None
+        self._distance_pid = None
+        self._range_pid = None
+        self._profile_pid = None
         self._range_finder = None
 
         # Initialize private parameters
@@ -184,6 +238,32 @@ class DriveTrain(object):
         self._maximum_turn_speed_change = 0.0
         self._linear_filter_constant = 0.0
         self._turn_filter_constant = 0.0
+        self._acceleration_scale = 32.174
+        self._odometry_acceleration_variance = 1.0
+        self._odometry_range_variance = 0.25
+        self._odometry_range_heading_tolerance = 5.0
+        self._odometry_range_max_speed = 1.0
+        self._drive_distance_lookahead = 0.0
+        self._range_filter_window = 21
+        self._range_filter_percentile = 90
+        self._range_filter_decimation = 5
+        self._range_filter_decimation_period = 0.0
+        self._range_filter_floor = 1.0
+        self._pid_control_enabled = False
+        self._heading_pid_p = 0.0
+        self._heading_pid_i = 0.0
+        self._heading_pid_d = 0.0
+        self._heading_pid_feed_forward = 0.0
+        self._heading_pid_integral_limit = 0.0
+        self._distance_pid_p = 0.0
+        self._distance_pid_i = 0.0
+        self._distance_pid_d = 0.0
+        self._distance_pid_feed_forward = 0.0
+        self._distance_pid_integral_limit = 0.0
+        self._drive_profile_max_velocity = 0.0
+        self._drive_profile_max_acceleration = 0.0
+        self._drive_profile_velocity_gain = 0.0
+        self._drive_profile_settle_time = 1.0
 
         # Initialize private member variables
         self._log_enabled = False
@@ -197,6 +277,9 @@ class DriveTrain(object):
         self._previous_turn_speed = 0
         self._adjustment_in_progress = False
         self._range = 0.0
+        self._last_acceleration_time = None
+        self._drive_profile = None
+        self._drive_profile_start = 0.0
 
         # Enable logging if specified
         if logging_enabled:
@@ -209,6 +292,8 @@ class DriveTrain(object):
                 self._log = None
 
         self._movement_timer = stopwatch.Stopwatch()
+        self._profile_timer = stopwatch.Stopwatch()
+        self._stop_action = stopwatch.TimedAction()
 
         # Read parameters file
         self._parameters_file = params
@@ -342,6 +427,74 @@ class DriveTrain(object):
                                             "LINEAR_FILTER_CONSTANT")
             self._turn_filter_constant = self._parameters.get_value(section,
                                             "TURN_FILTER_CONSTANT")
+            self._acceleration_scale = self._parameters.get_value(section,
+                                            "ACCELERATION_SCALE")
+            self._odometry_acceleration_variance = self._parameters.get_value(
+                                            section,
+                                            "ODOMETRY_ACCELERATION_VARIANCE")
+            self._odometry_range_variance = self._parameters.get_value(
+                                            section,
+                                            "ODOMETRY_RANGE_VARIANCE")
+            self._odometry_range_heading_tolerance = (
+                    self._parameters.get_value(section,
+                                        "ODOMETRY_RANGE_HEADING_TOLERANCE"))
+            self._odometry_range_max_speed = self._parameters.get_value(
+                                            section,
+                                            "ODOMETRY_RANGE_MAX_SPEED")
+            self._drive_distance_lookahead = self._parameters.get_value(
+                                            section,
+                                            "DRIVE_DISTANCE_LOOKAHEAD")
+            self._range_filter_window = self._parameters.get_value(section,
+                                            "RANGE_FILTER_WINDOW")
+            self._range_filter_percentile = self._parameters.get_value(
+                                            section,
+                                            "RANGE_FILTER_PERCENTILE")
+            self._range_filter_decimation = self._parameters.get_value(
+                                            section,
+                                            "RANGE_FILTER_DECIMATION")
+            self._range_filter_decimation_period = (
+                    self._parameters.get_value(section,
+                                        "RANGE_FILTER_DECIMATION_PERIOD"))
+            self._range_filter_floor = self._parameters.get_value(section,
+                                            "RANGE_FILTER_FLOOR")
+            self._pid_control_enabled = (self._parameters.get_value(section,
+                                            "PID_CONTROL_ENABLED") > 0)
+            self._heading_pid_p = self._parameters.get_value(section,
+                                            "HEADING_PID_P")
+            self._heading_pid_i = self._parameters.get_value(section,
+                                            "HEADING_PID_I")
+            self._heading_pid_d = self._parameters.get_value(section,
+                                            "HEADING_PID_D")
+            self._heading_pid_feed_forward = self._parameters.get_value(
+                                            section,
+                                            "HEADING_PID_FEED_FORWARD")
+            self._heading_pid_integral_limit = self._parameters.get_value(
+                                            section,
+                                            "HEADING_PID_INTEGRAL_LIMIT")
+            self._distance_pid_p = self._parameters.get_value(section,
+                                            "DISTANCE_PID_P")
+            self._distance_pid_i = self._parameters.get_value(section,
+                                            "DISTANCE_PID_I")
+            self._distance_pid_d = self._parameters.get_value(section,
+                                            "DISTANCE_PID_D")
+            self._distance_pid_feed_forward = self._parameters.get_value(
+                                            section,
+                                            "DISTANCE_PID_FEED_FORWARD")
+            self._distance_pid_integral_limit = self._parameters.get_value(
+                                            section,
+                                            "DISTANCE_PID_INTEGRAL_LIMIT")
+            self._drive_profile_max_velocity = self._parameters.get_value(
+                                            section,
+                                            "DRIVE_PROFILE_MAX_VELOCITY")
+            self._drive_profile_max_acceleration = self._parameters.get_value(
+                                            section,
+                                            "DRIVE_PROFILE_MAX_ACCELERATION")
+            self._drive_profile_velocity_gain = self._parameters.get_value(
+                                            section,
+                                            "DRIVE_PROFILE_VELOCITY_GAIN")
+            self._drive_profile_settle_time = self._parameters.get_value(
+                                            section,
+                                            "DRIVE_PROFILE_SETTLE_TIME")
 
         # Check if the accelerometer is present/enabled
         self.accelerometer_enabled = False
@@ -363,10 +516,45 @@ class DriveTrain(object):
         # Check if range finder is present/enabled
         self.range_finder_enabled = False
         if range_finder_channel > 0:
-            self._range_finder = ultrasonic.RangeFinder(range_finder_channel)
+            self._range_finder = ultrasonic.RangeFinder(
+                                    range_finder_channel,
+                                    self._range_filter_window,
+                                    self._range_filter_percentile,
+                                    self._range_filter_decimation,
+                                    self._range_filter_floor,
+                                    self._range_filter_decimation_period)
             if self._range_finder:
                 self.range_finder_enabled = True
 
+        # Estimate where the robot has driven from the sensors
+        self._odometry = odometry.Odometry(
+                                    self._odometry_acceleration_variance,
+                                    self._odometry_range_variance,
+                                    self._odometry_range_heading_tolerance,
+                                    self._odometry_range_max_speed)
+
+        # Create the closed loop controllers for autonomous movement
+        self._heading_pid = pid.PIDController(self._heading_pid_p,
+                                              self._heading_pid_i,
+                                              self._heading_pid_d,
+                                              self._heading_pid_feed_forward,
+                                              self._heading_pid_integral_limit)
+        self._distance_pid = pid.PIDController(self._distance_pid_p,
+                                            self._distance_pid_i,
+                                            self._distance_pid_d,
+                                            self._distance_pid_feed_forward,
+                                            self._distance_pid_integral_limit)
+        self._range_pid = pid.PIDController(self._distance_pid_p,
+                                            self._distance_pid_i,
+                                            self._distance_pid_d,
+                                            self._distance_pid_feed_forward,
+                                            self._distance_pid_integral_limit)
+        self._profile_pid = pid.PIDController(self._distance_pid_p,
+                                            self._distance_pid_i,
+                                            self._distance_pid_d,
+                                            self._distance_pid_feed_forward,
+                                            self._distance_pid_integral_limit)
+
         # Create motor controllers
         if left_motor_channel > 0:
             self._left_controller = wpilib.Jaguar(left_motor_channel)
@@ -416,12 +604,22 @@ class DriveTrain(object):
         if self._movement_timer:
             self._movement_timer.stop()
 
+        # Don't carry a drive_to_range brake over to the next mode
+        if self._stop_action:
+            self._stop_action.cancel()
+
         # Start the acceleration time and reset distance traveled
         if self.accelerometer_enabled:
             if self._acceleration_timer:
                 self._acceleration_timer.stop()
                 self._acceleration_timer.start()
-            self._distance_traveled = 0.0
+            self._reset_odometry()
+
+        # Start any closed loop movement over
+        self._heading_pid.reset()
+        self._distance_pid.reset()
+        self._range_pid.reset()
+        self._drive_profile = None
 
         if state == common.ProgramState.DISABLED:
             pass
@@ -447,26 +645,77 @@ class DriveTrain(object):
 
         Reads the gyro angle to get the robots heading and the accelerometer to
         get the acceleration in the forward/backward direction of the robot.
-        Distance traveled is calculated by multiplying the acceleration value
-        by time squared.
+        The acceleration is integrated by the odometry, which is corrected
+        with the range, to get the distance traveled.
 
         """
-        loop_time = 0.0
-
+        # Use the latest samples if the sensors are being sampled in the
+        # background
         if self.gyro_enabled:
-            self._gyro_angle = self._gyro.GetAngle()
+            angle = None
+            if self._sampler:
+                angle = self._sampler.get_latest('gyro_angle')
+            if angle is None:
+                angle = self._gyro.GetAngle()
+            self._gyro_angle = angle
 
         if self.range_finder_enabled:
             self._range = self._range_finder.get_filtered_range_in_feet()
 
         if self.accelerometer_enabled:
+            self._update_odometry()
+            # The range finder faces forward, so the range drops as the robot
+            # drives forward (positive scaled acceleration).  The filtered
+            # range lags, so the odometry only uses it while moving slowly.
+            if self.range_finder_enabled:
+                self._odometry.correct_range(self._range)
+            # The robot can't be moving while disabled
+            if self._robot_state == common.ProgramState.DISABLED:
+                self._odometry.correct_velocity(0.0, 0.0)
+            self._distance_traveled = self._odometry.get_distance()
+
+    def _update_odometry(self):
+        """Integrate the acceleration since the last update.
+
+        If the accelerometer is sampled in the background, every sample taken
+        since the last update is integrated with its own time step.
+        Otherwise the accelerometer is read now and the time since the last
+        update is used.
+
+        """
+        if self._sampler:
+            last_time = self._last_acceleration_time
+            samples = self._sampler.get_buffer('acceleration').get_window(
+                                        last_time if last_time else 0.0)
+            for timestamp, acceleration in samples:
+                if last_time is not None:
+                    if timestamp <= last_time:
+                        continue
+                    self._odometry.predict(
+                                    acceleration * self._acceleration_scale,
+                                    self._gyro_angle, timestamp - last_time)
+                last_time = timestamp
+                self._acceleration = acceleration
+            self._last_acceleration_time = last_time
+        else:
             self._acceleration = self._accelerometer.GetAcceleration(
-                    self._accelerometer_axis)
+                                                    self._accelerometer_axis)
+            step_time = None
             if self._acceleration_timer:
-                loop_time = self._acceleration_timer.elapsed_time_in_secs()
+                step_time = self._acceleration_timer.elapsed_time_in_secs()
                 self._acceleration_timer.start()
-                self._distance_traveled += (self._acceleration *
-                        loop_time * loop_time)
+            if step_time:
+                self._odometry.predict(
+                                self._acceleration * self._acceleration_scale,
+                                self._gyro_angle, step_time)
+
+    def _reset_odometry(self):
+        """Start a new odometry estimate from the current position."""
+        rng = None
+        if self.range_finder_enabled and self._odometry_range_variance > 0:
+            rng = self._range
+        self._odometry.reset(self._gyro_angle, rng)
+        self._distance_traveled = 0.0
 
     def reset_sensors(self):
         """Reset sensors.
@@ -475,15 +724,44 @@ class DriveTrain(object):
         """
         if self.gyro_enabled:
             self._gyro.Reset()
+            self._gyro_angle = 0.0
+            # Samples taken before the reset are no longer valid
+            if self._sampler:
+                self._sampler.get_buffer('gyro_angle').clear()
         if self.accelerometer_enabled:
             self._acceleration_timer.start()
-            self._distance_traveled = 0.0
+            self._reset_odometry()
+
+    def register_sensors(self, sampler):
+        """Have a SensorSampler read the drive train sensors.
+
+        Once registered, read_sensors() uses the latest samples instead of
+        reading the gyro and accelerometer itself.
+
+        Args:
+            sampler: the sensorsampler.SensorSampler to register with.
+
+        """
+        if self.gyro_enabled:
+            sampler.add_sensor('gyro_angle', self._gyro.GetAngle)
+        if self.accelerometer_enabled:
+            axis = self._accelerometer_axis
+            accelerometer = self._accelerometer
+            sampler.add_sensor('acceleration',
+                               lambda: accelerometer.GetAcceleration(axis))
+        # The range finder isn't sampled, since its percentile filter is
+        # already fed at its own rate by read_sensors()
+        self._sampler = sampler
 
     def reset_and_start_timer(self):
         """Resets and restarts the timer for time based movement."""
         if self._movement_timer:
             self._movement_timer.stop()
             self._movement_timer.start()
+        # A new command starts a new profiled move and ends any brake
+        self._drive_profile = None
+        if self._stop_action:
+            self._stop_action.cancel()
 
     def get_current_state(self):
         """Return a string containing sensor and status variables.
@@ -532,6 +810,7 @@ class DriveTrain(object):
         if not self._adjustment_in_progress:
             self._initial_heading = self._gyro_angle
             self._adjustment_in_progress = True
+            self._heading_pid.reset()
 
         # Calculate the amount of adjustment remaining
         angle_remaining = ((self._initial_heading + adjustment) -
@@ -549,6 +828,12 @@ class DriveTrain(object):
             self._robot_drive.ArcadeDrive(0.0, 0.0, False)
             self._adjustment_in_progress = False
             return True
+        elif self._pid_control_enabled:
+            turn_direction = self._closed_loop_speed(self._heading_pid,
+                                                     angle_remaining, speed,
+                                                     self._right_direction,
+                                                     self._left_direction)
+            self._robot_drive.ArcadeDrive(0.0, turn_direction, False)
         else:
             if math.fabs(angle_remaining) > self._auto_far_heading_threshold:
                 turn_direction = (turn_direction * speed *
@@ -567,12 +852,14 @@ class DriveTrain(object):
     def drive_distance(self, distance, speed):
         """Drives forward/backward a specified distance.
 
-        Using the accelerometer to calculate distance traveled, drives the
+        Using the odometry to estimate the distance traveled, drives the
         robot forward or backward until the distance traveled is within
-        tolerance of the desired distance.
+        tolerance of the desired distance.  The distance the robot will
+        cover in the lookahead time at its current speed is counted as
+        already traveled, so it starts slowing down before it overshoots.
 
         Args:
-            distance: the distance in meters with a negative value meaning
+            distance: the distance in feet with a negative value meaning
                 backwards.
             speed: the motor speed ratio used while driving.
 
@@ -591,7 +878,27 @@ class DriveTrain(object):
             directional_multiplier = self._backward_direction
 
         # Calculate distance left to drive
-        distance_left = math.fabs(distance) - math.fabs(self._distance_traveled)
+        distance_left = (math.fabs(distance) -
+                         math.fabs(self._distance_traveled))
+
+        if self._pid_control_enabled:
+            # Check if we've reached the distance, from either side
+            if math.fabs(distance_left) < self._distance_threshold:
+                self._robot_drive.ArcadeDrive(0.0, 0.0, False)
+                self._distance_pid.reset()
+                return True
+            # The derivative term slows the robot before it overshoots, and
+            # a negative speed drives it back if it does
+            directional_multiplier = (directional_multiplier *
+                                      self._distance_pid.update(distance_left,
+                                                                speed))
+            self._robot_drive.ArcadeDrive(directional_multiplier, 0.0, False)
+            return False
+
+        # Count the distance the robot will cover in the lookahead time as
+        # already traveled
+        distance_left -= math.fabs(self._odometry.get_velocity() *
+                                   self._drive_distance_lookahead)
 
         # Check if we've reached the distance
         if distance_left < self._distance_threshold:
@@ -612,6 +919,71 @@ class DriveTrain(object):
 
         return False
 
+    def drive_distance_profiled(self, distance, speed):
+        """Drives forward/backward a specified distance along a profile.
+
+        The move is planned as a trapezoidal motion profile, limited by the
+        drive profile maximum velocity and acceleration, and the robot
+        follows the profile's velocity with a correction for how far it is
+        from the profile's position.  The move is finished when the profile
+        is over and the robot is within tolerance of the distance, or when
+        the settle time after the profile runs out.
+
+        Args:
+            distance: the distance in feet with a negative value meaning
+                backwards.
+            speed: the ratio of the maximum velocity to drive at.
+
+        Returns:
+            True when the desired distance has been reached
+        """
+        # Abort if robot drive or accelerometer is not available
+        if (not self._robot_drive or not self.accelerometer_enabled or
+            not self._profile_timer):
+            return True
+
+        # If this is the first time called, plan the move
+        if not self._drive_profile:
+            self._drive_profile = motionprofile.TrapezoidalProfile(
+                                math.fabs(distance),
+                                self._drive_profile_max_velocity * speed,
+                                self._drive_profile_max_acceleration)
+            self._drive_profile_start = self._distance_traveled
+            self._profile_pid.reset()
+            self._profile_timer.stop()
+            self._profile_timer.start()
+
+        # Determine if robot should drive forward or backward
+        directional_multiplier = 0
+        if distance > 0:
+            directional_multiplier = self._forward_direction
+        else:
+            directional_multiplier = self._backward_direction
+
+        elapsed_time = self._profile_timer.elapsed_time_in_secs()
+        position, velocity = self._drive_profile.get_setpoint(elapsed_time)
+        traveled = math.fabs(self._distance_traveled -
+                             self._drive_profile_start)
+
+        # Check if we've reached the distance, or run out of time to settle
+        if self._drive_profile.is_finished(elapsed_time):
+            if (math.fabs(math.fabs(distance) - traveled) <
+                    self._distance_threshold or
+                elapsed_time > (self._drive_profile.duration +
+                                self._drive_profile_settle_time)):
+                self._robot_drive.ArcadeDrive(0.0, 0.0, False)
+                self._drive_profile = None
+                self._profile_timer.stop()
+                return True
+
+        # Drive at the profile velocity, corrected for the position error
+        linear = (velocity * self._drive_profile_velocity_gain +
+                  self._profile_pid.update(position - traveled))
+        linear = max(-1.0, min(1.0, linear))
+        self._robot_drive.ArcadeDrive(directional_multiplier * linear, 0.0,
+                                      False)
+        return False
+
     def drive_to_range(self, distance, speed):
         """Drives forward/backward until range distance matches.
 
@@ -631,6 +1003,15 @@ class DriveTrain(object):
             distance < 3.0):
             return True
 
+        # If we're braking after reaching the distance, keep driving in
+        # reverse until the brake time is over, then stop
+        if self._stop_action.is_started():
+            if self._stop_action.is_running():
+                return False
+            self._stop_action.cancel()
+            self._robot_drive.ArcadeDrive(0.0, 0.0, False)
+            return True
+
         # Calculate distance left to drive
         distance_left = self._range - distance
 
@@ -641,15 +1022,27 @@ class DriveTrain(object):
         else:
             directional_multiplier = self._backward_direction
 
+        if self._pid_control_enabled:
+            # The controller slows the robot down, so it doesn't need to
+            # brake once it gets there
+            if math.fabs(distance_left) < self._distance_threshold:
+                self._robot_drive.ArcadeDrive(0.0, 0.0, False)
+                self._range_pid.reset()
+                return True
+            directional_multiplier = self._closed_loop_speed(self._range_pid,
+                                                    distance_left, speed,
+                                                    self._forward_direction,
+                                                    self._backward_direction)
+            self._robot_drive.ArcadeDrive(directional_multiplier, 0.0, False)
+            return False
+
         # Check if we've reached the distance
         if math.fabs(distance_left) < self._distance_threshold:
-            # Drive in reverse briefly
+            # Drive in reverse briefly, without blocking the control loop
             self._robot_drive.ArcadeDrive(-0.5 * directional_multiplier,
                                           0.0, False)
-            time.sleep(0.1)
-            # Stop driving
-            self._robot_drive.ArcadeDrive(0.0, 0.0, False)
-            return True
+            self._stop_action.start(0.1)
+            return False
         else:
             if math.fabs(distance_left) > self._auto_far_distance_threshold:
                 directional_multiplier = (directional_multiplier * speed *
@@ -731,6 +1124,9 @@ class DriveTrain(object):
         if not self._robot_drive:
             return
 
+        # Driving directly ends any drive_to_range brake in progress
+        self._stop_action.cancel()
+
         linear = 0.0
         turn = 0.0
         # Determine the actual speed using normal/alternate speed ratios
@@ -774,6 +1170,34 @@ class DriveTrain(object):
         self._previous_linear_speed = linear
         self._previous_turn_speed = turn
 
+    def directional_drive(self, linear, turn):
+        """Drives and turns at the same time for autonomous movement.
+
+        Unlike drive(), the speeds are used as given, without the speed
+        ratios or smoothing, and are in the robot's directions, so callers
+        don't need to know how the motors are wired.
+
+        Args:
+            linear: the speed ratio to drive forward (negative for backward).
+            turn: the speed ratio to turn right (negative for left).
+        """
+        # Abort if the robot drive is not available
+        if not self._robot_drive:
+            return
+
+        # Driving directly ends any drive_to_range brake in progress
+        self._stop_action.cancel()
+
+        if linear < 0:
+            linear = -linear * self._backward_direction
+        else:
+            linear = linear * self._forward_direction
+        if turn < 0:
+            turn = -turn * self._left_direction
+        else:
+            turn = turn * self._right_direction
+        self._robot_drive.ArcadeDrive(linear, turn, False)
+
     def tank_drive(self, left_stick, right_stick, alternate):
         """Drives the robot using left and right 'tank track' controls.
 
@@ -792,6 +1216,9 @@ class DriveTrain(object):
         if not self._robot_drive:
             return
 
+        # Driving directly ends any drive_to_range brake in progress
+        self._stop_action.cancel()
+
         # Determine the actual speed using the normal/alternate speed ratios
         left = 0
         right = 0
@@ -821,6 +1248,9 @@ class DriveTrain(object):
         if not self._robot_drive:
             return
 
+        # Driving directly ends any drive_to_range brake in progress
+        self._stop_action.cancel()
+
         # Determine the actual speed using the normal/alternate speed ratios
         linear = 0.0
         turn = 0.0
@@ -863,7 +1293,14 @@ class DriveTrain(object):
         # Check if we've reached the desired heading
         if math.fabs(angle_remaining) < self._heading_threshold:
             self._robot_drive.ArcadeDrive(0.0, 0.0, False)
+            self._heading_pid.reset()
             return True
+        elif self._pid_control_enabled:
+            turn_direction = self._closed_loop_speed(self._heading_pid,
+                                                     angle_remaining, speed,
+                                                     self._right_direction,
+                                                     self._left_direction)
+            self._robot_drive.ArcadeDrive(0.0, turn_direction, False)
         else:
             if math.fabs(angle_remaining) > self._auto_far_heading_threshold:
                 turn_direction = (turn_direction * speed *
@@ -929,6 +1366,25 @@ class DriveTrain(object):
 
         return False
 
+    def _closed_loop_speed(self, controller, error, speed, positive_direction,
+                           negative_direction):
+        """Get a directional speed from a PID controller.
+
+        Args:
+            controller: the pid.PIDController for the movement.
+            error: the distance or angle left to move.
+            speed: the largest motor speed ratio to use.
+            positive_direction: the direction to move for a positive output.
+            negative_direction: the direction to move for a negative output.
+
+        Returns:
+            The speed and direction to move.
+        """
+        output = controller.update(error, speed)
+        if output < 0:
+            return -output * negative_direction
+        return output * positive_direction
+
     def get_heading(self):
         """Returns the current heading of the robot.
 
@@ -937,6 +1393,14 @@ class DriveTrain(object):
         """
         return self._gyro_angle
 
+    def get_distance_traveled(self):
+        """Returns the distance driven since the sensors were reset.
+
+        Returns:
+            The distance in feet, negative if the robot drove backward.
+        """
+        return self._distance_traveled
+
     def get_range(self):
         """Returns the current range to the nearest object.
 
@@ -945,3 +1409,11 @@ class DriveTrain(object):
         """
         return self._range
 
+    def get_odometry(self):
+        """Returns the odometry estimate of the robot.
+
+        Returns:
+            The odometry.Odometry with the pose, velocity and covariance.
+        """
+        return self._odometry
+
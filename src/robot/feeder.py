@@ -9,6 +9,7 @@ except ImportError:
     from pyfrc import wpilib
 import common
 import datalog
+import motorgroup
 import parameters
 import stopwatch
 
@@ -46,6 +47,7 @@ class Feeder(object):
     # Private member objects
     _compressor = None
     _left_arm = None
+    _arm_motors = None
     _log = None
     _movement_timer = None
     _parameters = None
@@ -56,6 +58,7 @@ class Feeder(object):
     _clockwise = None
     _counter_clockwise = None
     _time_threshold = 0
+    _motor_refresh_period = 0
 
     # Private member variables
     _log_enabled = False
@@ -91,6 +94,7 @@ class Feeder(object):
         self._solenoid = None
         self._left_arm = None
         self._right_arm = None
+        self._arm_motors = None
         self._movement_timer = None
 
     def _initialize(self, params, logging_enabled):
@@ -119,12 +123,14 @@ class Feeder(object):
         self._solenoid = None
         self._left_arm = None
         self._right_arm = None
+        self._arm_motors = None
         self._movement_timer = None
 
         # Initialize private parameters
         self._clockwise = None
         self._counter_clockwise = None
         self._time_threshold = 0.1
+        self._motor_refresh_period = 0.1
 
         # Initialize private member variables
         self._log_enabled = False
@@ -173,6 +179,7 @@ class Feeder(object):
         self._solenoid = None
         self._left_arm = None
         self._right_arm = None
+        self._arm_motors = None
 
         # Read the parameters file
         self._parameters = parameters.Parameters(self._parameters_file)
@@ -196,6 +203,8 @@ class Feeder(object):
                                                 "COUNTER_CLOCKWISE")
             self._time_threshold = self._parameters.get_value(section,
                                                 "TIME_THRESHOLD")
+            self._motor_refresh_period = self._parameters.get_value(section,
+                                                "MOTOR_REFRESH_PERIOD")
 
         # Create the compressor object if the channel is greater than 0
         self.compressor_enabled = False
@@ -232,6 +241,11 @@ class Feeder(object):
             if self._log_enabled:
                 self._log.write_line("Left arm enabled")
 
+        # The arms spin in opposite directions to pull the ball in
+        self._arm_motors = motorgroup.MotorGroup(self._motor_refresh_period)
+        self._arm_motors.add_motor(self._right_arm, self._clockwise)
+        self._arm_motors.add_motor(self._left_arm, self._counter_clockwise)
+
         # If the compressor, solenoid,and one of the arms are enabled,
         # the feeder is fully functional
         self.feeder_enabled = False
@@ -259,6 +273,10 @@ class Feeder(object):
         if self._movement_timer:
             self._movement_timer.stop()
 
+        # The motors are stopped while disabled, so write the next speed
+        if self._arm_motors:
+            self._arm_motors.invalidate()
+
         # Make sure the compressor is running in every state
         if self.compressor_enabled:
             if not self._compressor.Enabled():
@@ -311,20 +329,11 @@ class Feeder(object):
 
         """
         if direction == Direction.IN:
-            if self.right_arm_enabled:
-                self._right_arm.Set(self._clockwise * speed, 0)
-            if self.left_arm_enabled:
-                self._left_arm.Set(self._counter_clockwise * speed, 0)
+            self._arm_motors.set(speed)
         elif direction == Direction.OUT:
-            if self.right_arm_enabled:
-                self._right_arm.Set(self._counter_clockwise * speed, 0)
-            if self.left_arm_enabled:
-                self._left_arm.Set(self._clockwise * speed, 0)
+            self._arm_motors.set(-speed)
         elif direction == Direction.STOP:
-            if self.right_arm_enabled:
-                self._right_arm.Set(0.0, 0)
-            if self.left_arm_enabled:
-                self._left_arm.Set(0.0, 0)
+            self._arm_motors.stop()
 
     def feed_time(self, time, direction, speed):
         """Controls the feeder arms for a time duration.
@@ -352,22 +361,13 @@ class Feeder(object):
 
         # Check if we've fed long enough
         if time_left < self._time_threshold or time_left < 0:
-            if self.right_arm_enabled:
-                self._right_arm.Set(0.0, 0)
-            if self.left_arm_enabled:
-                self._left_arm.Set(0.0, 0)
+            self._arm_motors.stop()
             self._movement_timer.stop()
             return True
         else:
             if direction == Direction.IN:
-                if self.right_arm_enabled:
-                    self._right_arm.Set(self._clockwise * speed, 0)
-                if self.left_arm_enabled:
-                    self._left_arm.Set(self._counter_clockwise * speed, 0)
+                self._arm_motors.set(speed)
             elif direction == Direction.OUT:
-                if self.right_arm_enabled:
-                    self._right_arm.Set(self._counter_clockwise * speed, 0)
-                if self.left_arm_enabled:
-                    self._left_arm.Set(self._clockwise * speed, 0)
+                self._arm_motors.set(-speed)
         return False
 
@@ -0,0 +1,123 @@
+"""This module provides a framebuffer for the Driver Station LCD."""
+
+# Imports
+import time
+
+
+class LCDBuffer(object):
+    """Keeps the lines of the Driver Station LCD in memory.
+
+    Text is written to a line at a priority.  Each line shows the text with
+    the highest priority, so a short message can be shown over a status
+    line (like the range) without the status line overwriting it on the next
+    loop.  Text written with a hold time is removed when the time is up, and
+    the line goes back to showing whatever is underneath.
+
+    Only the lines whose text changed since the last call to get_changes()
+    need to be sent to the Driver Station.
+
+    """
+    # Private member variables
+    _line_count = None
+    _line_width = None
+    _clock = None
+    _layers = None
+    _flushed = None
+    _dirty = False
+
+    def __init__(self, line_count=6, line_width=21, clock=time.time):
+        """Create an LCDBuffer.
+
+        Args:
+            line_count: the number of lines on the display.
+            line_width: the number of characters on each line.
+            clock: the function that returns the current time in seconds.
+
+        """
+        self._line_count = line_count
+        self._line_width = line_width
+        self._clock = clock
+        # For each line, a dictionary of priority: (text, expiry time)
+        self._layers = [{} for i in range(line_count)]
+        self._flushed = [None] * line_count
+        self._dirty = True
+
+    def write(self, line, text, priority=0, hold=None):
+        """Write text to a line.
+
+        Args:
+            line: the line number (0 is the top line).
+            text: the text to show (longer text is cut off).
+            priority: the priority of the text; the highest is shown.
+            hold: how long to show the text in seconds, or None to show it
+                until it's replaced or cleared.
+
+        """
+        if line < 0 or line >= self._line_count:
+            return
+        expiry = self._clock() + hold if hold is not None else None
+        self._layers[line][priority] = (text[:self._line_width], expiry)
+        self._dirty = True
+
+    def clear(self, priority=0):
+        """Remove the text at a priority from every line.
+
+        Args:
+            priority: the priority of the text to remove.
+
+        """
+        for layers in self._layers:
+            if layers.pop(priority, None):
+                self._dirty = True
+
+    def get_line(self, line):
+        """Return the text currently shown on a line."""
+        layers = self._layers[line]
+        now = self._clock()
+        for priority in sorted(layers, reverse=True):
+            text, expiry = layers[priority]
+            if expiry is None or now < expiry:
+                return text
+        return ""
+
+    def get_lines(self):
+        """Return a List of the text currently shown on every line."""
+        return [self.get_line(line) for line in range(self._line_count)]
+
+    def get_changes(self):
+        """Get the lines that changed since the last call.
+
+        Text whose hold time is up is removed first.  The returned text is
+        padded to the full line width so it replaces the old text entirely.
+
+        Returns:
+            A List of (line number, text) tuples.
+
+        """
+        if self._expire() or self._dirty:
+            self._dirty = False
+            changes = []
+            for line in range(self._line_count):
+                text = self.get_line(line)
+                if text != self._flushed[line]:
+                    self._flushed[line] = text
+                    changes.append((line, text.ljust(self._line_width)))
+            return changes
+        return []
+
+    def _expire(self):
+        """Remove held text whose time is up.
+
+        Returns:
+            True if anything was removed.
+
+        """
+        now = self._clock()
+        expired = False
+        for layers in self._layers:
+            for priority in [priority for priority, (text, expiry)
+                             in layers.items()
+                             if expiry is not None and now >= expiry]:
+                del layers[priority]
+                expired = True
+        return expired
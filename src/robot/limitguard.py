@@ -0,0 +1,150 @@
+"""This module provides a guard that keeps a mechanism inside its limits.
+
+The subsystems only check their soft limits when the control loop calls
+them, so at full power a mechanism can travel well past a limit between
+checks, and isn't checked at all while the loop is busy.  The LimitGuard
+thread watches the position at its own, much higher rate and stops the
+motors as soon as a limit is crossed.
+
+"""
+
+# Imports
+import math
+import threading
+
+
+class LimitGuard(threading.Thread):
+    """Stops a MotorGroup from moving past soft limits.
+
+    When the position goes past a limit, the direction that moves further
+    past it is inhibited on the motor group, which stops the motors right
+    away if they're moving that way.  They can still move back inside the
+    limits, and the inhibit is released once they're back inside.
+
+    Attributes:
+        period: the time between checks in seconds.
+        trips: the number of times a limit was crossed.
+        last_overshoot: how far past the limit the last trip went.
+        max_overshoot: how far past the limit the furthest trip went.
+        errors: the number of position reads that raised an exception.
+
+    """
+    # Public member variables
+    period = None
+    trips = 0
+    last_overshoot = 0
+    max_overshoot = 0
+    errors = 0
+
+    # Private member variables
+    _read_position = None
+    _motors = None
+    _max_limit = None
+    _min_limit = None
+    _up_direction = None
+    _enabled = True
+    _tripped = False
+    _lock = None
+    _stop_event = None
+
+    def __init__(self, read_position, motors, max_limit, min_limit,
+                 up_direction=1.0, period=0.002):
+        """Create a LimitGuard.
+
+        Args:
+            read_position: the function that returns the current position.
+            motors: the motorgroup.MotorGroup that moves the mechanism.
+            max_limit: the highest allowed position (0 or less for no limit).
+            min_limit: the lowest allowed position, which may be negative
+                (None for no limit).
+            up_direction: the sign of the motor speed that increases the
+                position.
+            period: the time between checks in seconds.
+
+        """
+        threading.Thread.__init__(self)
+        self.daemon = True
+        self.period = period
+        self.trips = 0
+        self.last_overshoot = 0
+        self.max_overshoot = 0
+        self.errors = 0
+        self._read_position = read_position
+        self._motors = motors
+        self._max_limit = max_limit
+        self._min_limit = min_limit
+        self._up_direction = math.copysign(1, up_direction)
+        self._enabled = True
+        self._tripped = False
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+
+    def set_enabled(self, state):
+        """Turn the guard on or off.
+
+        Turning it off releases any inhibited direction, so the mechanism
+        can be moved past its limits (like when resetting the encoder).
+
+        Args:
+            state: True if the limits should be enforced.
+
+        """
+        with self._lock:
+            self._enabled = state
+            if not state and self._tripped:
+                self._tripped = False
+                self._motors.inhibit(0)
+
+    def is_enabled(self):
+        """Return True if the limits are being enforced."""
+        return self._enabled
+
+    def is_tripped(self):
+        """Return True if the position is currently past a limit."""
+        return self._tripped
+
+    def check(self):
+        """Check the position once, and inhibit or release the motors."""
+        with self._lock:
+            if not self._enabled:
+                return
+            try:
+                position = self._read_position()
+            except Exception:
+                self.errors += 1
+                return
+
+            if self._max_limit > 0 and position > self._max_limit:
+                overshoot = position - self._max_limit
+                direction = self._up_direction
+            elif (self._min_limit is not None and
+                  position < self._min_limit):
+                overshoot = self._min_limit - position
+                direction = -self._up_direction
+            else:
+                # Back inside the limits
+                if self._tripped:
+                    self._tripped = False
+                    self._motors.inhibit(0)
+                return
+
+            if not self._tripped:
+                self._tripped = True
+                self.trips += 1
+                self.last_overshoot = 0
+                self._motors.inhibit(direction)
+            # Keep track of how far the mechanism coasts past the limit
+            if overshoot > self.last_overshoot:
+                self.last_overshoot = overshoot
+            if overshoot > self.max_overshoot:
+                self.max_overshoot = overshoot
+
+    def run(self):
+        """Check the position every period until stopped."""
+        while not self._stop_event.is_set():
+            self.check()
+            self._stop_event.wait(self.period)
+
+    def stop(self):
+        """Stop checking."""
+        self._stop_event.set()
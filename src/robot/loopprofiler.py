@@ -0,0 +1,158 @@
+"""This module provides on-demand profiling of control loop iterations."""
+
+# Imports
+import os
+import time
+
+# The profiler isn't available in every Python build
+try:
+    import cProfile
+    import pstats
+except ImportError:
+    cProfile = None
+    pstats = None
+
+
+class LoopProfiler(object):
+    """Profiles the next N iterations of a loop when armed.
+
+    The profiler is armed by calling arm() or by creating the flag file (which
+    may contain the number of iterations to profile).  The flag file is only
+    checked every check_period seconds, and when the profiler isn't armed
+    begin() and end() return immediately, so the loop pays nothing for it.
+
+    The statistics are written to the output directory as a binary .prof file
+    (for pstats or other tools) and a text report sorted by cumulative time.
+
+    Attributes:
+        armed: True while the profiler is waiting for or running iterations.
+        last_filename: the name of the last statistics file written.
+
+    """
+    # Public member variables
+    armed = False
+    last_filename = None
+
+    # Private member variables
+    _iterations = None
+    _remaining = 0
+    _profile = None
+    _flag_file = None
+    _output_directory = None
+    _check_period = None
+    _next_check = 0.0
+    _clock = None
+
+    def __init__(self, iterations=100, flag_file='/py/profile',
+                 output_directory='/py/', check_period=1.0, clock=time.time):
+        """Create a LoopProfiler.
+
+        Args:
+            iterations: the default number of iterations to profile.
+            flag_file: the file that arms the profiler when it exists.
+            output_directory: the directory the statistics are written to.
+            check_period: the time between checks for the flag file.
+            clock: the function that returns the current time in seconds.
+
+        """
+        self.armed = False
+        self.last_filename = None
+        self._iterations = iterations
+        self._remaining = 0
+        self._profile = None
+        self._flag_file = flag_file
+        self._output_directory = output_directory
+        self._check_period = check_period
+        self._next_check = 0.0
+        self._clock = clock
+
+    def is_available(self):
+        """Return True if profiling is supported."""
+        return cProfile is not None
+
+    def arm(self, iterations=None):
+        """Profile the next iterations of the loop.
+
+        Args:
+            iterations: the number of iterations to profile (defaults to the
+                number given when the profiler was created).
+
+        Returns:
+            True if the profiler was armed.
+
+        """
+        if self.armed or not self.is_available():
+            return False
+        self._remaining = iterations if iterations else self._iterations
+        self._profile = cProfile.Profile()
+        self.armed = True
+        return True
+
+    def check_flag_file(self):
+        """Arm the profiler if the flag file exists.
+
+        The file is only looked for every check_period seconds.  It is removed
+        once it has been seen.
+
+        Returns:
+            True if the profiler was armed.
+
+        """
+        now = self._clock()
+        if self.armed or now < self._next_check:
+            return False
+        self._next_check = now + self._check_period
+        if not os.path.exists(self._flag_file):
+            return False
+        iterations = None
+        try:
+            with open(self._flag_file) as flag:
+                iterations = int(flag.read().strip() or 0)
+        except (IOError, ValueError):
+            pass
+        try:
+            os.remove(self._flag_file)
+        except OSError:
+            pass
+        return self.arm(iterations)
+
+    def begin(self):
+        """Start profiling an iteration (call at the top of the loop)."""
+        if self.armed:
+            self._profile.enable()
+
+    def end(self, name='loop'):
+        """Stop profiling an iteration (call before the loop sleeps).
+
+        When the last iteration has been profiled the statistics are written
+        and the profiler is disarmed.
+
+        Args:
+            name: the name of the loop, used in the file name.
+
+        Returns:
+            The name of the text report if one was written, otherwise None.
+
+        """
+        if not self.armed:
+            return None
+        self._profile.disable()
+        self._remaining -= 1
+        if self._remaining > 0:
+            return None
+        self.armed = False
+        return self._write_statistics(name)
+
+    def _write_statistics(self, name):
+        """Write the collected statistics to the output directory."""
+        base = os.path.join(self._output_directory,
+                            time.strftime("profile_" + name +
+                                          "_%Y%m%d_%H%M%S"))
+        profile = self._profile
+        self._profile = None
+        profile.dump_stats(base + ".prof")
+        with open(base + ".txt", 'w') as report:
+            stats = pstats.Stats(profile, stream=report)
+            stats.sort_stats('cumulative').print_stats()
+        self.last_filename = base + ".txt"
+        return self.last_filename
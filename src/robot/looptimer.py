@@ -0,0 +1,144 @@
+"""This module provides a fixed-rate loop timing class."""
+
+# Imports
+import time
+
+
+class LoopTimer(object):
+    """Runs a loop at a fixed period.
+
+    Each iteration is scheduled against a deadline instead of sleeping for a
+    flat amount after the loop body, so the time taken by the body doesn't
+    add to the period.  If the body runs past the deadline the iteration
+    counts as an overrun and the schedule restarts from the current time,
+    rather than running several short iterations to catch up.
+
+    Attributes:
+        period: the desired time between iterations in seconds.
+        iterations: the number of iterations since start().
+        overruns: the number of iterations whose body ran past the deadline.
+        blocked: the number of iterations whose body took longer than a whole
+            period, which usually means a call in the body blocked.
+        blocked_last: True if the body of the last iteration blocked.
+        max_body_time: the longest time spent in the body of an iteration.
+        loop_time: the time between the start of the last two iterations.
+        body_time: the time spent in the body of the last iteration.
+        max_jitter: the largest difference between an iteration's deadline
+            and when it actually started.
+
+    """
+    # Public member variables
+    period = None
+    iterations = 0
+    overruns = 0
+    blocked = 0
+    blocked_last = False
+    max_body_time = 0.0
+    loop_time = None
+    body_time = None
+    max_jitter = 0.0
+
+    # Private member variables
+    _sleep = None
+    _clock = None
+    _start_time = None
+    _iteration_start = None
+    _deadline = None
+    _total_jitter = 0.0
+
+    def __init__(self, period, sleep=time.sleep, clock=time.time):
+        """Create a LoopTimer.
+
+        Args:
+            period: the desired time between iterations in seconds.
+            sleep: the function used to sleep for a number of seconds.
+            clock: the function that returns the current time in seconds.
+
+        """
+        self.period = period
+        self._sleep = sleep
+        self._clock = clock
+        self.start()
+
+    def start(self):
+        """Start timing a new loop and clear the statistics."""
+        now = self._clock()
+        self._start_time = now
+        self._iteration_start = now
+        self._deadline = now + self.period
+        self.iterations = 0
+        self.overruns = 0
+        self.blocked = 0
+        self.blocked_last = False
+        self.max_body_time = 0.0
+        self.loop_time = None
+        self.body_time = None
+        self.max_jitter = 0.0
+        self._total_jitter = 0.0
+
+    def wait(self):
+        """Sleep until the start of the next iteration.
+
+        Call this at the end of the loop body.
+
+        Returns:
+            True if the body finished before the deadline.
+
+        """
+        now = self._clock()
+        self.body_time = now - self._iteration_start
+        self.max_body_time = max(self.max_body_time, self.body_time)
+        self.blocked_last = self.body_time > self.period
+        if self.blocked_last:
+            self.blocked += 1
+        remaining = self._deadline - now
+        on_time = remaining > 0
+        if on_time:
+            self._sleep(remaining)
+            now = self._clock()
+            jitter = abs(now - self._deadline)
+            self.max_jitter = max(self.max_jitter, jitter)
+            self._total_jitter += jitter
+            self._deadline += self.period
+        else:
+            self.overruns += 1
+            self._deadline = now + self.period
+
+        self.loop_time = now - self._iteration_start
+        self._iteration_start = now
+        self.iterations += 1
+        return on_time
+
+    def get_rate(self):
+        """Return the achieved number of iterations per second.
+
+        Returns:
+            The rate since start(), or None if no iterations have finished.
+
+        """
+        elapsed = self._iteration_start - self._start_time
+        if not self.iterations or elapsed <= 0:
+            return None
+        return self.iterations / elapsed
+
+    def get_mean_jitter(self):
+        """Return the average jitter of the iterations that were on time.
+
+        Returns:
+            The mean jitter in seconds, or None if none were on time.
+
+        """
+        on_time = self.iterations - self.overruns
+        if on_time <= 0:
+            return None
+        return self._total_jitter / on_time
+
+    def get_summary(self):
+        """Return a one line description of the loop timing."""
+        rate = self.get_rate()
+        jitter = self.get_mean_jitter()
+        return ("%d loops at %.1f Hz, %d overruns, %d blocked "
+                "(longest %.1f ms), jitter mean %.2f ms max %.2f ms" %
+                (self.iterations, rate if rate else 0.0, self.overruns,
+                 self.blocked, self.max_body_time * 1000,
+                 jitter * 1000 if jitter else 0.0, self.max_jitter * 1000))
@@ -0,0 +1,99 @@
+"""This module provides motion profiles for smooth movements.
+
+A motion profile plans a move ahead of time as a position and velocity to be
+at for every moment of the move.  Following it, instead of jumping straight
+to a fixed speed, limits how hard the mechanism accelerates and brakes.
+
+"""
+
+# Imports
+import math
+
+
+class TrapezoidalProfile(object):
+    """A move that accelerates, cruises and decelerates at constant rates.
+
+    The velocity rises at the maximum acceleration until it reaches the
+    maximum velocity, holds there, then falls at the same rate to stop at
+    the end of the move.  Short moves never reach the maximum velocity, and
+    the cruise is skipped.
+
+    Attributes:
+        distance: the length of the move (negative to move backward).
+        duration: the time the move takes in seconds.
+
+    """
+    # Public member variables
+    distance = 0.0
+    duration = 0.0
+
+    # Private member variables
+    _direction = 1.0
+    _acceleration = 0.0
+    _peak_velocity = 0.0
+    _acceleration_time = 0.0
+    _cruise_time = 0.0
+
+    def __init__(self, distance, max_velocity, max_acceleration):
+        """Plan a move.
+
+        Args:
+            distance: the length of the move (negative to move backward).
+            max_velocity: the fastest speed to move at.
+            max_acceleration: the fastest rate to speed up or slow down at.
+
+        """
+        self.distance = distance
+        self._direction = -1.0 if distance < 0 else 1.0
+        length = math.fabs(distance)
+        if length == 0 or max_velocity <= 0 or max_acceleration <= 0:
+            self.duration = 0.0
+            return
+        self._acceleration = max_acceleration
+
+        # Accelerating to full speed and back down covers v^2 / a
+        if max_velocity * max_velocity / max_acceleration > length:
+            self._peak_velocity = math.sqrt(length * max_acceleration)
+        else:
+            self._peak_velocity = max_velocity
+        self._acceleration_time = self._peak_velocity / max_acceleration
+        cruise_distance = (length - self._peak_velocity *
+                           self._acceleration_time)
+        self._cruise_time = max(cruise_distance / self._peak_velocity, 0.0)
+        self.duration = 2 * self._acceleration_time + self._cruise_time
+
+    def get_setpoint(self, elapsed_time):
+        """Get where the move should be at a time.
+
+        Args:
+            elapsed_time: the time since the move started in seconds.
+
+        Returns:
+            A (position, velocity) tuple, with the position measured from the
+            start of the move.
+
+        """
+        if elapsed_time <= 0:
+            return (0.0, 0.0)
+        if elapsed_time >= self.duration:
+            return (self.distance, 0.0)
+
+        a = self._acceleration
+        accel_time = self._acceleration_time
+        if elapsed_time < accel_time:
+            velocity = a * elapsed_time
+            position = 0.5 * a * elapsed_time * elapsed_time
+        elif elapsed_time < accel_time + self._cruise_time:
+            velocity = self._peak_velocity
+            position = (0.5 * self._peak_velocity * accel_time +
+                        self._peak_velocity * (elapsed_time - accel_time))
+        else:
+            time_left = self.duration - elapsed_time
+            velocity = a * time_left
+            position = (math.fabs(self.distance) -
+                        0.5 * a * time_left * time_left)
+        return (self._direction * position, self._direction * velocity)
+
+    def is_finished(self, elapsed_time):
+        """Return True if the move should be over at a time."""
+        return elapsed_time >= self.duration
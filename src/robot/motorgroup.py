@@ -0,0 +1,151 @@
+"""This module provides a class to drive several motors as one."""
+
+# Imports
+import threading
+import time
+
+
+class MotorGroup(object):
+    """A set of motor controllers that always drive together.
+
+    Each motor has its own inversion factor, so a single speed moves the
+    whole mechanism in one direction.  The last speed sent to the motors is
+    remembered, and the controllers are only written when the speed changes
+    or when they haven't been written for the refresh period (so motor
+    safety doesn't time out while the speed is held).
+
+    A direction can be inhibited, like when the mechanism is past a limit.
+    Speeds in that direction are replaced with 0 until the inhibit is
+    released.  Another thread may inhibit a direction while the control loop
+    is setting the speed.
+
+    Attributes:
+        writes: the number of times the controllers were written.
+        suppressed: the number of speeds that didn't need to be written.
+
+    """
+    # Public member variables
+    writes = 0
+    suppressed = 0
+
+    # Private member variables
+    _motors = None
+    _refresh_period = None
+    _clock = None
+    _speed = None
+    _last_write_time = None
+    _inhibited = 0
+    _lock = None
+
+    def __init__(self, refresh_period=0.1, clock=time.time):
+        """Create an empty MotorGroup.
+
+        Args:
+            refresh_period: the longest time in seconds to go without writing
+                the controllers (0 to write every speed).
+            clock: the function that returns the current time in seconds.
+
+        """
+        self.writes = 0
+        self.suppressed = 0
+        self._motors = []
+        self._refresh_period = refresh_period
+        self._clock = clock
+        self._speed = None
+        self._last_write_time = None
+        self._inhibited = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._motors)
+
+    def add_motor(self, controller, invert=1.0):
+        """Add a motor controller to the group.
+
+        Args:
+            controller: the motor controller (None is ignored).
+            invert: the factor the speed is multiplied by for this motor.
+
+        Returns:
+            True if the motor was added.
+
+        """
+        if not controller:
+            return False
+        with self._lock:
+            self._motors.append((controller, invert))
+        self.invalidate()
+        return True
+
+    def is_enabled(self):
+        """Return True if the group has at least one motor."""
+        return len(self._motors) > 0
+
+    def set(self, speed):
+        """Set the speed of every motor in the group.
+
+        Args:
+            speed: the speed ratio before each motor's inversion.
+
+        """
+        with self._lock:
+            if speed * self._inhibited > 0:
+                speed = 0.0
+            now = self._clock()
+            if (speed == self._speed and self._last_write_time is not None and
+                now - self._last_write_time < self._refresh_period):
+                self.suppressed += 1
+                return
+            self._write(speed, now)
+
+    def stop(self):
+        """Stop every motor in the group."""
+        self.set(0.0)
+
+    def inhibit(self, direction):
+        """Stop the motors from moving in a direction.
+
+        If the motors are moving in the direction they're stopped right
+        away, without waiting for the next speed to be set.
+
+        Args:
+            direction: 1 to inhibit positive speeds, -1 to inhibit negative
+                speeds, or 0 to release the inhibit.
+
+        Returns:
+            True if the motors were stopped.
+
+        """
+        with self._lock:
+            self._inhibited = direction
+            if self._speed and self._speed * direction > 0:
+                self._write(0.0, self._clock())
+                return True
+        return False
+
+    def get_inhibited(self):
+        """Return the inhibited direction (1, -1, or 0 for none)."""
+        return self._inhibited
+
+    def get_speed(self):
+        """Return the last speed written, or None if it hasn't been set."""
+        return self._speed
+
+    def invalidate(self):
+        """Forget the last speed so the next one is always written.
+
+        Call this when the controllers may have been changed outside the
+        group, like when the robot is disabled.
+
+        """
+        with self._lock:
+            self._speed = None
+            self._last_write_time = None
+
+    def _write(self, speed, now):
+        """Write a speed to every controller (the lock must be held)."""
+        for controller, invert in self._motors:
+            controller.Set(speed * invert, 0)
+        self._speed = speed
+        self._last_write_time = now
+        self.writes += 1
@@ -0,0 +1,220 @@
+"""This module provides an estimate of where the robot has driven.
+
+The estimate fuses the accelerometer, gyro and range finder.  A Kalman
+filter tracks the distance driven along the robot's path and the speed,
+using the measured acceleration to predict them each time step.  The gyro
+heading turns each step along the path into a 2D position.  When the range
+finder is pointed at the same wall as when the odometry was reset, the change
+in range is a direct measurement of the distance driven, and is used to
+correct the estimate.  The filtered range lags behind the true range while
+the robot is moving, so it's only used while the robot is moving slowly.
+
+"""
+
+# Imports
+import math
+
+
+class Odometry(object):
+    """Estimates the pose and velocity of the robot.
+
+    Distances are in the units of the range finder (feet), and acceleration
+    must be given in those units per second squared.
+
+    Attributes:
+        x: the position along the heading at the last reset.
+        y: the position across the heading at the last reset (positive
+            towards increasing gyro angles).
+        heading: the current heading in degrees.
+
+    """
+    # Public member variables
+    x = 0.0
+    y = 0.0
+    heading = 0.0
+
+    # Private member variables
+    _acceleration_variance = None
+    _range_variance = None
+    _range_heading_tolerance = None
+    _range_max_speed = None
+    _distance = 0.0
+    _velocity = 0.0
+    _p00 = 0.0
+    _p01 = 0.0
+    _p11 = 0.0
+    _reference_heading = 0.0
+    _reference_range = None
+
+    def __init__(self, acceleration_variance=1.0, range_variance=0.25,
+                 range_heading_tolerance=5.0, range_max_speed=None):
+        """Create an Odometry estimate.
+
+        Args:
+            acceleration_variance: the variance of the accelerometer noise.
+            range_variance: the variance of the range finder noise.
+            range_heading_tolerance: the range finder is only used while the
+                heading is within this many degrees of the heading at reset.
+            range_max_speed: the range finder is only used while the
+                estimated speed is at most this (None for any speed).
+
+        """
+        self._acceleration_variance = acceleration_variance
+        self._range_variance = range_variance
+        self._range_heading_tolerance = range_heading_tolerance
+        self._range_max_speed = range_max_speed
+        self.reset()
+
+    def reset(self, heading=0.0, rng=None):
+        """Start a new estimate with the robot at rest at the origin.
+
+        Args:
+            heading: the current heading in degrees.
+            rng: the current range, used as the reference for later range
+                corrections (None to not use the range finder).
+
+        """
+        self.x = 0.0
+        self.y = 0.0
+        self.heading = heading
+        self._distance = 0.0
+        self._velocity = 0.0
+        self._p00 = 0.0
+        self._p01 = 0.0
+        self._p11 = 0.0
+        self._reference_heading = heading
+        self._reference_range = rng
+
+    def predict(self, acceleration, heading, dt):
+        """Advance the estimate by one time step.
+
+        Args:
+            acceleration: the acceleration along the robot's heading.
+            heading: the heading in degrees.
+            dt: the length of the time step in seconds.
+
+        """
+        if dt <= 0:
+            return
+        step = self._velocity * dt + 0.5 * acceleration * dt * dt
+        self._distance += step
+        self._velocity += acceleration * dt
+        self.heading = heading
+        self._move(step)
+
+        # P = F P F' + Q, with F = [[1, dt], [0, 1]] and Q from the noise in
+        # the acceleration applied over the step
+        q = self._acceleration_variance
+        half_dt2 = 0.5 * dt * dt
+        p00 = (self._p00 + 2 * dt * self._p01 + dt * dt * self._p11 +
+               q * half_dt2 * half_dt2)
+        p01 = self._p01 + dt * self._p11 + q * half_dt2 * dt
+        p11 = self._p11 + q * dt * dt
+        self._p00, self._p01, self._p11 = p00, p01, p11
+
+    def correct_range(self, rng):
+        """Correct the estimate with a range finder reading.
+
+        The reading is ignored if there's no reference range, the robot
+        has turned away from the wall it was facing at reset, or the robot
+        is moving faster than the range max speed.  A filtered reading lags
+        the true range by the filter's delay, which is an error of the delay
+        times the speed; below the max speed that error is small compared to
+        the range variance.
+
+        Args:
+            rng: the range to the object in front of the robot, so driving
+                forward (positive distance) makes the range smaller.
+
+        Returns:
+            True if the reading was used.
+
+        """
+        if (self._reference_range is None or rng is None or
+            math.fabs(self.heading - self._reference_heading) >
+                self._range_heading_tolerance):
+            return False
+        if (self._range_max_speed is not None and
+            math.fabs(self._velocity) > self._range_max_speed):
+            return False
+        # Moving towards the object ahead shortens the range, so the
+        # distance driven forward is how much the range has dropped
+        self.correct_distance(self._reference_range - rng,
+                              self._range_variance)
+        return True
+
+    def correct_distance(self, distance, variance):
+        """Correct the estimate with a measurement of the distance driven.
+
+        Args:
+            distance: the measured distance driven since reset.
+            variance: the variance of the measurement.
+
+        """
+        innovation = distance - self._distance
+        total = self._p00 + variance
+        if total <= 0:
+            return
+        gain0 = self._p00 / total
+        gain1 = self._p01 / total
+        step = gain0 * innovation
+        self._distance += step
+        self._velocity += gain1 * innovation
+        self._move(step)
+        p00 = (1 - gain0) * self._p00
+        p01 = (1 - gain0) * self._p01
+        p11 = self._p11 - gain1 * self._p01
+        self._p00, self._p01, self._p11 = p00, p01, p11
+
+    def correct_velocity(self, velocity, variance):
+        """Correct the estimate with a measurement of the speed.
+
+        Use this with a velocity of 0.0 when the robot is known to be still,
+        which stops the speed from drifting.
+
+        Args:
+            velocity: the measured speed along the robot's heading.
+            variance: the variance of the measurement.
+
+        """
+        innovation = velocity - self._velocity
+        total = self._p11 + variance
+        if total <= 0:
+            return
+        gain0 = self._p01 / total
+        gain1 = self._p11 / total
+        step = gain0 * innovation
+        self._distance += step
+        self._velocity += gain1 * innovation
+        self._move(step)
+        p00 = self._p00 - gain0 * self._p01
+        p01 = (1 - gain1) * self._p01
+        p11 = (1 - gain1) * self._p11
+        self._p00, self._p01, self._p11 = p00, p01, p11
+
+    def get_pose(self):
+        """Return the (x, y, heading) of the robot."""
+        return (self.x, self.y, self.heading)
+
+    def get_distance(self):
+        """Return the distance driven along the robot's path since reset."""
+        return self._distance
+
+    def get_velocity(self):
+        """Return the speed along the robot's heading."""
+        return self._velocity
+
+    def get_covariance(self):
+        """Return the covariance of the (distance, velocity) estimate.
+
+        Returns:
+            A 2x2 tuple of tuples.
+
+        """
+        return ((self._p00, self._p01), (self._p01, self._p11))
+
+    def _move(self, step):
+        """Move the position a distance along the current heading."""
+        radians = math.radians(self.heading - self._reference_heading)
+        self.x += step * math.cos(radians)
+        self.y += step * math.sin(radians)
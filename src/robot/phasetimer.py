@@ -0,0 +1,223 @@
+"""This module provides timing of the phases of a control loop."""
+
+# Imports
+import time
+
+
+class PhaseStatistics(object):
+    """Timing history and histogram for one phase of a loop.
+
+    The most recent durations are kept in a fixed-size ring buffer, and every
+    duration ever recorded is counted in a fixed-width histogram so
+    percentiles can be found without sorting.
+
+    Attributes:
+        name: the name of the phase.
+        count: the number of durations recorded.
+        maximum: the longest duration recorded.
+
+    """
+    # Public member variables
+    name = None
+    count = 0
+    maximum = 0.0
+
+    # Private member variables
+    _history = None
+    _next_index = 0
+    _bins = None
+    _bin_width = None
+
+    def __init__(self, name, history_size, bin_width, bin_count):
+        """Create the statistics for a phase.
+
+        Args:
+            name: the name of the phase.
+            history_size: the number of recent durations to keep.
+            bin_width: the width of each histogram bin in seconds.
+            bin_count: the number of histogram bins (the last one also counts
+                everything longer).
+
+        """
+        self.name = name
+        self.count = 0
+        self.maximum = 0.0
+        self._history = [0.0] * history_size
+        self._next_index = 0
+        self._bins = [0] * bin_count
+        self._bin_width = bin_width
+
+    def record(self, duration):
+        """Record the duration of one iteration of the phase."""
+        self._history[self._next_index] = duration
+        self._next_index = (self._next_index + 1) % len(self._history)
+        index = min(int(duration / self._bin_width), len(self._bins) - 1)
+        self._bins[index] += 1
+        self.count += 1
+        if duration > self.maximum:
+            self.maximum = duration
+
+    def get_history(self):
+        """Return the recent durations, oldest first."""
+        if self.count < len(self._history):
+            return self._history[:self.count]
+        return (self._history[self._next_index:] +
+                self._history[:self._next_index])
+
+    def get_histogram(self):
+        """Return a List of (bin upper edge, count) for the non-empty bins."""
+        return [((index + 1) * self._bin_width, count)
+                for index, count in enumerate(self._bins) if count]
+
+    def get_percentile(self, fraction):
+        """Return an upper bound for a percentile of the recorded durations.
+
+        Args:
+            fraction: the percentile as a fraction (0.0 to 1.0).
+
+        Returns:
+            The upper edge of the histogram bin containing the percentile
+            (never more than the maximum), or None if nothing was recorded.
+
+        """
+        if not self.count:
+            return None
+        needed = fraction * self.count
+        total = 0
+        for index, count in enumerate(self._bins):
+            total += count
+            if total >= needed and total:
+                return min((index + 1) * self._bin_width, self.maximum)
+        return self.maximum
+
+
+class PhaseTimer(object):
+    """Times the phases of each iteration of a control loop.
+
+    Call start() at the top of the loop, mark() after each phase and finish()
+    at the bottom.  mark() charges the time since the previous mark to the
+    named phase, so a phase may be marked more than once per iteration; its
+    total for the iteration is recorded by finish().  The whole iteration is
+    recorded as the phase named TOTAL.
+
+    """
+    TOTAL = 'total'
+
+    # Private member variables
+    _clock = None
+    _phases = None
+    _statistics = None
+    _current = None
+    _start = None
+    _last = None
+
+    def __init__(self, phases, history_size=500, bin_width=0.00025,
+                 bin_count=200, clock=time.time):
+        """Create a PhaseTimer.
+
+        Args:
+            phases: the names of the phases, in loop order.
+            history_size: the number of recent iterations to keep per phase.
+            bin_width: the width of each histogram bin in seconds.
+            bin_count: the number of histogram bins per phase.
+            clock: the function that returns the current time in seconds.
+
+        """
+        self._clock = clock
+        self._phases = list(phases) + [self.TOTAL]
+        self._statistics = dict((name, PhaseStatistics(name, history_size,
+                                                       bin_width, bin_count))
+                                for name in self._phases)
+        self._current = dict.fromkeys(self._phases, 0.0)
+        self._start = None
+        self._last = None
+
+    def start(self):
+        """Mark the start of an iteration."""
+        self._start = self._clock()
+        self._last = self._start
+        for name in self._phases:
+            self._current[name] = 0.0
+
+    def mark(self, phase):
+        """Charge the time since the last mark to a phase.
+
+        Args:
+            phase: the name of the phase that just finished.
+
+        """
+        now = self._clock()
+        self._current[phase] += now - self._last
+        self._last = now
+
+    def finish(self):
+        """Record the phase times of the iteration that just finished."""
+        if self._start is None:
+            return
+        self._current[self.TOTAL] = self._clock() - self._start
+        for name in self._phases:
+            self._statistics[name].record(self._current[name])
+        self._start = None
+
+    def get_statistics(self, phase):
+        """Return the PhaseStatistics for a phase."""
+        return self._statistics[phase]
+
+    def get_summary_lines(self, count=6):
+        """Return short lines describing the slowest phases.
+
+        Each line has the phase name and its p50, p99 and max in
+        milliseconds, and fits on a Driver Station LCD line.
+
+        Args:
+            count: the number of lines to return (the total is always first).
+
+        Returns:
+            A List of strings.
+
+        """
+        phases = [self._statistics[name] for name in self._phases[:-1]
+                  if self._statistics[name].count]
+        phases.sort(key=lambda stats: stats.get_percentile(0.99),
+                    reverse=True)
+        phases.insert(0, self._statistics[self.TOTAL])
+        lines = []
+        for stats in phases[:count]:
+            if not stats.count:
+                continue
+            lines.append("%-6s%5.1f%5.1f%5.1f" %
+                         (stats.name[:6],
+                          stats.get_percentile(0.5) * 1000,
+                          stats.get_percentile(0.99) * 1000,
+                          stats.maximum * 1000))
+        return lines
+
+    def dump(self, filename):
+        """Write all of the timing data to a file.
+
+        The file lists the statistics and histogram for each phase, followed
+        by the recent per-iteration times of every phase as CSV.
+
+        Args:
+            filename: the name of the file to write.
+
+        """
+        with open(filename, 'w') as output:
+            for name in self._phases:
+                stats = self._statistics[name]
+                if not stats.count:
+                    output.write("%s: no samples\n" % name)
+                    continue
+                output.write("%s: count %d p50 %.3f ms p99 %.3f ms "
+                             "max %.3f ms\n" %
+                             (name, stats.count,
+                              stats.get_percentile(0.5) * 1000,
+                              stats.get_percentile(0.99) * 1000,
+                              stats.maximum * 1000))
+                for edge, count in stats.get_histogram():
+                    output.write("  <= %.2f ms: %d\n" % (edge * 1000, count))
+            output.write("\n" + ",".join(self._phases) + "\n")
+            histories = [self._statistics[name].get_history()
+                         for name in self._phases]
+            for row in zip(*histories):
+                output.write(",".join("%.6f" % value for value in row) + "\n")
@@ -0,0 +1,115 @@
+"""This module provides a PID controller."""
+
+# Imports
+import math
+import time
+
+
+class PIDController(object):
+    """A proportional-integral-derivative controller.
+
+    Each update takes the error (desired value minus measured value) and
+    returns an output, like a motor speed ratio, that drives the error to
+    zero.  The time since the last update is used for the integral and
+    derivative terms, so the gains don't depend on the loop rate.
+
+    The feed-forward is a constant output added in the direction of the
+    error, to overcome the friction that keeps a mechanism from moving at
+    low speeds.  The integral term is limited so it can't build up while the
+    mechanism is stuck or the output is at its limit.
+
+    """
+    # Private member variables
+    _kp = None
+    _ki = None
+    _kd = None
+    _feed_forward = None
+    _integral_limit = None
+    _reset_time = None
+    _clock = None
+    _integral = 0.0
+    _previous_error = None
+    _last_time = None
+
+    def __init__(self, kp=0.0, ki=0.0, kd=0.0, feed_forward=0.0,
+                 integral_limit=0.0, reset_time=0.5, clock=time.time):
+        """Create a PIDController.
+
+        Args:
+            kp: the proportional gain.
+            ki: the integral gain.
+            kd: the derivative gain.
+            feed_forward: the output added in the direction of the error.
+            integral_limit: the largest output from the integral term (0 for
+                no limit).
+            reset_time: if updates stop for this many seconds, the next
+                update starts over as a new move.
+            clock: the function that returns the current time in seconds.
+
+        """
+        self._kp = kp
+        self._ki = ki
+        self._kd = kd
+        self._feed_forward = feed_forward
+        self._integral_limit = integral_limit
+        self._reset_time = reset_time
+        self._clock = clock
+        self.reset()
+
+    def reset(self):
+        """Clear the integral and derivative history for a new move."""
+        self._integral = 0.0
+        self._previous_error = None
+        self._last_time = None
+
+    def update(self, error, limit=1.0, dt=None):
+        """Calculate the output for the current error.
+
+        Args:
+            error: the desired value minus the measured value.
+            limit: the largest output magnitude.
+            dt: the time since the last update in seconds (defaults to the
+                time measured by the clock).
+
+        Returns:
+            The output, between -limit and limit.
+
+        """
+        now = self._clock()
+        if dt is None:
+            if (self._last_time is None or
+                now - self._last_time > self._reset_time):
+                self.reset()
+                dt = 0.0
+            else:
+                dt = now - self._last_time
+        self._last_time = now
+
+        output = self._kp * error
+
+        # Derivative of the error, once there are two updates to compare
+        if dt > 0 and self._previous_error is not None:
+            output += self._kd * (error - self._previous_error) / dt
+        self._previous_error = error
+
+        # Integral of the error, limited to the integral output limit
+        previous_integral = self._integral
+        if dt > 0 and self._ki:
+            self._integral += error * dt
+            if self._integral_limit > 0:
+                integral_limit = self._integral_limit / math.fabs(self._ki)
+                self._integral = max(-integral_limit,
+                                     min(integral_limit, self._integral))
+        output += self._ki * self._integral
+
+        if error > 0:
+            output += self._feed_forward
+        elif error < 0:
+            output -= self._feed_forward
+
+        # Don't wind up the integral while the output is at its limit
+        if math.fabs(output) > limit:
+            if output * error > 0:
+                self._integral = previous_integral
+            output = math.copysign(limit, output)
+        return output
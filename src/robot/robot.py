@@ -14,14 +14,22 @@ import common
 import drivetrain
 import feeder
 import logging
+import loopprofiler
+import looptimer
 import math
 import parameters
+import phasetimer
+import pid
 import queue
+import sensorsampler
 import shooter
 import stopwatch
 import sys
 import target
 import target_server
+import tasks
+import telemetry
+import time
 import userinterface
 
 
@@ -37,7 +45,9 @@ class MyRobot(wpilib.SimpleRobot):
     # Public member variables
 
     # Private member objects
-    _autoscript = None
+    _autoscript_library = None
+    _autoscript_plan = None
+    _autoscript_refresh_timer = None
     _drive_train = None
     _feeder = None
     _log = None
@@ -46,8 +56,15 @@ class MyRobot(wpilib.SimpleRobot):
     _shooter = None
     _image_server = None
     _timer = None
-    _range_print_timer = None
+    _loop_timer = None
+    _loop_profiler = None
+    _scheduler = None
+    _sensor_sampler = None
+    _phase_timer = None
+    _telemetry = None
     _user_interface = None
+    _aim_distance_pid = None
+    _aim_heading_pid = None
 
     # Private parameters
     _max_hold_to_shoot_time = None
@@ -57,6 +74,23 @@ class MyRobot(wpilib.SimpleRobot):
     _truss_pass_position = None
     _optimum_shooting_range = None
     _shooting_angle_offset = None
+    _target_server_host = None
+    _target_server_port = None
+    _loop_period = None
+    _phase_timing_history = None
+    _profile_iterations = None
+    _profile_flag_file = None
+    _profile_check_period = None
+    _autoscript_refresh_period = None
+    _sensor_sample_period = None
+    _aim_combined = None
+    _aim_distance_gain = None
+    _aim_heading_gain = None
+    _aim_minimum_speed = None
+    _aim_max_linear_speed = None
+    _aim_max_turn_speed = None
+    _aim_distance_tolerance = None
+    _aim_heading_tolerance = None
 
     # Private member variables
     _log_enabled = False
@@ -67,23 +101,14 @@ class MyRobot(wpilib.SimpleRobot):
     _driver_alternate = False
     _scoring_alternate = False
     _current_feeder_position = None
-    _hold_to_shoot_step = -1
     _hold_to_shoot_power = -1
-    _prep_for_feed_step = -1
-    _truss_pass_step = -1
     _driver_controls_swap_ratio = 1.0
     _hold_to_shoot_power_factor = 0.0
-    _shooter_setup_step = -1
-    _aim_at_target_step = -1
     _aim_at_target_target = None
-    _disable_range_print = False
-    _robot_names = None
-    _drive_train_names = None
-    _feeder_names = None
-    _shooter_names = None
-    _user_interface_names = None
+    _displayed_range = None
     _target_queue = None
-    _current_targets = None
+    _targets = None
+    _robot_state = None
 
     def _initialize(self, params, logging_enabled):
         """Initialize the robot.
@@ -110,7 +135,9 @@ class MyRobot(wpilib.SimpleRobot):
         # Initialize public member variables
 
         # Initialize private member objects
-        self._autoscript = None
+        self._autoscript_library = None
+        self._autoscript_plan = None
+        self._autoscript_refresh_timer = None
         self._drive_train = None
         self._feeder = None
         self._log = None
@@ -118,8 +145,15 @@ class MyRobot(wpilib.SimpleRobot):
         self._shooter = None
         self._image_server = None
         self._timer = None
-        self._range_print_timer = None
+        self._loop_timer = None
+        self._loop_profiler = None
+        self._scheduler = None
+        self._sensor_sampler = None
+        self._phase_timer = None
+        self._telemetry = None
         self._user_interface = None
+        self._aim_distance_pid = None
+        self._aim_heading_pid = None
 
         # Initialize private parameters
         self._max_hold_to_shoot_time = None
@@ -129,6 +163,23 @@ class MyRobot(wpilib.SimpleRobot):
         self._truss_pass_position = None
         self._optimum_shooting_range = None
         self._shooting_angle_offset = None
+        self._target_server_host = '10.0.94.2'
+        self._target_server_port = 1180
+        self._loop_period = 0.01
+        self._phase_timing_history = 500
+        self._profile_iterations = 100
+        self._profile_flag_file = '/py/profile'
+        self._profile_check_period = 1.0
+        self._autoscript_refresh_period = 2.0
+        self._sensor_sample_period = 0.0
+        self._aim_combined = False
+        self._aim_distance_gain = 0.0
+        self._aim_heading_gain = 0.0
+        self._aim_minimum_speed = 0.0
+        self._aim_max_linear_speed = 0.3
+        self._aim_max_turn_speed = 0.3
+        self._aim_distance_tolerance = 0.5
+        self._aim_heading_tolerance = 1.0
 
         # Initialize private member variables
         self._log_enabled = False
@@ -140,17 +191,13 @@ class MyRobot(wpilib.SimpleRobot):
         self._scoring_alternate = False
         self._driver_controls_swap_ratio = 1.0
         self._current_feeder_position = None
-        self._hold_to_shoot_step = -1
         self._hold_to_shoot_power = 0
-        self._prep_for_feed_step = -1
-        self._truss_pass_step = -1
         self._hold_to_shoot_power_factor = 0.0
-        self._shooter_setup_step = -1
-        self._aim_at_target_step = -1
         self._aim_at_target_target = None
-        self._disable_range_print = False
+        self._displayed_range = None
         self._target_queue = None
-        self._current_targets = []
+        self._targets = target.TargetSnapshot()
+        self._robot_state = common.ProgramState.DISABLED
 
         # Enable logging if specified
         #if logging_enabled:
@@ -161,14 +208,33 @@ class MyRobot(wpilib.SimpleRobot):
                 #self._log_enabled = True
 
         self._timer = stopwatch.Stopwatch()
-        self._range_print_timer = stopwatch.Stopwatch()
+        self._autoscript_refresh_timer = stopwatch.Stopwatch()
 
         # Read parameters file
         self._parameters_file = params
         self.load_parameters()
 
+        # Every mode runs its loop at the same fixed period
+        self._loop_timer = looptimer.LoopTimer(self._loop_period, wpilib.Wait)
+
+        # Time the phases of the Teleop loop
+        self._phase_timer = phasetimer.PhaseTimer(['ui', 'sensors',
+                                                   'targets', 'teleauto',
+                                                   'requests', 'motors',
+                                                   'lcd'],
+                                        history_size=self._phase_timing_history)
+
+        # Run routines (autoscripts and tele-auto macros) cooperatively
+        self._scheduler = tasks.TaskScheduler()
+
+        # Profile loop iterations on request
+        self._loop_profiler = loopprofiler.LoopProfiler(
+                                    self._profile_iterations,
+                                    self._profile_flag_file,
+                                    "/py/",
+                                    self._profile_check_period)
+
         # Create robot objects
-        self._autoscript = autoscript.AutoScript()
         self._drive_train = drivetrain.DriveTrain("/py/par/drivetrain.par",
                                                   self._log_enabled)
         self._feeder = feeder.Feeder("/py/par/feeder.par", self._log_enabled)
@@ -178,19 +244,43 @@ class MyRobot(wpilib.SimpleRobot):
                                                     "/py/par/userinterface.par",
                                                     self._log_enabled)
 
-        # Store the attributes/names in each object
-        self._robot_names = dir(self)
-        self._drive_train_names = dir(self._drive_train)
-        self._feeder_names = dir(self._feeder)
-        self._shooter_names = dir(self._shooter)
-        self._user_interface_names = dir(self._user_interface)
+        # Optionally sample the sensors faster than the loop runs
+        if self._sensor_sample_period > 0:
+            self._sensor_sampler = sensorsampler.SensorSampler(
+                                                self._sensor_sample_period)
+            self._drive_train.register_sensors(self._sensor_sampler)
+            self._shooter.register_sensors(self._sensor_sampler)
+            self._sensor_sampler.start()
+
+        # Keep the autoscripts compiled against the robot objects
+        # Commands in a group can't share a subsystem, and any that are
+        # abandoned when a 'group_any' finishes have their subsystems stopped
+        subsystems = {self._drive_train: 'drive_train',
+                      self._feeder: 'feeder',
+                      self._shooter: 'shooter'}
+        requirements = {'aim_at_target': ('drive_train',),
+                        'aim_at_nearest': ('drive_train',),
+                        'shooter_setup': ('shooter', 'feeder')}
+        stop_hooks = {'drive_train': self._stop_drive_train,
+                      'feeder': self._stop_feeder,
+                      'shooter': self._stop_shooter}
+        self._autoscript_library = autoscript.AutoScriptLibrary("/py/as/",
+                                        [self, self._drive_train, self._feeder,
+                                         self._shooter, self._user_interface],
+                                        subsystems, requirements, stop_hooks)
 
         # Create a queue for transferring Targets from the image server to us
         # Since we pass a List of targets, the size will be 1
         self._target_queue = queue.Queue(1)
 
+        # Create the telemetry that is sent back to the driver station
+        self._telemetry = telemetry.Telemetry()
+
         # Create the TCP image server, and start it in a background thread
-        self._image_server = target_server.ImageServer(self._target_queue)
+        self._image_server = target_server.ImageServer(self._target_queue,
+                                        port=self._target_server_port,
+                                        telemetry_store=self._telemetry,
+                                        host=self._target_server_host)
         self._image_server.start()
 
     def load_parameters(self):
@@ -226,6 +316,50 @@ class MyRobot(wpilib.SimpleRobot):
                                                 "OPTIMUM_SHOOTING_RANGE")
             self._shooting_angle_offset = self._parameters.get_value(section,
                                                 "SHOOTING_ANGLE_OFFSET")
+            self._target_server_host = str(self._parameters.get_value(section,
+                                                "TARGET_SERVER_HOST"))
+            self._target_server_port = self._parameters.get_value(section,
+                                                "TARGET_SERVER_PORT")
+            self._loop_period = self._parameters.get_value(section,
+                                                "LOOP_PERIOD")
+            self._phase_timing_history = self._parameters.get_value(section,
+                                                "PHASE_TIMING_HISTORY")
+            self._profile_iterations = self._parameters.get_value(section,
+                                                "PROFILE_ITERATIONS")
+            self._profile_flag_file = str(self._parameters.get_value(section,
+                                                "PROFILE_FLAG_FILE"))
+            self._profile_check_period = self._parameters.get_value(section,
+                                                "PROFILE_CHECK_PERIOD")
+            self._autoscript_refresh_period = self._parameters.get_value(
+                                                section,
+                                                "AUTOSCRIPT_REFRESH_PERIOD")
+            self._sensor_sample_period = self._parameters.get_value(section,
+                                                "SENSOR_SAMPLE_PERIOD")
+            self._aim_combined = (self._parameters.get_value(section,
+                                                "AIM_COMBINED") > 0)
+            self._aim_distance_gain = self._parameters.get_value(section,
+                                                "AIM_DISTANCE_GAIN")
+            self._aim_heading_gain = self._parameters.get_value(section,
+                                                "AIM_HEADING_GAIN")
+            self._aim_minimum_speed = self._parameters.get_value(section,
+                                                "AIM_MINIMUM_SPEED")
+            self._aim_max_linear_speed = self._parameters.get_value(section,
+                                                "AIM_MAX_LINEAR_SPEED")
+            self._aim_max_turn_speed = self._parameters.get_value(section,
+                                                "AIM_MAX_TURN_SPEED")
+            self._aim_distance_tolerance = self._parameters.get_value(section,
+                                                "AIM_DISTANCE_TOLERANCE")
+            self._aim_heading_tolerance = self._parameters.get_value(section,
+                                                "AIM_HEADING_TOLERANCE")
+
+        # Close the distance and heading to the target with proportional
+        # control, using the minimum speed to overcome friction
+        self._aim_distance_pid = pid.PIDController(self._aim_distance_gain,
+                                                   0.0, 0.0,
+                                                   self._aim_minimum_speed)
+        self._aim_heading_pid = pid.PIDController(self._aim_heading_gain,
+                                                  0.0, 0.0,
+                                                  self._aim_minimum_speed)
 
         self._hold_to_shoot_power_factor = ((100.0 -
                                              self._min_hold_to_shoot_power) /
@@ -243,6 +377,7 @@ class MyRobot(wpilib.SimpleRobot):
     def _disabled_init(self):
         """Prepares the robot for Disabled mode."""
         self._set_robot_state(common.ProgramState.DISABLED)
+        self._scheduler.cancel_all()
 
         # Default starting mode is to have the arms UP
         if self._feeder:
@@ -252,19 +387,15 @@ class MyRobot(wpilib.SimpleRobot):
         # Read sensors
         self._read_sensors()
 
-        # Get the list of autoscript files/routines
-        if self._autoscript:
-            self._autoscript_files = self._autoscript.get_available_scripts(
-                                                                    "/py/as/")
+        # Compile any new or changed autoscript files/routines
+        if self._autoscript_library:
+            self._refresh_autoscripts()
+            self._autoscript_refresh_timer.start()
             if self._autoscript_files and len(self._autoscript_files) > 0:
                 self._autoscript_file_counter = 0
                 self._autoscript_filename = self._autoscript_files[
                                                 self._autoscript_file_counter]
-                if self._user_interface:
-                    self._disable_range_print = True
-                    self._user_interface.output_user_message(
-                                                self._autoscript_filename,
-                                                True)
+                self._print_autoscript()
 
         self.GetWatchdog().SetEnabled(False)
 
@@ -282,7 +413,17 @@ class MyRobot(wpilib.SimpleRobot):
         self._disabled_init()
 
         # Repeat this loop as long as we're in Disabled
+        self._loop_timer.start()
         while self.IsDisabled():
+            self._loop_profiler.begin()
+
+            # Read the controllers once for this loop
+            if self._user_interface:
+                self._user_interface.update()
+
+            # Check for profiling request (before the buttons are stored)
+            self._check_profile_request(True)
+
             # Set all motors to be stopped (prevent motor safety errors)
             if self._drive_train:
                 self._drive_train.drive(0.0, 0.0, False)
@@ -290,71 +431,70 @@ class MyRobot(wpilib.SimpleRobot):
                 self._feeder.feed(feeder.Direction.STOP, 0.0)
             if self._shooter:
                 self._shooter.move_shooter(0.0)
-            if (self._user_interface and self._autoscript and
+            if (self._user_interface and self._autoscript_library and
                 self._autoscript_files and len(self._autoscript_files) > 0):
-                if (self._user_interface.get_button_state(
+                if self._user_interface.button_pressed(
                                     userinterface.UserControllers.DRIVER,
-                                    userinterface.JoystickButtons.START) == 1
-                    and self._user_interface.button_state_changed(
-                                    userinterface.UserControllers.DRIVER,
-                                    userinterface.JoystickButtons.START)):
+                                    userinterface.JoystickButtons.START):
                     self._autoscript_file_counter += 1
                     if (self._autoscript_file_counter >
                         (len(self._autoscript_files) - 1)):
                         self._autoscript_file_counter = 0
                     self._autoscript_filename = self._autoscript_files[
                                                   self._autoscript_file_counter]
-                    self._disable_range_print = True
-                    self._user_interface.output_user_message(
-                                                self._autoscript_filename,
-                                                True)
+                    self._print_autoscript()
+
+            # Update/store the UI button state, whether or not any were used
+            if self._user_interface:
+                self._user_interface.store_button_states(
+                        userinterface.UserControllers.DRIVER)
                 self._user_interface.store_button_states(
-                                        userinterface.UserControllers.DRIVER)
+                        userinterface.UserControllers.SCORING)
+
+            # Pick up autoscript changes while there's time to compile them
+            if (self._autoscript_library and
+                self._autoscript_refresh_timer.elapsed_time_in_secs() >
+                self._autoscript_refresh_period):
+                self._refresh_autoscripts()
+                self._autoscript_refresh_timer.start()
 
             # Read sensors
             self._read_sensors()
-            self._print_range(False)
+            self._print_range()
             #self._print_targets(False)
 
-            wpilib.Wait(0.01)
+            if self._user_interface:
+                self._user_interface.update_lcd()
+
+            self._end_profiled_iteration("disabled")
+            self._wait_for_next_loop("disabled")
+
+        self._log_loop_timing("Disabled")
 
     def _autonomous_init(self):
         """Prepares the robot for Autonomous mode."""
         # Perform initialization before looping
-        if self._autoscript and self._autoscript_filename:
-            self._autoscript.parse(self._autoscript_filename)
+        # The plan was compiled during Disabled, so there's no file I/O here
+        self._autoscript_plan = None
+        if self._autoscript_library and self._autoscript_filename:
+            self._autoscript_plan = self._autoscript_library.get_plan(
+                                                    self._autoscript_filename)
 
         # Read sensors
         self._read_sensors()
-        self._disable_range_print = False
 
         self._set_robot_state(common.ProgramState.AUTONOMOUS)
         self.GetWatchdog().SetEnabled(False)
 
         # Get targets in the queue if any exist
-        if not self._target_queue.empty():
-            try:
-                self._current_targets = self._target_queue.get(block=False)
-                if (not self._current_targets or
-                    not isinstance(self._current_targets, list) or
-                    (len(self._current_targets) == 1 and
-                     self._current_targets[0].no_targets)):
-                    self._current_targets = []
-                    self._logger.debug("No targets flag, clearing targets")
-            except queue.Empty:
-                self._logger.warn("Target queue is empty")
-                self._current_targets = []
-            self._logger.debug("Targets: " + str(self._current_targets))
-        else:
-            self._logger.debug("Target queue is empty")
+        self._ingest_targets()
 
-
-        # We set this to -2 to prepare for autonomous use
-        self._aim_at_target_step = -2
+        # Run the autoscript as a task
         self._aim_at_target_target = None
-
-        # Prepare to perform the shooter setup
-        self._shooter_setup_step = 1
+        self._scheduler.cancel_all()
+        if self._autoscript_plan:
+            self._scheduler.start('autoscript',
+                                  self._run_autoscript(self._autoscript_plan))
 
     def Autonomous(self):
         """Controls the robot during Autonomous mode.
@@ -365,146 +505,98 @@ class MyRobot(wpilib.SimpleRobot):
         # Autonomous initialization
         self._autonomous_init()
 
-        # Method names must be unique for reflection to work,
-        # and they should be descriptive
-        autoscript_finished = False
-        current_command = None
-        current_command_complete = True # Initially true to get 1st command
-
-        if not self._autoscript or not self._autoscript_filename:
-            autoscript_finished = True
-
-        # These store the owning object and method pointer for each
-        # autoscript command (using reflection and introspection)
-        owner = None
-        method = None
-
         # Repeat this loop as long as we're in Autonomous
+        self._loop_timer.start()
         while self.IsAutonomous() and self.IsEnabled():
+            self._loop_profiler.begin()
 
             # Read sensors
             self._read_sensors()
-            self._print_range(True)
+            self._print_range()
             #self._print_targets(False)
 
             # Get targets in the queue if any exist
-            if not self._target_queue.empty():
-                try:
-                    self._current_targets = self._target_queue.get(block=False)
-                    if (not self._current_targets or
-                        not isinstance(self._current_targets, list) or
-                        (len(self._current_targets) == 1 and
-                         self._current_targets[0].no_targets)):
-                        self._current_targets = []
-                        self._logger.debug("No targets flag, clearing targets")
-                except queue.Empty:
-                    self._logger.warn("Target queue is empty")
-                    self._current_targets = []
-                self._logger.debug("Targets: " + str(self._current_targets))
-            else:
-                self._logger.debug("Target queue is empty")
+            self._ingest_targets()
 
             # Execute autoscript commands
-            if not autoscript_finished:
-
-                # Handle the command
-                # If we found the method, unpack the parameters List
-                # (using *) and call it
-                if not current_command_complete:
-                    try:
-                        current_command_complete = \
-                                method(*current_command.parameters)
-                    except TypeError:
-                        self._logger.warn("TypeError running autoscript"
-                                    " command: " + str(current_command.command))
-                        current_command_complete = True
-
-                # Move on to the next command when the current is finished
-                if current_command_complete:
-                    # Get next command
-                    current_command_complete = False
-                    current_command = self._autoscript.get_next_command()
-
-                    # If it's None or invalid or end, we're finished
-                    if (not current_command or
-                        current_command.command == "invalid" or
-                        current_command.command == "end"):
-                        autoscript_finished = True
-                    else:
-                        # Try to get the method reference using its name
-                        owner, method = self._get_method(
-                                                    current_command.command)
-                        if not method:
-                            current_command_complete = True
-                        # Check if method has '_time' in it
-                        elif '_time' in current_command.command:
-                            # We need to reset its internal timer first
-                            reset = None
-                            owner, reset = self._get_method(
-                                                    'reset_and_start_timer',
-                                                    obj=owner)
-                            if reset:
-                                try:
-                                    reset()
-                                except TypeError:
-                                    self._logger.warn("TypeError running "
-                                                      "autoscript timer reset")
-                                    current_command_complete = True
-                            else:
-                                current_command_complete = True
+            if self._scheduler.is_running('autoscript'):
+                self._scheduler.run()
 
             # Autoscript is finished
             else:
                 # Set all motors to inactive
-                if self._drive_train:
-                    self._drive_train.drive(0.0, 0.0, False)
-                if self._feeder:
-                    self._feeder.feed(feeder.Direction.STOP, 0.0)
-                if self._shooter:
-                    self._shooter.move_shooter(0.0)
+                self._stop_drive_train()
+                self._stop_feeder()
+                self._stop_shooter()
 
-            wpilib.Wait(0.01)
+            if self._user_interface:
+                self._user_interface.update_lcd()
 
-    def _get_method(self, name, obj=None):
-        """This tries to find the matching method in one of the objects.
+            self._check_profile_request(False)
+            self._end_profiled_iteration("autonomous")
+            self._wait_for_next_loop("autonomous")
 
-        Args:
-            name: the name of the method.
+        self._log_loop_timing("Autonomous")
 
-        Returns:
-            Object, Method.
+    def _run_autoscript(self, plan):
+        """Routine that runs the steps of an autoscript plan in order.
+
+        Args:
+            plan: the AutoScriptPlan to run.
 
         """
-        calling_object = None
-        method = None
-
-        # Determine which object contains the method
-        if not obj:
-            if name:
-                if name in self._robot_names:
-                    calling_object = self
-                elif name in self._drive_train_names:
-                    calling_object = self._drive_train
-                elif name in self._feeder_names:
-                    calling_object = self._feeder
-                elif name in self._shooter_names:
-                    calling_object = self._shooter
-                elif name in self._user_interface_names:
-                    calling_object = self._user_interface
-        else:
-            calling_object = obj
+        step = plan.get_next_step()
+        while step:
+            # Reset the timer for timed commands
+            step.start()
+            while True:
+                try:
+                    if step.run():
+                        break
+                except TypeError:
+                    self._logger.warn("TypeError running autoscript"
+                                      " command: " + step.command)
+                    break
+                yield
+            step = plan.get_next_step()
+
+    def _stop_drive_train(self):
+        """Stop the drive train motors."""
+        if self._drive_train:
+            self._drive_train.drive(0.0, 0.0, False)
 
-        # Get the method pointer (sort of) from the object
-        if calling_object:
-            try:
-                method = getattr(calling_object, name)
-                # Make sure method is callable
-                if method and not callable(method):
-                    method = None
-            except AttributeError:
-                self._logger.warn("AttributeError getting method pointer")
+    def _stop_feeder(self):
+        """Stop the feeder motors."""
+        if self._feeder:
+            self._feeder.feed(feeder.Direction.STOP, 0.0)
+
+    def _stop_shooter(self):
+        """Stop the shooter motors."""
+        if self._shooter:
+            self._shooter.move_shooter(0.0)
+
+    def _refresh_autoscripts(self):
+        """Compile new or changed autoscripts, reporting commands that failed.
 
-        return calling_object, method
+        The selected script is kept if it still exists, otherwise the first
+        script is selected.
+
+        """
+        for filename in self._autoscript_library.refresh():
+            self._logger.info("Compiled autoscript " + filename)
+            plan = self._autoscript_library.get_plan(filename)
+            for error in plan.errors:
+                self._logger.warn("Autoscript " + filename + ": " + error)
+
+        self._autoscript_files = self._autoscript_library.get_filenames()
+        if self._autoscript_filename in self._autoscript_files:
+            self._autoscript_file_counter = self._autoscript_files.index(
+                                                    self._autoscript_filename)
+        elif self._autoscript_files:
+            self._autoscript_file_counter = 0
+            self._autoscript_filename = self._autoscript_files[0]
+        else:
+            self._autoscript_filename = None
 
     def _operator_control_init(self):
         """Prepares the robot for Teleop mode."""
@@ -512,8 +604,8 @@ class MyRobot(wpilib.SimpleRobot):
         if self._timer:
             self._timer.stop()
 
-        self._disable_range_print = False
         self._set_robot_state(common.ProgramState.TELEOP)
+        self._scheduler.cancel_all()
 
         # Enable the watchdog
         dog = self.GetWatchdog()
@@ -528,33 +620,32 @@ class MyRobot(wpilib.SimpleRobot):
         """
         self._operator_control_init()
         dog = self.GetWatchdog()
+        phases = self._phase_timer
         # Repeat this loop as long as we're in Teleop
+        self._loop_timer.start()
         while self.IsOperatorControl() and self.IsEnabled():
+            self._loop_profiler.begin()
+            phases.start()
+
             # Feed the watchdog timer
             dog.Feed()
 
+            # Read the controllers once for this loop
+            if self._user_interface:
+                self._user_interface.update()
+            phases.mark('ui')
+
             # Read sensors
             self._read_sensors()
+            phases.mark('sensors')
 
             # Get targets in the queue if any exist
-            if not self._target_queue.empty():
-                try:
-                    self._current_targets = self._target_queue.get(block=False)
-                    if (not self._current_targets or
-                        not isinstance(self._current_targets, list) or
-                        (len(self._current_targets) == 1 and
-                         self._current_targets[0].no_targets)):
-                        self._current_targets = []
-                        self._logger.debug("No targets flag, clearing targets")
-                except queue.Empty:
-                    self._logger.warn("Target queue is empty")
-                    self._current_targets = []
-                self._logger.debug("Targets: " + str(self._current_targets))
-            else:
-                self._logger.debug("Target queue is empty")
+            self._ingest_targets()
+            phases.mark('targets')
 
             # Perform tele-auto routines
-            self._perform_tele_auto()
+            self._scheduler.run()
+            phases.mark('teleauto')
 
             # Perform user controlled actions
             if self._user_interface:
@@ -564,35 +655,51 @@ class MyRobot(wpilib.SimpleRobot):
                 # Check for ignore encoder limit request
                 self._check_ignore_limits()
 
-                # Print the range and check for other print timeouts
-                self._print_range(True)
-                #self._print_targets(False)
-                self._check_ui_print_timeout()
-
                 # Check swap drivetrain direction request
                 self._check_swap_drivetrain_request()
 
                 # Check for tele-auto requests
                 self._check_tele_auto_requests()
 
-                # Manually control the robot
-                self._control_drive_train()
-                self._control_shooter()
-                self._control_feeder()
-
                 # Check for tele-auto kill switch
                 self._check_tele_auto_kill()
 
                 # Check for debug to console request
                 self._check_debug_request()
 
+                # Check for loop timing summary request
+                self._check_timing_request()
+
+                # Check for profiling request
+                self._check_profile_request(True)
+                phases.mark('requests')
+
+                # Manually control the robot
+                self._control_drive_train()
+                self._control_shooter()
+                self._control_feeder()
+                phases.mark('motors')
+
+                # Print the range and send any changed lines to the LCD
+                self._print_range()
+                #self._print_targets(False)
+                self._user_interface.update_lcd()
+                phases.mark('lcd')
+
                 # Update/store the UI button state
                 self._user_interface.store_button_states(
                         userinterface.UserControllers.DRIVER)
                 self._user_interface.store_button_states(
                         userinterface.UserControllers.SCORING)
+                phases.mark('ui')
 
-            wpilib.Wait(0.01)
+            phases.finish()
+            self._end_profiled_iteration("teleop")
+            self._wait_for_next_loop("teleop")
+
+        self._log_loop_timing("OperatorControl")
+        for stats in self._scheduler.get_statistics():
+            self._logger.info("Task " + stats.get_summary())
 
     def reset_and_start_timer(self):
         """Resets and restarts the timer."""
@@ -615,9 +722,99 @@ class MyRobot(wpilib.SimpleRobot):
             self._drive_train.read_sensors()
         if self._shooter:
             self._shooter.read_sensors()
+        self._update_telemetry()
+
+    def _ingest_targets(self):
+        """Take the latest targets message, if one arrived, as the snapshot.
+
+        The snapshot is only rebuilt when a new message arrives, and every
+        routine reads it for the rest of the loop.
+
+        """
+        try:
+            message = self._target_queue.get(block=False)
+        except queue.Empty:
+            return
+        self._targets = target.TargetSnapshot.from_message(message)
+        if not self._targets:
+            self._logger.debug("No targets flag, clearing targets")
+        self._logger.debug("Targets: " + str(self._targets.targets))
+
+    def _update_telemetry(self):
+        """Store the latest sensor values for the driver station."""
+        if not self._telemetry:
+            return
+        values = {'program_state': self._robot_state,
+                  'loop_time': self._loop_timer.loop_time}
+        if self._drive_train:
+            values['gyro_angle'] = self._drive_train.get_heading()
+            values['range'] = self._drive_train.get_range()
+        if self._shooter:
+            values['encoder_count'] = self._shooter.get_encoder_count()
+        self._telemetry.update(**values)
+
+    def _check_profile_request(self, check_buttons):
+        """Arm the loop profiler if requested.
+
+        The profiler is armed by the profile flag file, or by pressing A and B
+        together on the driver controller.
+
+        Args:
+            check_buttons: True if the button states are being stored in this
+                mode, so the button combination can be checked.
+
+        """
+        if self._loop_profiler.check_flag_file():
+            self._logger.info("Profiling loop from flag file")
+        if not check_buttons or not self._user_interface:
+            return
+        driver = userinterface.UserControllers.DRIVER
+        if (self._user_interface.get_button_state(driver,
+                                    userinterface.JoystickButtons.A) == 1 and
+            self._user_interface.get_button_state(driver,
+                                    userinterface.JoystickButtons.B) == 1 and
+            (self._user_interface.button_pressed(driver,
+                                    userinterface.JoystickButtons.A) or
+             self._user_interface.button_pressed(driver,
+                                    userinterface.JoystickButtons.B))):
+            if self._loop_profiler.arm():
+                self._logger.info("Profiling loop from button request")
+                self._user_interface.output_user_message("Profiling...", True)
+
+    def _end_profiled_iteration(self, mode):
+        """Finish profiling a loop iteration, saving the results if done."""
+        if not self._loop_profiler.armed:
+            return
+        try:
+            filename = self._loop_profiler.end(mode)
+        except IOError as excep:
+            self._logger.warn("Unable to save profile: " + str(excep))
+            return
+        if filename:
+            self._logger.info("Profile saved to " + filename)
+
+    def _wait_for_next_loop(self, mode):
+        """Wait for the next loop, reporting an iteration that blocked.
+
+        An iteration blocked if its body took longer than a whole loop
+        period, which means something in it waited instead of yielding.
+
+        Args:
+            mode: the name of the current mode, used in the report.
+
+        """
+        if not self._loop_timer.wait() and self._loop_timer.blocked_last:
+            self._logger.warn("%s loop blocked for %.1f ms" %
+                              (mode, self._loop_timer.body_time * 1000))
+
+    def _log_loop_timing(self, mode):
+        """Log how well a mode kept to the loop period."""
+        self._logger.info(mode + " loop timing: " +
+                          self._loop_timer.get_summary())
 
     def _set_robot_state(self, state):
         """Notify objects of the current mode."""
+        self._robot_state = state
         if self._drive_train:
             self._drive_train.set_robot_state(state)
         if self._feeder:
@@ -634,11 +831,11 @@ class MyRobot(wpilib.SimpleRobot):
                     userinterface.UserControllers.SCORING,
                     userinterface.JoystickButtons.RIGHTTRIGGER)):
             # If the trigger is just now held down, start counting the duration
-            if (self._user_interface.get_button_state(
+            if self._user_interface.button_pressed(
                         userinterface.UserControllers.SCORING,
-                        userinterface.JoystickButtons.RIGHTTRIGGER) == 1):
+                        userinterface.JoystickButtons.RIGHTTRIGGER):
                 self._timer.start()
-                self._hold_to_shoot_step = 1
+                self._scheduler.cancel('hold_to_shoot')
             # If the trigger has been let go, calcluate shot power and shoot
             else:
                 # Calculate how long the trigger was held and convert to a %
@@ -652,34 +849,29 @@ class MyRobot(wpilib.SimpleRobot):
                                              + self._min_hold_to_shoot_power)
                 if self._hold_to_shoot_power > 100.0:
                     self._hold_to_shoot_power = 100.0
-                self._shooter.reset_and_start_timer()
-                self._hold_to_shoot_step = 2
+                self._scheduler.start('hold_to_shoot',
+                                      self._hold_to_shoot(
+                                                self._hold_to_shoot_power),
+                                      ('shooter',))
         # Press Y on scoring to prepare to pick up a ball
-        if (self._user_interface.get_button_state(
-                        userinterface.UserControllers.SCORING,
-                        userinterface.JoystickButtons.Y) == 1 and
-            self._user_interface.button_state_changed(
+        if self._user_interface.button_pressed(
                         userinterface.UserControllers.SCORING,
-                        userinterface.JoystickButtons.Y)):
-            self._prep_for_feed_step = 1
+                        userinterface.JoystickButtons.Y):
+            self._scheduler.start('prep_for_feed', self._prep_for_feed(),
+                                  ('feeder', 'shooter'))
         # Press Y on driver to auto-aim
-        if (self._user_interface.get_button_state(
+        if self._user_interface.button_pressed(
                         userinterface.UserControllers.DRIVER,
-                        userinterface.JoystickButtons.Y) == 1 and
-            self._user_interface.button_state_changed(
-                        userinterface.UserControllers.DRIVER,
-                        userinterface.JoystickButtons.Y)):
+                        userinterface.JoystickButtons.Y):
             self._drive_train.reset_sensors()
-            self._aim_at_target_step = 1
-            self._aim_at_target_target = None
+            self._scheduler.start('aim', self.aim_at_nearest(),
+                                  ('drive_train',))
         # Press left bumper to pass over the truss
-        if (self._user_interface.get_button_state(
-                        userinterface.UserControllers.SCORING,
-                        userinterface.JoystickButtons.LEFTBUMPER) == 1 and
-            self._user_interface.button_state_changed(
+        if self._user_interface.button_pressed(
                         userinterface.UserControllers.SCORING,
-                        userinterface.JoystickButtons.LEFTBUMPER)):
-            self._truss_pass_step = 1
+                        userinterface.JoystickButtons.LEFTBUMPER):
+            self._scheduler.start('truss_pass', self._truss_pass(),
+                                  ('shooter',))
 
     def shooter_setup(self):
         """Get the shooter into a workable state.
@@ -689,36 +881,30 @@ class MyRobot(wpilib.SimpleRobot):
         boundaries and move the arm down for enough time to ensure the arm is
         all the way down.  Then we reset the encoder to 0.
 
-        Returns:
-            True when setup is complete.
+        This is a routine: it yields once per loop until setup is complete.
 
         """
-        if self._shooter:
-            # This requires the air tank to be pre-charged before a match
-            # TODO: move time and speed to parameters file in step 3
-            if self._shooter_setup_step == 1:
-                if self._feeder:
-                    self._current_feeder_position = common.Direction.DOWN
-                    self._feeder.set_feeder_position(
-                                            self._current_feeder_position)
-                    wpilib.Wait(0.5)
-                self._shooter_setup_step = 2
-            elif self._shooter_setup_step == 2:
-                self._shooter.ignore_encoder_limits(True)
-                self._shooter.reset_and_start_timer()
-                self._shooter_setup_step = 3
-            elif self._shooter_setup_step == 3:
-                if self._shooter.shoot_time(2.2, common.Direction.DOWN, 0.4):
-                    self._shooter_setup_step = 4
-            elif self._shooter_setup_step == 4:
-                self._shooter.reset_sensors()
-                self._shooter.ignore_encoder_limits(False)
-                self._shooter_setup_step = -1
-                return True
-        else:
-            return True
-
-        return False
+        if not self._shooter:
+            return
+        # This requires the air tank to be pre-charged before a match
+        # TODO: move time and speed to parameters file
+        if self._feeder:
+            self._current_feeder_position = common.Direction.DOWN
+            self._feeder.set_feeder_position(self._current_feeder_position)
+            # Give the feeder arms time to move out of the way
+            feeder_wait = stopwatch.TimedAction()
+            feeder_wait.start(0.5)
+            while feeder_wait.is_running():
+                yield
+        yield
+        self._shooter.ignore_encoder_limits(True)
+        self._shooter.reset_and_start_timer()
+        yield
+        while not self._shooter.shoot_time(2.2, common.Direction.DOWN, 0.4):
+            yield
+        yield
+        self._shooter.reset_sensors()
+        self._shooter.ignore_encoder_limits(False)
 
     def aim_at_target(self, side=None, desired_target=None):
         """Turn and drive until we are aiming at a target.
@@ -728,35 +914,41 @@ class MyRobot(wpilib.SimpleRobot):
         called with either a particular target in mind or a
         side of the playing field/target wall.
 
+        This is a routine: it yields once per loop until complete.
+
         Args:
             side: the side to aim at.
             desired_target: The target.Target to aim at.
 
-        Returns:
-            True when complete.
+        """
+        def choose_target():
+            current_target = desired_target
+            if side is not None:
+                current_target = self._targets.get_best(side) or current_target
+            return current_target
+
+        for tick in self._aim(choose_target):
+            yield
+
+    def _aim(self, choose_target):
+        """Drive and turn to aim at the target chosen each loop.
+
+        Args:
+            choose_target: a function that returns the target.Target to aim
+                at (or None to give up).
 
         """
-        # This is setup for using aim_at_target in autonomous mode
-        # This is required because we can't set the aim_at_target_step variable
-        # since we now use reflection/introspection.
-        if self._aim_at_target_step == -2:
-            self._aim_at_target_step = 1
-            return False
-
-        # Figure out which target to aim at
-        current_target = desired_target
-        if side:
-            for trg in self._current_targets:
-                if trg.side == side:
-                    current_target = trg
-
-        # Bail if we don't have a target
-        if not current_target:
-            self._aim_at_target_step = -1
-            return True
+        if self._aim_combined:
+            for tick in self._aim_combined_drive(choose_target):
+                yield
+            return
 
         # Step 1 is to drive until we're at the optimum distance to shoot
-        if self._aim_at_target_step == 1:
+        while True:
+            current_target = choose_target()
+            # Bail if we don't have a target
+            if not current_target:
+                return
             # Use camera target distance instead of range finder
             distance_left = (current_target.distance -
                              self._optimum_shooting_range)
@@ -765,38 +957,113 @@ class MyRobot(wpilib.SimpleRobot):
             if math.fabs(distance_left) < 0.5:
                 self._drive_train.arcade_drive(0.0, 0.0, False)
                 self._drive_train.reset_and_start_timer()
-                self._aim_at_target_step = 2
-            else:
-                # TODO: add variable speed based on distance to target
-                direction = -1.0 if distance_left > 0 else 1.0
-                directional_speed = direction * 0.3
-                self._drive_train.arcade_drive(directional_speed, 0.0, False)
+                break
+            # TODO: add variable speed based on distance to target
+            direction = -1.0 if distance_left > 0 else 1.0
+            directional_speed = direction * 0.3
+            self._drive_train.arcade_drive(directional_speed, 0.0, False)
+            yield
+        yield
+
         # Step 2 is to drive backwards briefly to stop the robot
-        elif self._aim_at_target_step == 2:
+        while True:
+            if not choose_target():
+                return
             # TODO: this should not be hard-coded to backwards
             if self._drive_train.drive_time(0.1, common.Direction.BACKWARD,
                                             0.5):
                 self._drive_train.reset_sensors()
-                self._aim_at_target_step = 3
+                break
+            yield
+        yield
+
         # Step 3 is to turn to face the target
-        elif self._aim_at_target_step == 3:
-            # Include an offset. This is required since the image targets aren't
-            # exactly where we want to aim (they're to the outside of the goals)
+        while True:
+            current_target = choose_target()
+            if not current_target:
+                return
             # TODO: this was turning oddly: sometimes it would work, sometimes
             # it would turn way too far
-            adjustment = current_target.angle
-            if current_target.side == target.Side.LEFT:
-                adjustment += self._shooting_angle_offset
-            elif current_target.side == target.Side.RIGHT:
-                adjustment -= self._shooting_angle_offset
-            else:
-                self._aim_at_target_step = -1
-                return True
+            adjustment = self._get_aim_adjustment(current_target)
+            if adjustment is None:
+                return
             if self._drive_train.adjust_heading(adjustment, 0.3):
-                self._aim_at_target_step = -1
-                return True
+                return
+            yield
 
-        return False
+    def _aim_combined_drive(self, choose_target):
+        """Drive and turn at the same time to aim at the target.
+
+        The target's angle and distance only change when a new camera frame
+        arrives, so each new frame sets a heading and a distance to reach.
+        Between frames the robot closes on them with the gyro and the
+        odometry, and it stops once both are within their tolerances.
+
+        Args:
+            choose_target: a function that returns the target.Target to aim
+                at (or None to give up).
+
+        """
+        self._aim_distance_pid.reset()
+        self._aim_heading_pid.reset()
+        last_target = None
+        heading_setpoint = 0.0
+        distance_setpoint = 0.0
+        while True:
+            current_target = choose_target()
+            if not current_target:
+                self._drive_train.directional_drive(0.0, 0.0)
+                return
+
+            # A new frame gives a new target object
+            if current_target is not last_target:
+                adjustment = self._get_aim_adjustment(current_target)
+                if adjustment is None:
+                    self._drive_train.directional_drive(0.0, 0.0)
+                    return
+                last_target = current_target
+                heading_setpoint = self._drive_train.get_heading() + adjustment
+                distance_setpoint = (self._drive_train.get_distance_traveled()
+                                     + current_target.distance -
+                                     self._optimum_shooting_range)
+            heading_left = heading_setpoint - self._drive_train.get_heading()
+            distance_left = (distance_setpoint -
+                             self._drive_train.get_distance_traveled())
+
+            # Only correct the errors that are outside their tolerance
+            linear = 0.0
+            turn = 0.0
+            if math.fabs(distance_left) >= self._aim_distance_tolerance:
+                linear = self._aim_distance_pid.update(distance_left,
+                                                    self._aim_max_linear_speed)
+            if math.fabs(heading_left) >= self._aim_heading_tolerance:
+                turn = self._aim_heading_pid.update(heading_left,
+                                                    self._aim_max_turn_speed)
+            self._drive_train.directional_drive(linear, turn)
+            if linear == 0.0 and turn == 0.0:
+                return
+            yield
+
+    def _get_aim_adjustment(self, current_target):
+        """Get the angle to turn to aim at a target.
+
+        Args:
+            current_target: the target.Target to aim at.
+
+        Returns:
+            The angle in degrees, or None if the target's side is unknown.
+
+        """
+        # Include an offset. This is required since the image targets aren't
+        # exactly where we want to aim (they're to the outside of the goals)
+        adjustment = current_target.angle
+        if current_target.side == target.Side.LEFT:
+            adjustment += self._shooting_angle_offset
+        elif current_target.side == target.Side.RIGHT:
+            adjustment -= self._shooting_angle_offset
+        else:
+            return None
+        return adjustment
 
     def wait_for_hot_goal_with_time(self, side=None, desired_target=None,
                                     timeout=5.0):
@@ -814,11 +1081,9 @@ class MyRobot(wpilib.SimpleRobot):
 
         """
         # Figure out which target to check, and then check if it's 'hot'
-        if side:
-            for trg in self._current_targets:
-                if ((trg.side == side or side == target.Side.EITHER) and
-                    trg.is_hot):
-                    return True
+        if side is not None:
+            if self._targets.is_hot(side):
+                return True
         elif desired_target:
             if desired_target.is_hot:
                 return True
@@ -833,85 +1098,72 @@ class MyRobot(wpilib.SimpleRobot):
 
         return False
 
-    def _perform_tele_auto(self):
-        """Perform teleop autonomous actions."""
-        # Hold to shoot
-        # Print the shot power to the screen, then briefly move the shooter
-        # down before shooting. The students said they got better performance
-        # doing this..?
-        if self._hold_to_shoot_step == 2:
-            self._disable_range_print = True
-            self._range_print_timer.start()
-            self._user_interface.output_user_message('Power: %(pwr)3.0f' %
-                                             {'pwr':self._hold_to_shoot_power},
-                                             True)
-            if self._shooter:
-                if self._shooter.shoot_time(0.1, common.Direction.DOWN, 1.0):
-                    self._hold_to_shoot_step = 3
+    def _hold_to_shoot(self, power):
+        """Routine that shoots with the power chosen by holding the trigger.
+
+        Print the shot power to the screen, then briefly move the shooter
+        down before shooting. The students said they got better performance
+        doing this..?
+
+        Args:
+            power: the shot power as a percent.
+
+        """
+        self._user_interface.output_user_message('Power: %(pwr)3.0f' %
+                                                 {'pwr':power}, True)
+        self._shooter.reset_and_start_timer()
+        while not self._shooter.shoot_time(0.1, common.Direction.DOWN, 1.0):
+            yield
+        yield
         # Actually shoot the ball
-        elif self._hold_to_shoot_step == 3:
-            if self._shooter:
-                if self._shooter.auto_fire(self._hold_to_shoot_power):
-                    self._hold_to_shoot_step = -1
-
-        # Prep for feed
-        if self._prep_for_feed_step != -1:
-            # Step 1 is to make sure the feeder arms are down
-            if self._prep_for_feed_step == 1:
-                if self._feeder:
-                    self._current_feeder_position = common.Direction.DOWN
-                    self._feeder.set_feeder_position(
-                                                self._current_feeder_position)
-                self._prep_for_feed_step = 2
-            # Step 2 is to move the catapult arm all the way down
-            elif self._prep_for_feed_step == 2:
-                if self._shooter:
-                    if self._shooter.set_shooter_position(
+        while not self._shooter.auto_fire(power):
+            yield
+
+    def _prep_for_feed(self):
+        """Routine that prepares to pick up a ball."""
+        # Step 1 is to make sure the feeder arms are down
+        if self._feeder:
+            self._current_feeder_position = common.Direction.DOWN
+            self._feeder.set_feeder_position(self._current_feeder_position)
+        yield
+        # Step 2 is to move the catapult arm all the way down
+        while not self._shooter.set_shooter_position(
                                                 self._catapult_feed_position,
                                                 1.0):
-                        self._prep_for_feed_step = -1
+            yield
 
-        # Truss pass
-        if self._truss_pass_step != -1:
-            if self._shooter:
-                # This does a partial shot, moving the shooter at full speed,
-                # but stopping before reaching the full range of motion
-                if self._shooter.set_shooter_position(self._truss_pass_position,
-                                                      1.0):
-                    self._truss_pass_step = -1
-
-        # Aim at target
-        if self._aim_at_target_step > 0:
-            self.aim_at_nearest()
-
-    def _sort_targets(self):
-        """Sort the targets based on which we're most closely facing."""
-        if len(self._current_targets) > 1:
-            # Sort targets based on which one we're most closely facing
-            self._current_targets = sorted(self._current_targets,
-                                           key=lambda x: math.fabs(x.angle),
-                                           reverse=False)
+    def _truss_pass(self):
+        """Routine that passes the ball over the truss.
+
+        This does a partial shot, moving the shooter at full speed, but
+        stopping before reaching the full range of motion.
+
+        """
+        while not self._shooter.set_shooter_position(self._truss_pass_position,
+                                                     1.0):
+            yield
 
     def aim_at_nearest(self):
-        """Turn and drive until we are aiming at the nearest target."""
-        if len(self._current_targets) > 0:
-            self._sort_targets()
-            self._aim_at_target_target = self._current_targets[0]
+        """Turn and drive until we are aiming at the nearest target.
+
+        This is a routine: it yields once per loop until complete.
+
+        """
+        self._aim_at_target_target = None
+
+        def choose_target():
+            if self._targets.nearest:
+                self._aim_at_target_target = self._targets.nearest
+            return self._aim_at_target_target
 
-        # Aim at the nearest target
-        return self.aim_at_target(desired_target=self._aim_at_target_target)
+        for tick in self._aim(choose_target):
+            yield
 
     def _check_debug_request(self):
         """Print debug info to driver station."""
-        if (self._user_interface.get_button_state(
-                        userinterface.UserControllers.DRIVER,
-                        userinterface.JoystickButtons.BACK) == 1 and
-            self._user_interface.button_state_changed(
+        if self._user_interface.button_pressed(
                         userinterface.UserControllers.DRIVER,
-                        userinterface.JoystickButtons.BACK)):
-            # Disable the range to object prints briefly
-            self._disable_range_print = True
-            self._range_print_timer.start()
+                        userinterface.JoystickButtons.BACK):
             if self._drive_train:
                 self._drive_train.log_current_state()
                 state = self._drive_train.get_current_state()
@@ -922,25 +1174,55 @@ class MyRobot(wpilib.SimpleRobot):
                 self._user_interface.output_user_message(state, False)
             self._print_targets(False)
 
-    def _print_range(self, clear=True):
-        """Print the range to the nearest object."""
-        # Only print the range if nothing else important is being shown
-        if not self._disable_range_print:
-            if self._drive_train:
-                rng = self._drive_train.get_range()
-                self._user_interface.output_user_message('Range: %(rng)4.1f' %
-                                                         {'rng':rng},
-                                                         clear)
+    def _check_timing_request(self):
+        """Show the loop timing summary and save the full timing data."""
+        if self._user_interface.button_pressed(
+                        userinterface.UserControllers.DRIVER,
+                        userinterface.JoystickButtons.X):
+            clear = True
+            for line in self._phase_timer.get_summary_lines():
+                self._user_interface.output_user_message(line, clear)
+                clear = False
+            filename = time.strftime("/py/looptiming_%Y%m%d_%H%M%S.txt")
+            try:
+                self._phase_timer.dump(filename)
+                self._logger.info("Loop timing saved to " + filename)
+            except IOError as excep:
+                self._logger.warn("Unable to save loop timing: " + str(excep))
+
+    def _print_range(self):
+        """Print the range to the nearest object.
+
+        The range is status text on the top line, so messages are shown over
+        it.  It's only formatted when the displayed value changes.
+
+        """
+        if self._drive_train and self._user_interface:
+            rng = round(self._drive_train.get_range(), 1)
+            if rng != self._displayed_range:
+                self._displayed_range = rng
+                self._user_interface.output_status(0, 'Range: %(rng)4.1f' %
+                                                   {'rng':rng})
+
+    def _print_autoscript(self):
+        """Print the name of the selected autoscript.
+
+        The name is status text on the second line, under the range, so it
+        stays up for all of Disabled instead of expiring like a message.
+
+        """
+        if self._user_interface and self._autoscript_filename:
+            self._user_interface.output_status(1, self._autoscript_filename)
 
     def _print_targets(self, clear=False):
         """Print information about vision targets found."""
-        if len(self._current_targets) > 0:
+        if self._targets:
             cleared = False
             clear_next = False
             if clear and not cleared:
                 clear_next = True
                 cleared = True
-            for trg in self._current_targets:
+            for trg in self._targets.targets:
                 message = "Dis: %(dis)4.1f Ang: %(ang)4.1f" % {
                                                       'dis':trg.distance,
                                                       'ang':trg.angle}
@@ -950,26 +1232,12 @@ class MyRobot(wpilib.SimpleRobot):
                                                     'side':trg.side}
                 self._user_interface.output_user_message(message, False)
 
-    def _check_ui_print_timeout(self):
-        """Show any non-range message on the screen for 2 seconds."""
-        # If we're currently suppressing the range prints, check if the timeout
-        # is over
-        if self._disable_range_print:
-            elapsed_time = self._range_print_timer.elapsed_time_in_secs()
-            # TODO: this should be a parameter
-            if elapsed_time > 3.0:
-                self._range_print_timer.stop()
-                self._disable_range_print = False
-
     def _check_tele_auto_kill(self):
         """Check kill switch for all tele-auto functionality."""
         if (self._user_interface.get_button_state(
                         userinterface.UserControllers.SCORING,
                         userinterface.JoystickButtons.BACK) == 1):
-            self._hold_to_shoot_step = -1
-            self._prep_for_feed_step = -1
-            self._truss_pass_step = -1
-            self._aim_at_target_step = -1
+            self._scheduler.cancel_all()
 
     def _check_alternate_speed_modes(self):
         """Check for alternate speed mode."""
@@ -991,18 +1259,13 @@ class MyRobot(wpilib.SimpleRobot):
 
     def _check_swap_drivetrain_request(self):
         """Check if the driver wants to swap forward and reverse."""
-        if (self._user_interface.get_button_state(
+        if self._user_interface.button_pressed(
                         userinterface.UserControllers.DRIVER,
-                        userinterface.JoystickButtons.RIGHTTRIGGER) == 1 and
-            self._user_interface.button_state_changed(
-                        userinterface.UserControllers.DRIVER,
-                        userinterface.JoystickButtons.RIGHTTRIGGER)):
+                        userinterface.JoystickButtons.RIGHTTRIGGER):
             # Swap the driver controls to be the opposite of what they were
             self._driver_controls_swap_ratio = (self._driver_controls_swap_ratio
                                                 * -1.0)
             # Print the notification for several seconds
-            self._disable_range_print = True
-            self._range_print_timer.start()
             if self._driver_controls_swap_ratio > 0:
                 self._user_interface.output_user_message(("Controls "
                                                           "normal"),
@@ -1024,13 +1287,13 @@ class MyRobot(wpilib.SimpleRobot):
             # Abort any relevent teleop auto routines
             if self._drive_train:
                 driver_left_y = driver_left_y * self._driver_controls_swap_ratio
+                self._scheduler.cancel_requiring('drive_train')
                 self._drive_train.arcade_drive(driver_left_y, driver_right_x,
                                                False)
-                self._aim_at_target_step = -1
         else:
             # Make sure we don't mess with any teleop auto routines
             # if they're running
-            if self._aim_at_target_step < 0:
+            if self._scheduler.get_owner('drive_train') is None:
                 self._drive_train.arcade_drive(0.0, 0.0, False)
 
     def _control_shooter(self):
@@ -1040,17 +1303,13 @@ class MyRobot(wpilib.SimpleRobot):
                 userinterface.JoystickAxis.LEFTY)
         if scoring_left_y != 0.0:
             if self._shooter:
-                self._shooter.move_shooter(scoring_left_y)
                 # Abort any relevent teleop auto routines
-                self._hold_to_shoot_step = -1
-                self._prep_for_feed_step = -1
-                self._truss_pass_step = -1
+                self._scheduler.cancel_requiring('shooter')
+                self._shooter.move_shooter(scoring_left_y)
         else:
             # Make sure we don't mess with any teleop auto routines
             # if they're running
-            if (self._hold_to_shoot_step == -1 and
-                self._prep_for_feed_step == -1 and
-                self._truss_pass_step == -1):
+            if self._scheduler.get_owner('shooter') is None:
                 self._shooter.move_shooter(0.0)
 
     def _control_feeder(self):
@@ -1060,19 +1319,16 @@ class MyRobot(wpilib.SimpleRobot):
                 userinterface.JoystickAxis.RIGHTY)
 
         # Toggle feeder arms
-        if (self._user_interface.get_button_state(
-                        userinterface.UserControllers.SCORING,
-                        userinterface.JoystickButtons.RIGHTBUMPER) == 1
-            and self._user_interface.button_state_changed(
+        if self._user_interface.button_pressed(
                         userinterface.UserControllers.SCORING,
-                        userinterface.JoystickButtons.RIGHTBUMPER)):
+                        userinterface.JoystickButtons.RIGHTBUMPER):
             if self._current_feeder_position == common.Direction.UP:
                 self._current_feeder_position = common.Direction.DOWN
             else:
                 self._current_feeder_position = common.Direction.UP
             self._feeder.set_feeder_position(self._current_feeder_position)
             # Abort any relevent teleop auto routines
-            self._prep_for_feed_step = -1
+            self._scheduler.cancel_requiring('feeder')
 
         # Manually control feeder motors
         if scoring_right_y != 0.0:
@@ -0,0 +1,286 @@
+"""This module provides a background sampler for robot sensors.
+
+The control loop only reads its sensors once per iteration, so a sensor can't
+be read faster than the loop runs, and isn't read at all while the loop is
+busy.  The SensorSampler thread reads registered sensors at its own rate into
+fixed-size, timestamped ring buffers, and the control loop reads the latest
+value or a window of recent values from the buffers.
+
+"""
+
+# Imports
+import threading
+import time
+
+
+class RingBuffer(object):
+    """A fixed-size buffer of timestamped values.
+
+    The storage is allocated once, and the oldest value is overwritten when
+    the buffer is full.  One thread may append while others read.
+
+    Attributes:
+        size: the number of values the buffer holds.
+        count: the number of values appended since the buffer was cleared.
+
+    """
+    # Public member variables
+    size = None
+    count = 0
+
+    # Private member variables
+    _times = None
+    _values = None
+    _next_index = 0
+    _lock = None
+
+    def __init__(self, size):
+        """Create a RingBuffer.
+
+        Args:
+            size: the number of values to hold.
+
+        """
+        self.size = size
+        self.count = 0
+        self._times = [0.0] * size
+        self._values = [0.0] * size
+        self._next_index = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return min(self.count, self.size)
+
+    def append(self, timestamp, value):
+        """Add a value, overwriting the oldest if the buffer is full.
+
+        Args:
+            timestamp: the time the value was read in seconds.
+            value: the value.
+
+        """
+        with self._lock:
+            self._times[self._next_index] = timestamp
+            self._values[self._next_index] = value
+            self._next_index = (self._next_index + 1) % self.size
+            self.count += 1
+
+    def clear(self):
+        """Forget every value."""
+        with self._lock:
+            self._next_index = 0
+            self.count = 0
+
+    def get_latest(self):
+        """Get the newest value.
+
+        Returns:
+            A (timestamp, value) tuple, or None if the buffer is empty.
+
+        """
+        with self._lock:
+            if not self.count:
+                return None
+            index = (self._next_index - 1) % self.size
+            return (self._times[index], self._values[index])
+
+    def get_window(self, start_time, end_time=None):
+        """Get the values read during a time window, oldest first.
+
+        Args:
+            start_time: the earliest time to include.
+            end_time: the latest time to include (defaults to the newest).
+
+        Returns:
+            A List of (timestamp, value) tuples.
+
+        """
+        with self._lock:
+            length = min(self.count, self.size)
+            window = []
+            # Walk backward from the newest value until the window starts
+            index = self._next_index
+            for i in range(length):
+                index = (index - 1) % self.size
+                timestamp = self._times[index]
+                if timestamp < start_time:
+                    break
+                if end_time is None or timestamp <= end_time:
+                    window.append((timestamp, self._values[index]))
+        window.reverse()
+        return window
+
+
+class SensorSampler(threading.Thread):
+    """Reads sensors at a fixed rate into ring buffers.
+
+    Sensors are registered with add_sensor() before the thread is started.
+    A sensor that raises an exception is counted as an error and skipped for
+    that sample.
+
+    Attributes:
+        period: the time between samples in seconds.
+        samples: the number of times the sensors have been sampled.
+        errors: the number of sensor reads that raised an exception.
+        overruns: the number of samples that started late.
+
+    """
+    # Public member variables
+    period = None
+    samples = 0
+    errors = 0
+    overruns = 0
+
+    # Private member variables
+    _buffer_size = None
+    _clock = None
+    _sensors = None
+    _buffers = None
+    _stop_event = None
+
+    def __init__(self, period=0.002, buffer_size=500, clock=time.time):
+        """Create a SensorSampler.
+
+        Args:
+            period: the time between samples in seconds.
+            buffer_size: the default number of samples each buffer holds.
+            clock: the function that returns the current time in seconds.
+
+        """
+        threading.Thread.__init__(self)
+        self.daemon = True
+        self.period = period
+        self.samples = 0
+        self.errors = 0
+        self.overruns = 0
+        self._buffer_size = buffer_size
+        self._clock = clock
+        self._sensors = []
+        self._buffers = {}
+        self._stop_event = threading.Event()
+
+    def add_sensor(self, name, read, size=None):
+        """Register a sensor to sample.
+
+        Args:
+            name: the name of the sensor.
+            read: the function that returns the sensor's value.
+            size: the number of samples to keep (defaults to the sampler's
+                buffer size).
+
+        Returns:
+            The RingBuffer the samples are stored in.
+
+        """
+        buf = RingBuffer(size if size else self._buffer_size)
+        self._buffers[name] = buf
+        # Replace the list so a running sample() never sees it change
+        self._sensors = self._sensors + [(read, buf)]
+        return buf
+
+    def get_buffer(self, name):
+        """Return the RingBuffer for a sensor, or None if not registered."""
+        return self._buffers.get(name)
+
+    def get_latest(self, name):
+        """Get the newest value of a sensor.
+
+        Returns:
+            The value, or None if the sensor has no samples.
+
+        """
+        buf = self._buffers.get(name)
+        latest = buf.get_latest() if buf else None
+        if latest is None:
+            return None
+        return latest[1]
+
+    def get_window(self, name, duration):
+        """Get the samples of a sensor from the last duration seconds.
+
+        Returns:
+            A List of (timestamp, value) tuples, oldest first.
+
+        """
+        buf = self._buffers.get(name)
+        if not buf:
+            return []
+        return buf.get_window(self._clock() - duration)
+
+    def sample(self):
+        """Read every sensor once."""
+        now = self._clock()
+        for read, buf in self._sensors:
+            try:
+                buf.append(now, read())
+            except Exception:
+                self.errors += 1
+        self.samples += 1
+
+    def run(self):
+        """Sample the sensors every period until stopped."""
+        deadline = self._clock()
+        while not self._stop_event.is_set():
+            self.sample()
+            deadline += self.period
+            delay = deadline - self._clock()
+            if delay > 0:
+                self._stop_event.wait(delay)
+            else:
+                # Don't try to catch up on missed samples
+                self.overruns += 1
+                deadline = self._clock()
+
+    def stop(self):
+        """Stop sampling."""
+        self._stop_event.set()
+
+
+def fit_motion(samples):
+    """Estimate the velocity and acceleration from timestamped positions.
+
+    A parabola is fit through the samples by least squares, which smooths out
+    the noise that differencing neighbouring samples would amplify.  With
+    only two samples the velocity is their slope and the acceleration is 0.
+
+    Args:
+        samples: a List of (timestamp, position) tuples, oldest first.
+
+    Returns:
+        A (velocity, acceleration) tuple at the time of the newest sample.
+
+    """
+    if len(samples) < 2:
+        return (0.0, 0.0)
+    # Measure time back from the newest sample, so the fit's linear term is
+    # the velocity at that time
+    newest = samples[-1][0]
+    n = float(len(samples))
+    st = st2 = st3 = st4 = sp = stp = st2p = 0.0
+    for timestamp, position in samples:
+        t = timestamp - newest
+        t2 = t * t
+        st += t
+        st2 += t2
+        st3 += t2 * t
+        st4 += t2 * t2
+        sp += position
+        stp += t * position
+        st2p += t2 * position
+
+    if len(samples) > 2:
+        # Solve the normal equations for p = a + b*t + c*t^2 by Cramer's rule
+        det = (n * (st2 * st4 - st3 * st3) - st * (st * st4 - st3 * st2) +
+               st2 * (st * st3 - st2 * st2))
+        if det != 0:
+            b = (n * (stp * st4 - st3 * st2p) - sp * (st * st4 - st3 * st2) +
+                 st2 * (st * st2p - stp * st2)) / det
+            c = (n * (st2 * st2p - stp * st3) - st * (st * st2p - stp * st2) +
+                 sp * (st * st3 - st2 * st2)) / det
+            return (b, 2 * c)
+
+    # Fall back to a straight line
+    det = n * st2 - st * st
+    if det == 0:
+        return (0.0, 0.0)
+    return ((n * stp - st * sp) / det, 0.0)
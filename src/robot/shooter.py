@@ -9,9 +9,16 @@ except ImportError:
     from pyfrc import wpilib
 import common
 import datalog
+import limitguard
 import math
+import motionprofile
+import motorgroup
 import parameters
+import pid
+import sensorsampler
+import shotcalibration
 import stopwatch
+import time
 
 
 class Shooter(object):
@@ -35,9 +42,18 @@ class Shooter(object):
     _encoder = None
     _left_shooter_controller = None
     _right_shooter_controller = None
+    _shooter_motors = None
+    _position_pid = None
+    _profile_pid = None
+    _profile_timer = None
+    _fire_pid = None
+    _encoder_history = None
+    _shot_calibration = None
+    _limit_guard = None
     _log = None
     _parameters = None
     _timer = None
+    _sampler = None
 
     # Private parameters
     _encoder_threshold = None
@@ -59,15 +75,35 @@ class Shooter(object):
     _normal_down_speed_ratio = None
     _alternate_up_speed_ratio = None
     _alternate_down_speed_ratio = None
+    _motor_refresh_period = None
+    _pid_control_enabled = None
+    _position_pid_p = None
+    _position_pid_i = None
+    _position_pid_d = None
+    _position_pid_feed_forward = None
+    _position_pid_integral_limit = None
+    _profile_max_velocity = None
+    _profile_max_acceleration = None
+    _profile_velocity_gain = None
+    _profile_settle_time = None
+    _encoder_history_size = None
+    _velocity_window = None
+    _fire_velocity_gain = None
+    _fire_velocity_p = None
+    _shot_calibration_file = None
+    _limit_guard_period = None
 
     # Private member variables
     _encoder_count = None
     _log_enabled = None
     _parameters_file = None
     _ignore_encoder_limits = None
-    _left_shooter_controller_enabled = False
-    _right_shooter_controller_enabled = False
     _robot_state = None
+    _profile = None
+    _profile_start = None
+    _encoder_velocity = None
+    _encoder_acceleration = None
+    _last_shot_velocity = None
 
     def __init__(self, params="shooter.par", logging_enabled=False):
         """Create and initialize shooter.
@@ -96,7 +132,18 @@ class Shooter(object):
         self._encoder = None
         self._left_shooter_controller = None
         self._right_shooter_controller = None
+        self._shooter_motors = None
+        self._position_pid = None
+        self._profile_pid = None
+        self._profile_timer = None
+        self._fire_pid = None
+        self._encoder_history = None
+        self._shot_calibration = None
+        if self._limit_guard:
+            self._limit_guard.stop()
+        self._limit_guard = None
         self._timer = None
+        self._sampler = None
 
     def _initialize(self, params, logging_enabled):
         """Initialize and configure a Shooter object.
@@ -118,9 +165,18 @@ class Shooter(object):
         self._encoder = None
         self._left_shooter_controller = None
         self._right_shooter_controller = None
+        self._shooter_motors = None
+        self._position_pid = None
+        self._profile_pid = None
+        self._profile_timer = None
+        self._fire_pid = None
+        self._encoder_history = None
+        self._shot_calibration = None
+        self._limit_guard = None
         self._log = None
         self._parameters = None
         self._timer = None
+        self._sampler = None
 
         # Initialize private parameters
         self._encoder_threshold = 10
@@ -142,14 +198,34 @@ class Shooter(object):
         self._normal_down_speed_ratio = 0.3
         self._alternate_up_speed_ratio = 1.0
         self._alternate_down_speed_ratio = 0.5
+        self._motor_refresh_period = 0.1
+        self._pid_control_enabled = False
+        self._position_pid_p = 0.0
+        self._position_pid_i = 0.0
+        self._position_pid_d = 0.0
+        self._position_pid_feed_forward = 0.0
+        self._position_pid_integral_limit = 0.0
+        self._profile_max_velocity = 0.0
+        self._profile_max_acceleration = 0.0
+        self._profile_velocity_gain = 0.0
+        self._profile_settle_time = 0.5
+        self._encoder_history_size = 100
+        self._velocity_window = 0.05
+        self._fire_velocity_gain = 0.0
+        self._fire_velocity_p = 0.0
+        self._shot_calibration_file = None
+        self._limit_guard_period = 0.002
 
         # Initialize private member variables
         self._encoder_count = 0
         self._ignore_encoder_limits = False
         self._log_enabled = False
         self._robot_state = common.ProgramState.DISABLED
-        self._left_shooter_controller_enabled = False
-        self._right_shooter_controller_enabled = False
+        self._profile = None
+        self._profile_start = 0
+        self._encoder_velocity = 0.0
+        self._encoder_acceleration = 0.0
+        self._last_shot_velocity = None
 
         # Enable logging if specified
         if logging_enabled:
@@ -162,6 +238,7 @@ class Shooter(object):
                 self._log = None
 
         self._timer = stopwatch.Stopwatch()
+        self._profile_timer = stopwatch.Stopwatch()
 
         # Read parameters file
         self._parameters_file = params
@@ -207,12 +284,38 @@ class Shooter(object):
         self._normal_down_speed_ratio = 0.3
         self._alternate_up_speed_ratio = 1.0
         self._alternate_down_speed_ratio = 0.5
+        self._motor_refresh_period = 0.1
+        self._pid_control_enabled = False
+        self._position_pid_p = 0.0
+        self._position_pid_i = 0.0
+        self._position_pid_d = 0.0
+        self._position_pid_feed_forward = 0.0
+        self._position_pid_integral_limit = 0.0
+        self._profile_max_velocity = 0.0
+        self._profile_max_acceleration = 0.0
+        self._profile_velocity_gain = 0.0
+        self._profile_settle_time = 0.5
+        self._encoder_history_size = 100
+        self._velocity_window = 0.05
+        self._fire_velocity_gain = 0.0
+        self._fire_velocity_p = 0.0
+        self._shot_calibration_file = None
+        self._limit_guard_period = 0.002
 
         # Close and delete old objects
         self._parameters = None
+        if self._limit_guard:
+            self._limit_guard.stop()
+        self._limit_guard = None
         self._encoder = None
         self._left_shooter_controller = None
         self._right_shooter_controller = None
+        self._shooter_motors = None
+        self._position_pid = None
+        self._profile_pid = None
+        self._fire_pid = None
+        self._encoder_history = None
+        self._shot_calibration = None
 
         # Read the parameters file
         self._parameters = parameters.Parameters(self._parameters_file)
@@ -280,6 +383,44 @@ class Shooter(object):
             self._alternate_down_speed_ratio = self._parameters.get_value(
                                                 section,
                                                 "ALTERNATE_DOWN_SPEED_RATIO")
+            self._motor_refresh_period = self._parameters.get_value(section,
+                                                "MOTOR_REFRESH_PERIOD")
+            self._pid_control_enabled = (self._parameters.get_value(section,
+                                                "PID_CONTROL_ENABLED") > 0)
+            self._position_pid_p = self._parameters.get_value(section,
+                                                "POSITION_PID_P")
+            self._position_pid_i = self._parameters.get_value(section,
+                                                "POSITION_PID_I")
+            self._position_pid_d = self._parameters.get_value(section,
+                                                "POSITION_PID_D")
+            self._position_pid_feed_forward = self._parameters.get_value(
+                                                section,
+                                                "POSITION_PID_FEED_FORWARD")
+            self._position_pid_integral_limit = self._parameters.get_value(
+                                                section,
+                                                "POSITION_PID_INTEGRAL_LIMIT")
+            self._profile_max_velocity = self._parameters.get_value(section,
+                                                "PROFILE_MAX_VELOCITY")
+            self._profile_max_acceleration = self._parameters.get_value(
+                                                section,
+                                                "PROFILE_MAX_ACCELERATION")
+            self._profile_velocity_gain = self._parameters.get_value(section,
+                                                "PROFILE_VELOCITY_GAIN")
+            self._profile_settle_time = self._parameters.get_value(section,
+                                                "PROFILE_SETTLE_TIME")
+            self._encoder_history_size = self._parameters.get_value(section,
+                                                "ENCODER_HISTORY_SIZE")
+            self._velocity_window = self._parameters.get_value(section,
+                                                "VELOCITY_WINDOW")
+            self._fire_velocity_gain = self._parameters.get_value(section,
+                                                "FIRE_VELOCITY_GAIN")
+            self._fire_velocity_p = self._parameters.get_value(section,
+                                                "FIRE_VELOCITY_P")
+            self._shot_calibration_file = str(self._parameters.get_value(
+                                                section,
+                                                "SHOT_CALIBRATION_FILE"))
+            self._limit_guard_period = self._parameters.get_value(section,
+                                                "LIMIT_GUARD_PERIOD")
 
         # Create the encoder object if the channel is greater than 0
         self.encoder_enabled = False
@@ -292,34 +433,70 @@ class Shooter(object):
             if self._encoder:
                 self.encoder_enabled = True
                 self._encoder.Start()
+                self._encoder_history = sensorsampler.RingBuffer(
+                                                self._encoder_history_size)
                 if self._log_enabled:
                     self._log.write_line("Encoder enabled")
 
         # Create the motor controller objects if the channels are greater than 0
-        self._right_shooter_controller_enabled = False
-        self._left_shooter_controller_enabled = False
+        self._shooter_motors = motorgroup.MotorGroup(
+                                                self._motor_refresh_period)
         if right_shooter_channel > 0:
             self._right_shooter_controller = wpilib.Jaguar(
                                                         right_shooter_channel)
         if left_shooter_channel > 0:
             self._left_shooter_controller = wpilib.Jaguar(left_shooter_channel)
-        if self._right_shooter_controller:
-            self._right_shooter_controller_enabled = True
+        if self._shooter_motors.add_motor(self._right_shooter_controller,
+                                          self._invert_right_shooter_motor):
             if self._log_enabled:
                 self._log.write_line("Right shooter motor enabled")
-        if self._left_shooter_controller:
-            self._left_shooter_controller_enabled = True
+        if self._shooter_motors.add_motor(self._left_shooter_controller,
+                                          self._invert_left_shooter_motor):
             if self._log_enabled:
                 self._log.write_line("Left shooter motor enabled")
 
+        # Create the closed loop controller for moving to a position
+        self._position_pid = pid.PIDController(self._position_pid_p,
+                                            self._position_pid_i,
+                                            self._position_pid_d,
+                                            self._position_pid_feed_forward,
+                                            self._position_pid_integral_limit)
+        self._profile_pid = pid.PIDController(self._position_pid_p,
+                                            self._position_pid_i,
+                                            self._position_pid_d,
+                                            self._position_pid_feed_forward,
+                                            self._position_pid_integral_limit)
+
+        # Regulate the arm speed when firing, and look up the speed for a
+        # shot distance
+        self._fire_pid = pid.PIDController(self._fire_velocity_p)
+        self._shot_calibration = shotcalibration.ShotCalibration(
+                                                self._shot_calibration_file)
+        if self._log_enabled:
+            self._log.write_value("Calibrated shots",
+                                  len(self._shot_calibration), True)
+
         # If at least one motor is working, the shooter is enabled
         self.shooter_enabled = False
-        if (self._left_shooter_controller_enabled or
-            self._right_shooter_controller_enabled):
+        if self._shooter_motors.is_enabled():
             self.shooter_enabled = True
             if self._log_enabled:
                 self._log.write_line("Shooter enabled")
 
+        # Stop the catapult at the encoder limits between control loops
+        if (self.encoder_enabled and self.shooter_enabled and
+            self._limit_guard_period > 0):
+            self._limit_guard = limitguard.LimitGuard(self._encoder.Get,
+                                                self._shooter_motors,
+                                                self._encoder_max_limit,
+                                                self._encoder_min_limit,
+                                                self._shooter_up_direction,
+                                                self._limit_guard_period)
+            self._limit_guard.set_enabled(not self._ignore_encoder_limits)
+            self._limit_guard.start()
+            if self._log_enabled:
+                self._log.write_line("Limit guard enabled")
+
         return True
 
     def set_robot_state(self, state):
@@ -338,6 +515,15 @@ class Shooter(object):
         if self._timer:
             self._timer.stop()
 
+        # The motors are stopped while disabled, so write the next speed
+        if self._shooter_motors:
+            self._shooter_motors.invalidate()
+
+        # Start any closed loop movement over
+        if self._position_pid:
+            self._position_pid.reset()
+        self._profile = None
+
         if state == common.ProgramState.DISABLED:
             pass
         if state == common.ProgramState.TELEOP:
@@ -362,17 +548,74 @@ class Shooter(object):
         if self._timer:
             self._timer.stop()
             self._timer.start()
+        # A new command starts a new profiled move
+        self._profile = None
 
     def read_sensors(self):
-        """Read and store current sensor values."""
+        """Read and store current sensor values.
+
+        The encoder count is added to the encoder history, and the arm's
+        velocity and acceleration are estimated from the recent history.
+
+        """
         if self.encoder_enabled:
-            self._encoder_count = self._encoder.Get()
+            count = None
+            # Use the latest sample if the encoder is sampled in the background
+            # (the sampler then keeps the history)
+            if self._sampler:
+                count = self._sampler.get_latest('shooter_encoder')
+            if count is None:
+                count = self._encoder.Get()
+                self._encoder_history.append(time.time(), count)
+            self._encoder_count = count
+
+            latest = self._encoder_history.get_latest()
+            samples = self._encoder_history.get_window(
+                                        latest[0] - self._velocity_window)
+            self._encoder_velocity, self._encoder_acceleration = (
+                                        sensorsampler.fit_motion(samples))
 
     def reset_sensors(self):
         """Reset sensor values."""
         if self.encoder_enabled:
             self._encoder.Reset()
             self._encoder_count = self._encoder.Get()
+            # Samples taken before the reset are no longer valid
+            self._encoder_history.clear()
+            self._encoder_velocity = 0.0
+            self._encoder_acceleration = 0.0
+
+    def register_sensors(self, sampler):
+        """Have a SensorSampler read the shooter encoder.
+
+        Once registered, read_sensors() uses the latest sample instead of
+        reading the encoder itself.
+
+        Args:
+            sampler: the sensorsampler.SensorSampler to register with.
+
+        """
+        if self.encoder_enabled:
+            self._encoder_history = sampler.add_sensor('shooter_encoder',
+                                                self._encoder.Get,
+                                                self._encoder_history_size)
+            self._sampler = sampler
+
+    def get_encoder_count(self):
+        """Returns the current encoder count of the catapult arm."""
+        return self._encoder_count
+
+    def get_velocity(self):
+        """Returns the arm velocity in encoder counts per second."""
+        return self._encoder_velocity
+
+    def get_acceleration(self):
+        """Returns the arm acceleration in encoder counts per second^2."""
+        return self._encoder_acceleration
+
+    def get_last_shot_velocity(self):
+        """Returns the arm velocity at the end of the last shot, or None."""
+        return self._last_shot_velocity
 
     def get_current_state(self):
         """Return a string containing sensor and status variables.
@@ -389,10 +632,18 @@ class Shooter(object):
             if self.encoder_enabled:
                 self._log.write_value("Encoder count", self._encoder_count,
                                       True)
+            if self._limit_guard:
+                self._log.write_value("Limit trips", self._limit_guard.trips,
+                                      True)
+                self._log.write_value("Limit overshoot",
+                                      self._limit_guard.max_overshoot, True)
 
     def set_shooter_position(self, position, speed):
         """Sets the catapult to a specified position.
 
+        The shooter slows down near the position using the far/medium/near
+        speed ratios, or a PID controller if PID_CONTROL_ENABLED is set.
+
         Args:
             position: The desired position in encoder counts.
             speed: The motor speed ratio.
@@ -408,32 +659,29 @@ class Shooter(object):
         movement_direction = 0.0
 
         # Check the encoder position against the boundaries (if enabled)
-        # Check max boundary
-        if (not self._ignore_encoder_limits and self._encoder_max_limit > 0 and
-            position > self._encoder_count and
-            self._encoder_count > self._encoder_max_limit):
-            if self._left_shooter_controller_enabled:
-                self._left_shooter_controller.Set(0, 0)
-            if self._right_shooter_controller_enabled:
-                self._right_shooter_controller.Set(0, 0)
-            return True
-        # Check min boundary
-        if (not self._ignore_encoder_limits and position < self._encoder_count
-            and self._encoder_count < self._encoder_min_limit):
-            if self._left_shooter_controller_enabled:
-                self._left_shooter_controller.Set(0, 0)
-            if self._right_shooter_controller_enabled:
-                self._right_shooter_controller.Set(0, 0)
+        if self._is_moving_past_limits(position):
+            self._shooter_motors.stop()
             return True
 
         # Check to see if we've reached the correct position
         if math.fabs(position - self._encoder_count) <= self._encoder_threshold:
-            if self._left_shooter_controller_enabled:
-                self._left_shooter_controller.Set(0, 0)
-            if self._right_shooter_controller_enabled:
-                self._right_shooter_controller.Set(0, 0)
+            self._shooter_motors.stop()
+            self._position_pid.reset()
             return True
 
+        # Let the PID controller slow the shooter down near the position
+        if self._pid_control_enabled:
+            output = self._position_pid.update(position - self._encoder_count,
+                                               speed)
+            if output < 0:
+                movement_direction = (-output * self._shooter_down_direction *
+                                      self._alternate_down_speed_ratio)
+            else:
+                movement_direction = (output * self._shooter_up_direction *
+                                      self._alternate_up_speed_ratio)
+            self._shooter_motors.set(movement_direction)
+            return False
+
         # Continue moving
         if (position - self._encoder_count) < 0:
             direction = (self._shooter_down_direction *
@@ -454,14 +702,94 @@ class Shooter(object):
             movement_direction = (direction  * speed *
                                   self._auto_near_speed_ratio)
 
-        if self._left_shooter_controller_enabled:
-            self._left_shooter_controller.Set((movement_direction *
-                                           self._invert_left_shooter_motor),
-                                           0)
-        if self._right_shooter_controller_enabled:
-            self._right_shooter_controller.Set((movement_direction *
-                                           self._invert_right_shooter_motor),
-                                           0)
+        self._shooter_motors.set(movement_direction)
+        return False
+
+    def set_shooter_position_profiled(self, position, speed):
+        """Sets the catapult to a specified position along a profile.
+
+        The move is planned as a trapezoidal motion profile, limited by the
+        profile maximum velocity and acceleration, and the shooter follows
+        the profile's velocity with a correction for how far it is from the
+        profile's position.  The move is finished when the profile is over
+        and the shooter is within tolerance of the position, or when the
+        settle time after the profile runs out.
+
+        Args:
+            position: The desired position in encoder counts.
+            speed: The ratio of the maximum velocity to move at.
+
+        Returns:
+            True when the desired position is reached.
+
+        """
+        # Abort if we don't have the encoder or motors
+        if (not self.encoder_enabled or not self.shooter_enabled or
+            not self._profile_timer):
+            return True
+
+        # Check the encoder position against the boundaries (if enabled)
+        if self._is_moving_past_limits(position):
+            self._shooter_motors.stop()
+            self._profile = None
+            return True
+
+        # If this is the first time called, plan the move
+        if not self._profile:
+            self._profile = motionprofile.TrapezoidalProfile(
+                                        position - self._encoder_count,
+                                        self._profile_max_velocity * speed,
+                                        self._profile_max_acceleration)
+            self._profile_start = self._encoder_count
+            self._profile_pid.reset()
+            self._profile_timer.stop()
+            self._profile_timer.start()
+
+        elapsed_time = self._profile_timer.elapsed_time_in_secs()
+        offset, velocity = self._profile.get_setpoint(elapsed_time)
+
+        # Check if we've reached the position, or run out of time to settle
+        if self._profile.is_finished(elapsed_time):
+            if (math.fabs(position - self._encoder_count) <=
+                    self._encoder_threshold or
+                elapsed_time > (self._profile.duration +
+                                self._profile_settle_time)):
+                self._shooter_motors.stop()
+                self._profile = None
+                self._profile_timer.stop()
+                return True
+
+        # Move at the profile velocity, corrected for the position error
+        output = (velocity * self._profile_velocity_gain +
+                  self._profile_pid.update(self._profile_start + offset -
+                                           self._encoder_count))
+        output = max(-1.0, min(1.0, output))
+        if output < 0:
+            self._shooter_motors.set(-output * self._shooter_down_direction)
+        else:
+            self._shooter_motors.set(output * self._shooter_up_direction)
+        return False
+
+    def _is_moving_past_limits(self, position):
+        """Check if moving to a position would go past the encoder limits.
+
+        Args:
+            position: The desired position in encoder counts.
+
+        Returns:
+            True if the shooter is already past the limit it's moving toward.
+
+        """
+        if self._ignore_encoder_limits:
+            return False
+        # Check max boundary
+        if (self._encoder_max_limit > 0 and position > self._encoder_count and
+            self._encoder_count > self._encoder_max_limit):
+            return True
+        # Check min boundary
+        if (position < self._encoder_count and
+            self._encoder_count < self._encoder_min_limit):
+            return True
         return False
 
     def shoot_time(self, time, direction, speed):
@@ -492,27 +820,18 @@ class Shooter(object):
             if (not self._ignore_encoder_limits and self._encoder_max_limit > 0
                 and direction == common.Direction.UP and
                 self._encoder_count > self._encoder_max_limit):
-                if self._left_shooter_controller_enabled:
-                    self._left_shooter_controller.Set(0, 0)
-                if self._right_shooter_controller_enabled:
-                    self._right_shooter_controller.Set(0, 0)
+                self._shooter_motors.stop()
                 return True
             # Check min boundary
             if (not self._ignore_encoder_limits and self._encoder_min_limit > 0
                 and direction == common.Direction.DOWN and
                 self._encoder_count < self._encoder_min_limit):
-                if self._left_shooter_controller_enabled:
-                    self._left_shooter_controller.Set(0, 0)
-                if self._right_shooter_controller_enabled:
-                    self._right_shooter_controller.Set(0, 0)
+                self._shooter_motors.stop()
                 return True
 
         # Check if we've reached the time duration
         if time_left < self._time_threshold or time_left < 0:
-            if self._left_shooter_controller_enabled:
-                self._left_shooter_controller.Set(0, 0)
-            if self._right_shooter_controller_enabled:
-                self._right_shooter_controller.Set(0, 0)
+            self._shooter_motors.stop()
             self._timer.stop()
             return True
         directional_speed = 0
@@ -533,14 +852,7 @@ class Shooter(object):
             directional_speed = (directional_speed * speed *
                     self._auto_near_speed_ratio)
 
-        if self._left_shooter_controller_enabled:
-            self._left_shooter_controller.Set((directional_speed *
-                                           self._invert_left_shooter_motor),
-                                           0)
-        if self._right_shooter_controller_enabled:
-            self._right_shooter_controller.Set((directional_speed *
-                                           self._invert_right_shooter_motor),
-                                           0)
+        self._shooter_motors.set(directional_speed)
         return False
 
     def move_shooter(self, directional_speed):
@@ -560,19 +872,13 @@ class Shooter(object):
             if (not self._ignore_encoder_limits and self._encoder_max_limit > 0
                 and self._shooter_up_direction * directional_speed > 0 and
                 self._encoder_count > self._encoder_max_limit):
-                if self._left_shooter_controller_enabled:
-                    self._left_shooter_controller.Set(0, 0)
-                if self._right_shooter_controller_enabled:
-                    self._right_shooter_controller.Set(0, 0)
+                self._shooter_motors.stop()
                 return True
             # Check min boundary
             if (not self._ignore_encoder_limits and self._encoder_min_limit > 0
                 and self._shooter_down_direction * directional_speed > 0 and
                 self._encoder_count < self._encoder_min_limit):
-                if self._left_shooter_controller_enabled:
-                    self._left_shooter_controller.Set(0, 0)
-                if self._right_shooter_controller_enabled:
-                    self._right_shooter_controller.Set(0, 0)
+                self._shooter_motors.stop()
                 return True
 
         if self._shooter_up_direction * directional_speed > 0:
@@ -581,14 +887,7 @@ class Shooter(object):
             directional_speed = (directional_speed *
                                  self._normal_down_speed_ratio)
 
-        if self._left_shooter_controller_enabled:
-            self._left_shooter_controller.Set((directional_speed *
-                                           self._invert_left_shooter_motor),
-                                           0)
-        if self._right_shooter_controller_enabled:
-            self._right_shooter_controller.Set((directional_speed *
-                                           self._invert_right_shooter_motor),
-                                           0)
+        self._shooter_motors.set(directional_speed)
 
     def auto_fire(self, power_as_percent):
         """Fire a shot automatically using sensors.
@@ -608,35 +907,89 @@ class Shooter(object):
                                    self._shooter_up_direction *
                                    self._alternate_up_speed_ratio)
 
+        # Check if the shot is over
+        if self._is_shot_finished():
+            self._end_shot()
+            return True
+
+        self._shooter_motors.set(shooting_power_as_speed)
+        return False
+
+    def auto_fire_velocity(self, velocity):
+        """Fire a shot, regulating the arm to a release velocity.
+
+        Instead of a fixed power, which gives weaker shots as the battery
+        runs down, the power is adjusted each loop to keep the arm moving at
+        the release velocity.
+
+        Args:
+            velocity: the arm velocity in encoder counts per second.
+
+        Returns:
+            True when finished.
+
+        """
+        # Abort if we don't have the encoder or motors
+        if not self.encoder_enabled or not self.shooter_enabled:
+            return True
+
+        # Check if the shot is over
+        if self._is_shot_finished():
+            self._end_shot()
+            self._fire_pid.reset()
+            return True
+
+        # Feed forward the power for the velocity, and correct for the error
+        power = (velocity * self._fire_velocity_gain +
+                 self._fire_pid.update(velocity - self._encoder_velocity))
+        power = max(0.0, min(1.0, power))
+        self._shooter_motors.set(power * self._shooter_up_direction *
+                                 self._alternate_up_speed_ratio)
+        return False
+
+    def auto_fire_distance(self, distance):
+        """Fire a shot that travels a distance.
+
+        The release velocity for the distance is looked up in the shot
+        calibration table.  If the table is empty the shot is fired at full
+        power.
+
+        Args:
+            distance: the distance to shoot.
+
+        Returns:
+            True when finished.
+
+        """
+        velocity = self._shot_calibration.get_velocity(distance)
+        if velocity is None:
+            return self.auto_fire(100.0)
+        return self.auto_fire_velocity(velocity)
+
+    def _is_shot_finished(self):
+        """Return True if the arm has reached the top of a shot."""
         # Check the encoder position against the boundaries (if enabled)
         # Check max boundary
         if (not self._ignore_encoder_limits and self._encoder_max_limit > 0 and
             self._encoder_count > self._encoder_max_limit):
-            if self._left_shooter_controller_enabled:
-                self._left_shooter_controller.Set(0, 0)
-            if self._right_shooter_controller_enabled:
-                self._right_shooter_controller.Set(0, 0)
             return True
 
         # Check to see if we've reached the correct position
         if (math.fabs(self._encoder_max_limit - self._encoder_count) <=
             self._encoder_threshold):
-            if self._left_shooter_controller_enabled:
-                self._left_shooter_controller.Set(0, 0)
-            if self._right_shooter_controller_enabled:
-                self._right_shooter_controller.Set(0, 0)
             return True
-
-        if self._left_shooter_controller_enabled:
-            self._left_shooter_controller.Set((shooting_power_as_speed *
-                                           self._invert_left_shooter_motor),
-                                           0)
-        if self._right_shooter_controller_enabled:
-            self._right_shooter_controller.Set((shooting_power_as_speed *
-                                           self._invert_right_shooter_motor),
-                                           0)
         return False
 
+    def _end_shot(self):
+        """Stop the arm and record the release velocity of the shot."""
+        # Only a shot that was moving the arm has a release velocity
+        if self._shooter_motors.get_speed():
+            self._last_shot_velocity = self._encoder_velocity
+            if self._log_enabled:
+                self._log.write_value("Release velocity",
+                                      self._last_shot_velocity, True)
+        self._shooter_motors.stop()
+
     def ignore_encoder_limits(self, state):
         """Notify shooter to ignore encoder limits.
 
@@ -645,4 +998,6 @@ class Shooter(object):
 
         """
         self._ignore_encoder_limits = state
+        if self._limit_guard:
+            self._limit_guard.set_enabled(not state)
 
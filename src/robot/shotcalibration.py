@@ -0,0 +1,125 @@
+"""This module provides a calibration table for catapult shots.
+
+The table maps the velocity the catapult arm is moving at when the ball is
+released to the distance the ball travels.  It's kept in a CSV file with a
+velocity and a distance on each line, built up from logged shots.
+
+"""
+
+# Imports
+import bisect
+import csv
+
+
+class ShotCalibration(object):
+    """Maps release velocities to shot distances.
+
+    Between calibrated shots the velocity is interpolated, and outside them
+    the nearest calibrated shot is used.
+
+    """
+    # Private member variables
+    _distances = None
+    _velocities = None
+
+    def __init__(self, path=None):
+        """Create a ShotCalibration.
+
+        Args:
+            path: the CSV file to load the calibrated shots from, or None to
+                start with an empty table.
+
+        """
+        self._distances = []
+        self._velocities = []
+        if path:
+            self.load(path)
+
+    def __len__(self):
+        return len(self._distances)
+
+    def load(self, path):
+        """Replace the table with the shots in a CSV file.
+
+        Lines that aren't a pair of numbers, like a header, are skipped.
+
+        Args:
+            path: the CSV file to read.
+
+        Returns:
+            True if the file was read.
+
+        """
+        self._distances = []
+        self._velocities = []
+        try:
+            with open(path, newline='') as csv_file:
+                for row in csv.reader(csv_file):
+                    try:
+                        velocity = float(row[0])
+                        distance = float(row[1])
+                    except (IndexError, ValueError):
+                        continue
+                    self.add_shot(velocity, distance)
+        except IOError:
+            return False
+        return True
+
+    def save(self, path):
+        """Write the table to a CSV file.
+
+        Args:
+            path: the CSV file to write.
+
+        Returns:
+            True if the file was written.
+
+        """
+        try:
+            with open(path, 'w', newline='') as csv_file:
+                writer = csv.writer(csv_file)
+                writer.writerow(['velocity', 'distance'])
+                for velocity, distance in zip(self._velocities,
+                                              self._distances):
+                    writer.writerow([velocity, distance])
+        except IOError:
+            return False
+        return True
+
+    def add_shot(self, velocity, distance):
+        """Add a calibrated shot to the table.
+
+        Args:
+            velocity: the release velocity in encoder counts per second.
+            distance: the distance the shot travelled.
+
+        """
+        index = bisect.bisect_right(self._distances, distance)
+        self._distances.insert(index, distance)
+        self._velocities.insert(index, velocity)
+
+    def get_velocity(self, distance):
+        """Get the release velocity for a shot distance.
+
+        Args:
+            distance: the distance to shoot.
+
+        Returns:
+            The release velocity, or None if the table is empty.
+
+        """
+        if not self._distances:
+            return None
+        index = bisect.bisect_left(self._distances, distance)
+        if index == 0:
+            return self._velocities[0]
+        if index == len(self._distances):
+            return self._velocities[-1]
+        near_distance = self._distances[index - 1]
+        far_distance = self._distances[index]
+        near_velocity = self._velocities[index - 1]
+        far_velocity = self._velocities[index]
+        if far_distance == near_distance:
+            return near_velocity
+        ratio = (distance - near_distance) / (far_distance - near_distance)
+        return near_velocity + ratio * (far_velocity - near_velocity)
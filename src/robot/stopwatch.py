@@ -91,3 +91,60 @@ class Stopwatch(object):
             self._msecs = secs * 1000
         return self._msecs
 
+
+
+class TimedAction(object):
+    """Tracks an action that lasts for a duration without blocking.
+
+    Instead of sleeping while an action runs, start a TimedAction and check
+    it on each pass through the control loop, moving on once it has expired.
+
+    """
+    # Private member variables
+    _clock = None
+    _end = None
+    _duration = None
+
+    def __init__(self, clock=time.time):
+        """Create and initialize a TimedAction.
+
+        Args:
+            clock: the function that returns the current time in seconds.
+
+        """
+        self._clock = clock
+        self._end = None
+        self._duration = None
+
+    def start(self, duration):
+        """Start timing the action.
+
+        Args:
+            duration: how long the action lasts in seconds.
+
+        """
+        self._duration = duration
+        self._end = self._clock() + duration
+
+    def cancel(self):
+        """Stop timing the action without it expiring."""
+        self._end = None
+        self._duration = None
+
+    def is_started(self):
+        """Return True if the action has been started and not cancelled."""
+        return self._end is not None
+
+    def is_running(self):
+        """Return True if the action has been started and hasn't expired."""
+        return self._end is not None and self._clock() < self._end
+
+    def is_expired(self):
+        """Return True if the action has been started and has expired."""
+        return self._end is not None and self._clock() >= self._end
+
+    def get_remaining(self):
+        """Return the time left in seconds, or None if not started."""
+        if self._end is None:
+            return None
+        return max(self._end - self._clock(), 0.0)
@@ -1,25 +1,29 @@
 """This module provides a image targeting server."""
 
-import json
 import logging
 import queue
 import socketserver
 import sys
 import threading
 import target
+import telemetry
 import time
 
 
 class ServerWithQueue(socketserver.TCPServer):
     """Describes a TCP server with a Queue for transfering data."""
 
-    def __init__(self, server_address, RequestHandlerClass, data_queue):
+    def __init__(self, server_address, RequestHandlerClass, data_queue,
+                 telemetry_store=None, telemetry_period=0.1):
         """Create a TCP server with a Queue.
 
         Args:
             server_address: the host and port for the server.
             RequestHandlerClass: the request handler.
             data_queue: the Queue for transfering data to another object.
+            telemetry_store: the telemetry.Telemetry to send to clients, or
+                None to disable telemetry.
+            telemetry_period: the time between telemetry records in seconds.
 
         """
         # Create the base TCP server with address/port and connection handler
@@ -27,6 +31,9 @@ class ServerWithQueue(socketserver.TCPServer):
                                         RequestHandlerClass)
         # Store the Queue used to transfer objects to another thread/object
         self.data_queue = data_queue
+        # Store the telemetry sent back to each client
+        self.telemetry_store = telemetry_store
+        self.telemetry_period = telemetry_period
 
 
 class TargetHandler(socketserver.StreamRequestHandler):
@@ -38,10 +45,10 @@ class TargetHandler(socketserver.StreamRequestHandler):
         """Handle incoming connections.
 
         This method receives JSON data a line at a time.  The JSON is parsed
-        and a Target object is instantated using the resulting JSON dictionary.
-        The Target object is then put into a Queue used to transfer data between
-        different objects and threads.  If the queue is full, the oldest (since
-        it's FIFO) is removed and the new Target is added.
+        directly into a List of Target objects, which is then put into a Queue
+        used to transfer data between different objects and threads.  If the
+        queue is full, the oldest (since it's FIFO) is removed and the new List
+        is added.
 
         """
         self._logger = logging.getLogger(__name__)
@@ -55,13 +62,21 @@ class TargetHandler(socketserver.StreamRequestHandler):
         self._logger.setLevel(logging.DEBUG)
 
         self._logger.info("Connected.")
+
+        # Stream telemetry back to the client from a separate thread
+        stop_telemetry = threading.Event()
+        if self.server.telemetry_store:
+            sender = threading.Thread(target=self._send_telemetry,
+                                      args=(stop_telemetry,))
+            sender.daemon = True
+            sender.start()
+
         # Loop continuously as long as the connection is alive
         while True:
             # Read from the TCP connection until a newline is encountered
             # We append a newline in the TCP client whenever a JSON message
             # is sent.
-            json_data = None
-            new_targets = []
+            new_targets = None
             try:
                 data = str(self.rfile.readline(), "utf-8")
             except Exception as excep:
@@ -72,25 +87,13 @@ class TargetHandler(socketserver.StreamRequestHandler):
             if not data:
                 self._logger.warn("Could not read data, closing connection.")
                 break
-            # Try to convert the JSON string to Python types (List of Dicts)
+            # Try to convert the JSON string directly to a List of Targets
             try:
-                json_data = json.loads(data.strip())
+                new_targets = target.decode_targets(data.strip())
             except ValueError:
                 self._logger.warn("ValueError while parsing JSON")
             except TypeError:
                 self._logger.warn("TypeError while parsing JSON")
-            # If the JSON was parsed, create Target objects from it
-            if json_data and isinstance(json_data, list):
-                for json_dict in json_data:
-                    # Here we use ** to pass a dictionary containing all keyword
-                    # arguments. It isn't the best, but I don't know of a better
-                    # method for easily populating an object's properties using a
-                    # dictionary.
-                    try:
-                        current_target = target.Target(**json_dict)
-                        new_targets.append(current_target)
-                    except TypeError:
-                        self._logger.warn("TypeError while creating Target obj")
             # If everything went well, we have new Target object(s)
             if new_targets and len(new_targets) > 0:
                 # Add Targets to the queue. If the queue is full, remove the
@@ -106,14 +109,53 @@ class TargetHandler(socketserver.StreamRequestHandler):
                     self._logger.warn("Queue is full")
             time.sleep(0.1)
 
+        stop_telemetry.set()
+
+    def _send_telemetry(self, stop):
+        """Send telemetry records to the client at a fixed rate.
+
+        Args:
+            stop: the threading.Event that is set when the connection closes.
+
+        """
+        encoder = telemetry.TelemetryEncoder()
+        period = self.server.telemetry_period
+        next_time = time.time()
+        while not stop.is_set():
+            values = self.server.telemetry_store.get_values()
+            record = encoder.encode(values) + '\n'
+            try:
+                self.wfile.write(bytes(record, "utf-8"))
+            except Exception as excep:
+                self._logger.warn("Exception sending telemetry: " + str(excep))
+                break
+            # Schedule against the previous send time to keep the rate fixed
+            next_time += period
+            delay = next_time - time.time()
+            if delay < 0:
+                next_time = time.time()
+                delay = 0
+            stop.wait(delay)
+
 
 class ImageServer(threading.Thread):
     """A TCP server that runs in a background thread to receive Targets."""
 
     _logger = None
 
-    def __init__(self, data_queue, port=1180):
-        """Initialize a background thread for receiving Targets over TCP."""
+    def __init__(self, data_queue, port=1180, telemetry_store=None,
+                 telemetry_period=0.1, host='10.0.94.2'):
+        """Initialize a background thread for receiving Targets over TCP.
+
+        Args:
+            data_queue: the Queue that receives Lists of Targets.
+            port: the TCP port to listen on.
+            telemetry_store: the telemetry.Telemetry to send to clients, or
+                None to disable telemetry.
+            telemetry_period: the time between telemetry records in seconds.
+            host: the address to listen on.
+
+        """
         self._logger = logging.getLogger(__name__)
         handler = None
         formatter = logging.Formatter('%(asctime)s - %(levelname)s:'
@@ -123,22 +165,33 @@ class ImageServer(threading.Thread):
         handler.setFormatter(formatter)
         self._logger.addHandler(handler)
         self._logger.setLevel(logging.DEBUG)
+        self.host = host
         self.port = port
         self._server = None
         self._data_queue = data_queue
+        self._telemetry_store = telemetry_store
+        self._telemetry_period = telemetry_period
         threading.Thread.__init__(self)
 
     def run(self):
         """Starts a TCP server that listens for Targets."""
         # If the server hasn't been created yet, create it
         if self._server == None:
-            address = ('10.0.94.2', self.port)
+            address = (self.host, self.port)
             self._server = ServerWithQueue(address, TargetHandler,
-                                           self._data_queue)
+                                           self._data_queue,
+                                           self._telemetry_store,
+                                           self._telemetry_period)
         self._logger.info("Listening for TCP connections..")
         # Serve connections forever (until the robot is turned off)
         self._server.serve_forever()
 
+    def shutdown(self):
+        """Stop serving connections and close the server."""
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+
 # This is used for testing on a PC
 #if __name__ == '__main__':
 #    data_queue = queue.Queue(1)
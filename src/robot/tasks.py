@@ -0,0 +1,247 @@
+"""This module provides a cooperative scheduler for robot routines.
+
+Routines are written as generators that yield once per loop:
+
+    def truss_pass(self):
+        while not self._shooter.set_shooter_position(450, 1.0):
+            yield
+
+The scheduler advances every running routine once per loop.  Each routine
+declares the subsystems it uses; starting a routine cancels any running
+routine that uses one of the same subsystems.  Cancelling a routine closes
+its generator, so a try/finally in the routine can clean up.
+
+"""
+
+# Imports
+import time
+
+
+class TaskStatistics(object):
+    """Timing and outcome counts for a named task.
+
+    Attributes:
+        name: the name of the task.
+        started: the number of times the task was started.
+        completed: the number of times the task finished by itself.
+        cancelled: the number of times the task was cancelled or preempted.
+        ticks: the total number of times the task was advanced.
+        total_time: the total time spent advancing the task in seconds.
+        max_time: the longest time spent in a single tick in seconds.
+
+    """
+    # Public member variables
+    name = None
+    started = 0
+    completed = 0
+    cancelled = 0
+    ticks = 0
+    total_time = 0.0
+    max_time = 0.0
+
+    def __init__(self, name):
+        """Create the statistics for a task.
+
+        Args:
+            name: the name of the task.
+
+        """
+        self.name = name
+        self.started = 0
+        self.completed = 0
+        self.cancelled = 0
+        self.ticks = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+
+    def get_summary(self):
+        """Return a one line description of the statistics."""
+        mean = self.total_time / self.ticks if self.ticks else 0.0
+        return ("%s: %d started, %d completed, %d cancelled, %d ticks, "
+                "mean %.2f ms, max %.2f ms" %
+                (self.name, self.started, self.completed, self.cancelled,
+                 self.ticks, mean * 1000, self.max_time * 1000))
+
+
+class Task(object):
+    """A running routine.
+
+    Attributes:
+        name: the name of the task.
+        requirements: the tuple of subsystems the task uses.
+        ticks: the number of times the task has been advanced.
+
+    """
+    # Public member variables
+    name = None
+    requirements = ()
+    ticks = 0
+
+    # Private member variables
+    _generator = None
+
+    def __init__(self, name, generator, requirements=()):
+        """Create a task.
+
+        Args:
+            name: the name of the task.
+            generator: the generator that performs the routine.
+            requirements: the subsystems the task uses.
+
+        """
+        self.name = name
+        self.requirements = tuple(requirements)
+        self.ticks = 0
+        self._generator = generator
+
+    def step(self):
+        """Advance the routine by one tick.
+
+        Returns:
+            True if the routine has finished.
+
+        """
+        self.ticks += 1
+        try:
+            next(self._generator)
+        except StopIteration:
+            return True
+        return False
+
+    def close(self):
+        """Stop the routine where it is."""
+        self._generator.close()
+
+
+class TaskScheduler(object):
+    """Runs routines cooperatively, one tick per loop."""
+
+    # Private member variables
+    _clock = None
+    _tasks = None
+    _statistics = None
+
+    def __init__(self, clock=time.time):
+        """Create a TaskScheduler.
+
+        Args:
+            clock: the function that returns the current time in seconds.
+
+        """
+        self._clock = clock
+        self._tasks = []
+        self._statistics = {}
+
+    def start(self, name, generator, requirements=()):
+        """Start a routine, preempting any that use the same subsystems.
+
+        A running task with the same name is cancelled and started again.
+
+        Args:
+            name: the name of the task.
+            generator: the generator that performs the routine.
+            requirements: the subsystems the task uses.
+
+        Returns:
+            The new Task.
+
+        """
+        self.cancel(name)
+        for subsystem in requirements:
+            self.cancel_requiring(subsystem)
+        task = Task(name, generator, requirements)
+        self._tasks.append(task)
+        self._get_statistics(name).started += 1
+        return task
+
+    def run(self):
+        """Advance every running task by one tick, in the order started."""
+        for task in list(self._tasks):
+            if task not in self._tasks:
+                continue
+            stats = self._get_statistics(task.name)
+            start = self._clock()
+            try:
+                finished = task.step()
+            except Exception:
+                self._tasks.remove(task)
+                stats.cancelled += 1
+                raise
+            elapsed = self._clock() - start
+            stats.ticks += 1
+            stats.total_time += elapsed
+            if elapsed > stats.max_time:
+                stats.max_time = elapsed
+            if finished:
+                self._tasks.remove(task)
+                stats.completed += 1
+
+    def cancel(self, name):
+        """Cancel a task by name.
+
+        Returns:
+            True if the task was running.
+
+        """
+        for task in self._tasks:
+            if task.name == name:
+                self._cancel_task(task)
+                return True
+        return False
+
+    def cancel_requiring(self, subsystem):
+        """Cancel any task that uses a subsystem."""
+        for task in list(self._tasks):
+            if subsystem in task.requirements:
+                self._cancel_task(task)
+
+    def cancel_all(self):
+        """Cancel every running task."""
+        for task in list(self._tasks):
+            self._cancel_task(task)
+
+    def is_running(self, name):
+        """Return True if a task with the name is running."""
+        for task in self._tasks:
+            if task.name == name:
+                return True
+        return False
+
+    def get_owner(self, subsystem):
+        """Get the name of the task using a subsystem.
+
+        Returns:
+            The task name, or None if the subsystem is free.
+
+        """
+        for task in self._tasks:
+            if subsystem in task.requirements:
+                return task.name
+        return None
+
+    def is_idle(self):
+        """Return True if no tasks are running."""
+        return not self._tasks
+
+    def get_statistics(self):
+        """Get the statistics of every task that has been started.
+
+        Returns:
+            A List of TaskStatistics, sorted by name.
+
+        """
+        return [self._statistics[name] for name in sorted(self._statistics)]
+
+    def _get_statistics(self, name):
+        """Get (or create) the statistics for a task name."""
+        stats = self._statistics.get(name)
+        if not stats:
+            stats = TaskStatistics(name)
+            self._statistics[name] = stats
+        return stats
+
+    def _cancel_task(self, task):
+        """Remove a task and close its generator."""
+        self._tasks.remove(task)
+        self._get_statistics(task.name).cancelled += 1
+        task.close()
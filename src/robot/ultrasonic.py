@@ -2,28 +2,131 @@
 
 
 # Imports
+import bisect
+import collections
+import time
 try:
     import wpilib
 except ImportError:
     from pyfrc import wpilib
 
 
+class PercentileFilter(object):
+    """Tracks a percentile of the most recent values.
+
+    The values in the window are kept both in the order they arrived, to know
+    which one to evict, and in sorted order, so the percentile is found by
+    indexing instead of sorting the window on every read.  Inserting and
+    evicting a value is a binary search in the sorted values.
+
+    Attributes:
+        window: the number of values the percentile is taken over.
+        percentile: the percentile to return, from 0 to 100.
+
+    """
+    # Public member variables
+    window = None
+    percentile = None
+
+    # Private member variables
+    _values = None
+    _sorted_values = None
+    _index = 0
+
+    def __init__(self, window=21, percentile=90):
+        """Create a PercentileFilter.
+
+        Args:
+            window: the number of values the percentile is taken over.
+            percentile: the percentile to return, from 0 to 100.
+
+        """
+        self.window = max(1, int(window))
+        self.percentile = min(max(percentile, 0), 100)
+        self._values = collections.deque()
+        self._sorted_values = []
+        self._index = int(round(self.percentile / 100.0 * (self.window - 1)))
+
+    def __len__(self):
+        return len(self._values)
+
+    def is_full(self):
+        """Return True if the window is full of values."""
+        return len(self._values) >= self.window
+
+    def add(self, value):
+        """Add a value, evicting the oldest value if the window is full.
+
+        Args:
+            value: the value to add.
+
+        """
+        if len(self._values) >= self.window:
+            oldest = self._values.popleft()
+            del self._sorted_values[bisect.bisect_left(self._sorted_values,
+                                                       oldest)]
+        self._values.append(value)
+        bisect.insort(self._sorted_values, value)
+
+    def clear(self):
+        """Remove every value."""
+        self._values.clear()
+        self._sorted_values = []
+
+    def get_value(self):
+        """Get the percentile of the values in the window.
+
+        Returns:
+            The value, or None if the window isn't full yet.
+
+        """
+        if not self.is_full():
+            return None
+        return self._sorted_values[self._index]
+
+
 class RangeFinder(object):
     """Get the distance to the nearest object."""
-    # TODO: change hard coded values to come from parameters
 
     _volts_per_inch = None
     _channel = None
-    _range_list = None
+    _filter = None
+    _decimation = None
+    _decimation_period = None
+    _floor = None
+    _clock = None
     _filtered_read_count = None
+    _last_filtered_time = None
 
-    def __init__(self, chan):
+    def __init__(self, chan, window=21, percentile=90, decimation=5,
+                 floor=1.0, decimation_period=0.0, clock=time.time):
+        """Create a RangeFinder.
+
+        Args:
+            chan: the analog channel the range finder is connected to.
+            window: the number of readings the filtered range is taken over.
+            percentile: the percentile of the readings used as the filtered
+                range.
+            decimation: only every decimation-th reading is filtered.
+            floor: readings at or below this range in feet aren't filtered.
+            decimation_period: if greater than 0, readings are filtered at
+                most once every this many seconds instead of every
+                decimation-th reading, so the filter doesn't depend on how
+                often it's read.
+            clock: the function that returns the current time in seconds.
+
+        """
         self._channel = wpilib.AnalogChannel(chan)
         self._channel.SetOversampleBits(4)
         self._channel.SetAverageBits(4)
         self._volts_per_inch = 5 / 512.0
-        self._range_list = []
+        self._filter = PercentileFilter(window, percentile)
+        self._decimation = decimation
+        self._decimation_period = decimation_period
+        self._floor = floor
+        self._clock = clock
         self._filtered_read_count = 0
+        self._last_filtered_time = None
 
     def get_voltage(self):
         """Get the voltage from the analog channel."""
@@ -41,25 +144,30 @@ class RangeFinder(object):
         return rng
 
     def get_filtered_range_in_feet(self):
-        """Get the median filtered range in feet."""
-        self._filtered_read_count += 1
+        """Get the percentile filtered range in feet.
+
+        Returns:
+            The filtered range, or the current reading until enough readings
+            have been filtered.
+
+        """
         current_range = self.get_range_in_feet()
-        # Only store the range in the range list if it's greater than 1.0 and
-        # every 5th reading.
-        # The reason to only store every 5th range is to add a time delay in
-        # between readings
-        if current_range > 1.0 and self._filtered_read_count >= 5:
-            if len(self._range_list) >= 21:
-                self._range_list.pop(0)
-            self._range_list.append(current_range)
+        # Only filter readings above the floor, and space them out in time
+        # so the window covers more than a few loops
+        if self._is_filter_due() and current_range > self._floor:
+            self._filter.add(current_range)
             self._filtered_read_count = 0
-        # If the range list is full of data, return the median range
-        if len(self._range_list) > 20:
-            # Copy and sort the range list
-            sorted_ranges = list(self._range_list)
-            sorted_ranges.sort()
-            return sorted_ranges[18]
-        # Otherwise just return the current reading
-        else:
+            self._last_filtered_time = self._clock()
+        filtered_range = self._filter.get_value()
+        if filtered_range is None:
             return current_range
+        return filtered_range
 
+    def _is_filter_due(self):
+        """Return True if it's time to filter another reading."""
+        if self._decimation_period > 0:
+            return (self._last_filtered_time is None or
+                    self._clock() - self._last_filtered_time >=
+                        self._decimation_period)
+        self._filtered_read_count += 1
+        return self._filtered_read_count >= self._decimation
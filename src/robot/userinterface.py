@@ -9,8 +9,10 @@ except ImportError:
     from pyfrc import wpilib
 import os
 import common
+import lcdbuffer
 import parameters
 import datalog
+import time
 
 
 class JoystickAxis(object):
@@ -43,23 +45,45 @@ class UserControllers(object):
     SCORING = 1
 
 
+class MessagePriority(object):
+    """Enumerates the priorities of Driver Station LCD messages."""
+    STATUS = 0
+    MESSAGE = 1
+
+
 class UserInterface(object):
-    """Provides the user interface connections."""
+    """Provides the user interface connections.
+
+    The controllers are read once per loop by update(), which stores every
+    button as a bit in a mask and every axis after the dead band is applied.
+    All of the button and axis methods read that snapshot, so a button that
+    is checked several times in a loop is only read from the hardware once
+    and always gives the same answer.
+
+    """
 
     _log = None
     _parameters = None
 
     _controller_1 = None
     _controller_1_buttons = 0
-    _controller_1_previous_button_state = 0
+    _controller_1_axis_count = 0
     _controller_1_dead_band = 0.0
 
     _controller_2 = None
     _controller_2_buttons = 0
-    _controller_2_previous_button_state = 0
+    _controller_2_axis_count = 0
     _controller_2_dead_band = 0.0
 
+    _button_masks = None
+    _previous_button_masks = None
+    _axis_values = None
+
     _driver_station_lcd = None
+    _lcd_buffer = None
+    _lcd_update_period = None
+    _message_display_time = None
+    _last_lcd_update = None
     _data_log = None
     _parameters_file = None
 
@@ -109,22 +133,29 @@ class UserInterface(object):
         self._parameters = None
         self._controller_1 = None
         self._controller_2 = None
-        self._controller_1_previous_button_state = []
-        self._controller_2_previous_button_state = []
 
         # Initialize private parameters
         self._controller_1_buttons = 4
         self._controller_2_buttons = 4
+        self._controller_1_axis_count = 2
+        self._controller_2_axis_count = 2
+        self._lcd_update_period = 0.1
+        self._message_display_time = 3.0
         self._controller_1_dead_band = 0.05
         self._controller_2_dead_band = 0.05
 
         # Initialize private member variables
+        self._button_masks = [0, 0]
+        self._previous_button_masks = [0, 0]
+        self._axis_values = [[], []]
         self._display_line = 0
+        self._last_lcd_update = None
         self._log_enabled = False
         self._robot_state = common.ProgramState.DISABLED
         self._parameters_file = None
 
         self._driver_station_lcd = wpilib.DriverStationLCD.GetInstance()
+        self._lcd_buffer = lcdbuffer.LCDBuffer()
 
         if logging_enabled:
             #Create a new data log object
@@ -161,8 +192,9 @@ class UserInterface(object):
         self._parameters = None
         self._controller_1 = None
         self._controller_2 = None
-        self._controller_1_previous_button_state = []
-        self._controller_2_previous_button_state = []
+        self._button_masks = [0, 0]
+        self._previous_button_masks = [0, 0]
+        self._axis_values = [[], []]
 
         # Read the parameters file
         param_reader = parameters.Parameters(self._parameters_file)
@@ -194,11 +226,12 @@ class UserInterface(object):
                                                       "CONTROLLER1_DEAD_BAND")
             self._controller_2_dead_band = param_reader.get_value(section,
                                                       "CONTROLLER2_DEAD_BAND")
-            # Initialize previous button state lists
-            self._controller_1_previous_button_state = ([0] *
-                                            (self._controller_1_buttons + 1))
-            self._controller_2_previous_button_state = ([0] *
-                                            (self._controller_2_buttons + 1))
+            self._lcd_update_period = param_reader.get_value(section,
+                                                      "LCD_UPDATE_PERIOD")
+            self._message_display_time = param_reader.get_value(section,
+                                                      "MESSAGE_DISPLAY_TIME")
+            self._controller_1_axis_count = controller_1_axis
+            self._controller_2_axis_count = controller_2_axis
 
             # Initialize  controller objects
             self._controller_1 = wpilib.Joystick(controller_1_port,
@@ -231,6 +264,52 @@ class UserInterface(object):
         else:
             self._log_enabled = False
 
+    def update(self):
+        """Read the controllers into the snapshot used for the rest of the loop.
+
+        Call this once at the start of each loop, before any buttons or axes
+        are checked.
+
+        """
+        (self._button_masks[UserControllers.DRIVER],
+         self._axis_values[UserControllers.DRIVER]) = self._read_controller(
+                                            self._controller_1,
+                                            self._controller_1_buttons,
+                                            self._controller_1_axis_count,
+                                            self._controller_1_dead_band)
+        (self._button_masks[UserControllers.SCORING],
+         self._axis_values[UserControllers.SCORING]) = self._read_controller(
+                                            self._controller_2,
+                                            self._controller_2_buttons,
+                                            self._controller_2_axis_count,
+                                            self._controller_2_dead_band)
+
+    def _read_controller(self, joystick, button_count, axis_count, dead_band):
+        """Read every button and axis of a controller.
+
+        Args:
+            joystick: the wpilib.Joystick to read (may be None).
+            button_count: the number of buttons on the controller.
+            axis_count: the number of axes on the controller.
+            dead_band: axis values closer than this to 0 are read as 0.
+
+        Returns:
+            A tuple of the button mask (bit n set if button n is pressed) and
+            a List of axis values indexed by axis ID.
+
+        """
+        mask = 0
+        axes = [0.0] * (axis_count + 1)
+        if joystick:
+            for button in range(1, button_count + 1):
+                if joystick.GetRawButton(button):
+                    mask |= 1 << button
+            for axis in range(1, axis_count + 1):
+                value = joystick.GetRawAxis(axis)
+                if abs(value) >= dead_band:
+                    axes[axis] = value
+        return mask, axes
+
     def button_state_changed(self, controller, button):
         """Check if the button state for the specified controller/button has
         changed since the last "Store".
@@ -243,19 +322,39 @@ class UserInterface(object):
             true if the button state has changed
 
         """
-        # Get the current button state
-        current_state = self.get_button_state(controller, button)
-        previous_state = 0
+        changed = (self._button_masks[controller] ^
+                   self._previous_button_masks[controller])
+        return bool(changed & (1 << button))
 
-        if controller == UserControllers.DRIVER:
-            previous_state = self._controller_1_previous_button_state[button]
-        elif controller == UserControllers.SCORING:
-            previous_state = self._controller_2_previous_button_state[button]
+    def button_pressed(self, controller, button):
+        """Check if a button was pressed since the last "Store".
 
-        if current_state != previous_state:
-            return True
-        else:
-            return False
+        Args:
+            controller: the controller to read the button state from
+            button: the button ID to read the state from
+
+        Return:
+            true if the button is down now and was up when last stored
+
+        """
+        pressed = (self._button_masks[controller] &
+                   ~self._previous_button_masks[controller])
+        return bool(pressed & (1 << button))
+
+    def button_released(self, controller, button):
+        """Check if a button was released since the last "Store".
+
+        Args:
+            controller: the controller to read the button state from
+            button: the button ID to read the state from
+
+        Return:
+            true if the button is up now and was down when last stored
+
+        """
+        released = (~self._button_masks[controller] &
+                    self._previous_button_masks[controller])
+        return bool(released & (1 << button))
 
     def get_axis_value(self, controller, axis):
         """Read the current axis value for the specified controller/axis.
@@ -268,21 +367,9 @@ class UserInterface(object):
             the current position fo the specified axis
 
         """
-        # Get the current axis value from the controller
-        value = 0.0
-
-        if controller == UserControllers.DRIVER:
-            if self._controller_1:
-                value = self._controller_1.GetRawAxis(axis)
-                if abs(value) < self._controller_1_dead_band:
-                    return 0.0
-                return value
-        elif controller == UserControllers.SCORING:
-            if self._controller_2:
-                value = self._controller_2.GetRawAxis(axis)
-                if abs(value) < self._controller_2_dead_band:
-                    return 0.0
-                return value
+        axes = self._axis_values[controller]
+        if axis < len(axes):
+            return axes[axis]
         return 0.0
 
     def get_button_state(self, controller, button):
@@ -296,27 +383,24 @@ class UserInterface(object):
             1 if button is currently pressed
 
         """
-        if controller == UserControllers.DRIVER:
-            if self._controller_1:
-                return self._controller_1.GetRawButton(button)
-            else:
-                return 0
-        elif controller == UserControllers.SCORING:
-            if self._controller_2:
-                return self._controller_2.GetRawButton(button)
-            else:
-                return 0
-        return 0
+        return (self._button_masks[controller] >> button) & 1
 
-    def output_user_message(self, message, clear):
+    def output_user_message(self, message, clear,
+                            priority=MessagePriority.MESSAGE):
         """Displays a message on the User Messages Window of the Driver Station.
 
+        The message is written to the LCD buffer, and is sent to the Driver
+        Station by the next update_lcd().  Messages are shown for the message
+        display time, over any status text; status text stays until it's
+        replaced.
+
         Args:
             message: The text to display.
             clear: True if the screen should be cleared first.
+            priority: the MessagePriority of the text.
 
         """
-        if not self._driver_station_lcd:
+        if not self._lcd_buffer:
             return
 
         self._display_line = (self._display_line + 1) % 6
@@ -324,37 +408,52 @@ class UserInterface(object):
         # Clear the screen if specified
         if clear or self._display_line == 0:
             self._display_line = 0
-            self._driver_station_lcd.Clear()
+            self._lcd_buffer.clear(priority)
 
-        # Display the message
-        self._driver_station_lcd.PrintLine(self._display_line, message)
-        self._driver_station_lcd.UpdateLCD()
+        hold = None
+        if priority != MessagePriority.STATUS:
+            hold = self._message_display_time
+        self._lcd_buffer.write(self._display_line, message, priority, hold)
 
-    def store_button_states(self, controller):
-        """Store the current button states for the specified controller.
+    def output_status(self, line, message):
+        """Display status text on a line, under any messages.
 
         Args:
-            controller: the controller to read the button states from
+            line: the line number (0 is the top line).
+            message: The text to display.
 
         """
-        button_state = 0
-        button_count = 0
+        if self._lcd_buffer:
+            self._lcd_buffer.write(line, message, MessagePriority.STATUS)
+
+    def update_lcd(self):
+        """Send any changed lines to the Driver Station LCD.
 
-        # Get the total number of buttons for the controller
-        button_count = {
-                        0: self._controller_1_buttons,
-                        1: self._controller_2_buttons
-                        }.get(controller, 0)
+        The LCD is updated at most once every LCD update period, and only if
+        a line changed.
+
+        """
+        if not self._driver_station_lcd:
+            return
+        now = time.time()
+        if (self._last_lcd_update is not None and
+            now - self._last_lcd_update < self._lcd_update_period):
+            return
+        self._last_lcd_update = now
+        changes = self._lcd_buffer.get_changes()
+        if changes:
+            for line, text in changes:
+                self._driver_station_lcd.PrintLine(line, text)
+            self._driver_station_lcd.UpdateLCD()
 
-        # Store the current state of each button for this controller
-        # +1 is used in array indexing since #defines and GeRawButton start at
-        # 1, and array starts at 0.
-        for i in range(button_count):
-            button_state = self.get_button_state(controller, i + 1)
+    def store_button_states(self, controller):
+        """Store the current button states for the specified controller.
 
-            if controller == UserControllers.DRIVER:
-                self._controller_1_previous_button_state[i + 1] = button_state
+        The stored states are compared with the next snapshot to find which
+        buttons changed.
 
-            if controller == UserControllers.SCORING:
-                self._controller_2_previous_button_state[i + 1] = button_state
+        Args:
+            controller: the controller to store the button states for
 
+        """
+        self._previous_button_masks[controller] = self._button_masks[controller]
@@ -0,0 +1,153 @@
+"""This module tests the connection module.
+
+    Packages(s) required:
+    - pytest
+
+"""
+
+# Imports
+import pytest
+import random
+import socket
+import time
+import connection
+
+
+def wait_for(condition, timeout=2.0):
+    """Call a function until it returns something true, or time runs out."""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        result = condition()
+        if result:
+            return result
+        time.sleep(0.005)
+    return condition()
+
+
+class TestBackoff:
+    """Test the Backoff class."""
+
+    def setup_method(self, method):
+        """Setup each test."""
+        self._backoff = connection.Backoff(0.1, 1.0, 2.0, 0.0)
+
+    def test_ready_before_failure(self):
+        assert self._backoff.ready(0.0)
+        assert self._backoff.time_until_ready(0.0) == 0.0
+
+    def test_delay_grows(self):
+        delays = [self._backoff.failed(0.0) for _ in range(4)]
+        assert delays == pytest.approx([0.1, 0.2, 0.4, 0.8])
+        assert self._backoff.failures == 4
+
+    def test_delay_capped(self):
+        for _ in range(10):
+            delay = self._backoff.failed(0.0)
+        assert delay == pytest.approx(1.0)
+
+    def test_ready_after_delay(self):
+        self._backoff.failed(10.0)
+        assert not self._backoff.ready(10.05)
+        assert self._backoff.time_until_ready(10.05) == pytest.approx(0.05)
+        assert self._backoff.ready(10.1)
+
+    def test_reset(self):
+        self._backoff.failed(10.0)
+        self._backoff.failed(10.0)
+        self._backoff.reset()
+        assert self._backoff.failures == 0
+        assert self._backoff.ready(0.0)
+        assert self._backoff.failed(0.0) == pytest.approx(0.1)
+
+    def test_jitter(self):
+        random.seed(1)
+        backoff = connection.Backoff(1.0, 1.0, 2.0, 0.25)
+        delays = [backoff.failed(0.0) for _ in range(20)]
+        assert all(0.75 <= delay <= 1.25 for delay in delays)
+        assert len(set(delays)) > 1
+
+
+class TestRobotConnection:
+    """Test the RobotConnection class over loopback."""
+
+    def setup_method(self, method):
+        """Setup each test."""
+        self._listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._listener.bind(('127.0.0.1', 0))
+        self._listener.listen(1)
+        self._backoff = connection.Backoff(10.0, 10.0, 2.0, 0.0)
+        self._connection = connection.RobotConnection('127.0.0.1',
+                                        self._listener.getsockname()[1],
+                                        backoff=self._backoff)
+        self._server = None
+
+    def teardown_method(self, method):
+        """Clean up after each test."""
+        self._connection.close()
+        if self._server:
+            self._server.close()
+        self._listener.close()
+
+    def _connect(self):
+        """Connect to the listener and accept the connection."""
+        assert wait_for(self._connection.poll)
+        self._server, _ = self._listener.accept()
+
+    def _read_lines(self):
+        """Wait for the connection to return some lines."""
+        return wait_for(self._connection.read_lines)
+
+    def test_connect(self):
+        assert not self._connection.is_connected()
+        self._connect()
+        assert self._connection.is_connected()
+        assert self._connection.poll()
+
+    def test_refused(self):
+        port = self._listener.getsockname()[1]
+        self._listener.close()
+        refused = connection.RobotConnection('127.0.0.1', port,
+                                             backoff=self._backoff)
+        assert wait_for(lambda: refused.poll() or self._backoff.failures)
+        assert self._backoff.failures == 1
+        assert not refused.is_connected()
+        assert refused.state == refused.DISCONNECTED
+        assert not self._backoff.ready()
+        assert not refused.poll()
+        assert self._backoff.failures == 1
+        refused.close()
+
+    def test_send(self):
+        assert not self._connection.send(b'ignored\n')
+        self._connect()
+        assert self._connection.send(b'hello\n')
+        self._server.settimeout(2.0)
+        assert self._server.recv(16) == b'hello\n'
+
+    def test_read_lines(self):
+        self._connect()
+        self._server.sendall(b'one\ntwo\n')
+        assert self._read_lines() == ['one', 'two']
+
+    def test_read_lines_partial(self):
+        self._connect()
+        self._server.sendall(b'fi')
+        assert wait_for(lambda: self._connection.read_lines() or
+                        self._connection._receive_buffer) == b'fi'
+        self._server.sendall(b'rst\nsec')
+        assert self._read_lines() == ['first']
+        self._server.sendall(b'ond\n')
+        assert self._read_lines() == ['second']
+
+    def test_read_lines_skips_empty(self):
+        self._connect()
+        self._server.sendall(b'\n\nline\n')
+        assert self._read_lines() == ['line']
+
+    def test_remote_close(self):
+        self._connect()
+        self._server.close()
+        self._server = None
+        assert wait_for(lambda: not self._connection.read_lines() and
+                        not self._connection.is_connected())
+        assert self._backoff.failures == 1
@@ -0,0 +1,88 @@
+"""This module tests the json_helper module.
+
+    Packages(s) required:
+    - pytest
+
+"""
+
+# Imports
+import pytest
+import json
+import json_helper
+import target
+
+json_helper.register_schema(target.Target, target.Target.FIELDS)
+
+
+class Reading(object):
+    """Telemetry values, encoded by walking the object's dictionary."""
+
+    def __init__(self, gyro_angle, history, extra):
+        self.gyro_angle = gyro_angle
+        self.history = history
+        self.extra = extra
+
+
+class RegisteredReading(Reading):
+    """The same telemetry values, encoded with a registered schema."""
+
+
+json_helper.register_schema(RegisteredReading,
+                            ('gyro_angle', 'history', 'extra'))
+
+
+def walk(obj):
+    """Encode an object the way the recursive walker does."""
+    return json.dumps(json_helper._serialize(obj))
+
+
+def fast(obj):
+    """Encode an object with the registered schema, both ways it's written."""
+    text = json_helper.to_json(obj)
+    buf = bytearray()
+    json_helper.write_json(obj, buf, '')
+    assert buf.decode('ascii') == text
+    return text
+
+
+def target_fields(trg):
+    """Return the dictionary an unslotted Target would have had."""
+    return dict((field, getattr(trg, field)) for field in trg.FIELDS)
+
+
+TARGETS = [target.Target(target.Side.LEFT, 12.5, -3.25, True, 0.875, False),
+           target.Target(target.Side.RIGHT, 7, 0.1, False, None, False),
+           target.Target(),
+           target.Target(no_targets=True),
+           target.Target(target.Side.UNKNOWN, 1e-7, float('inf'), None,
+                         float('nan'), False)]
+
+
+class TestSchemaMatchesWalker:
+    """Test that registered schemas write the same text as the walker."""
+
+    @pytest.mark.parametrize('trg', TARGETS)
+    def test_target(self, trg):
+        assert fast(trg) == walk(target_fields(trg))
+
+    def test_target_list(self):
+        expected = walk([target_fields(trg) for trg in TARGETS])
+        assert fast(TARGETS) == expected
+
+    def test_empty_list(self):
+        assert fast([]) == walk([])
+
+    @pytest.mark.parametrize('values', [
+        (12.3, [1.5, None, [2, -0.0, [3.75]]], None),
+        (None, [], {'loop_time': 0.0123, 'states': [1, 2]}),
+        (-0.1, (4.0, None), 'text'),
+        (True, [[], [[None]]], 1234567890123)])
+    def test_telemetry(self, values):
+        walked = walk(Reading(*values))
+        assert fast(RegisteredReading(*values)) == walked
+        assert fast([RegisteredReading(*values)] * 2) == (
+                                        walk([Reading(*values)] * 2))
+
+    def test_walker_used_for_mixed_lists(self):
+        mixed = [TARGETS[0], {'side': 1}]
+        assert fast(mixed) == walk(mixed)
@@ -0,0 +1,8 @@
+drive_time,1.0,1,0.5
+turn,90,0.5,
+unknown_command,1
+turn,90
+shoot,1,2,3,4
+_private
+end
+wait_time,1.0
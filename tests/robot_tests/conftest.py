@@ -0,0 +1,25 @@
+"""Shared fixtures for the robot tests."""
+
+# Imports
+import pytest
+
+
+class FakeClock(object):
+    """A clock that only moves when told to (or when slept on)."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def time(self):
+        return self.now
+
+    def sleep(self, duration):
+        self.sleeps.append(duration)
+        self.now += duration
+
+
+@pytest.fixture
+def clock():
+    """Return a FakeClock for the module under test to read the time from."""
+    return FakeClock()
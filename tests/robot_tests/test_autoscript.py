@@ -61,6 +61,14 @@ class TestAutoScript:
         assert commands[2].command == 'cmd3'
         assert commands[2].parameters == [1.0,'abc',2]
 
+    def test_parse_zero(self, tmpdir):
+        script = tmpdir.join('zero.as')
+        script.write('aim_at_target,0\nwait_time,0.0\n')
+        a = autoscript.AutoScript()
+        commands = a.parse(str(script))
+        assert commands[0].parameters == [0]
+        assert commands[1].parameters == [0.0]
+
     def test_parse_file_not_found(self):
         a = autoscript.AutoScript(os.path.realpath('test_asdfd.as'))
         assert a._commands == None
@@ -137,3 +145,346 @@ class TestAutoScript:
         assert c3 != None
         assert c4 == None
 
+
+class Driver(object):
+    """Owner of autoscript commands used for compiling."""
+
+    def __init__(self):
+        self.calls = []
+        self.resets = 0
+
+    def reset_and_start_timer(self):
+        self.resets += 1
+
+    def drive_time(self, duration, direction, speed):
+        self.calls.append(('drive_time', duration, direction, speed))
+        return True
+
+    def turn(self, angle, speed=1.0):
+        self.calls.append(('turn', angle, speed))
+        return True
+
+    def _private(self):
+        return True
+
+
+class Shooter(object):
+    """Second owner of autoscript commands used for compiling."""
+
+    def shoot(self, power, *extra):
+        return True
+
+    def turn(self, angle, speed):
+        return False
+
+
+class TestAutoScriptCompile:
+    """Test compiling an AutoScript into an AutoScriptPlan."""
+
+    def setup_method(self, method):
+        """Setup each test."""
+        self._driver = Driver()
+        self._shooter = Shooter()
+        self._as = autoscript.AutoScript(os.path.realpath('test3.as'))
+        self._plan = self._as.compile([self._driver, None, self._shooter])
+
+    def test_steps(self):
+        commands = [step.command for step in self._plan.steps]
+        assert commands == ['drive_time', 'turn', 'turn', 'shoot']
+
+    def test_methods_are_bound_to_first_owner(self):
+        assert self._plan.steps[1].method == self._driver.turn
+        assert self._plan.steps[3].method == self._shooter.shoot
+
+    def test_trailing_empty_parameters_dropped(self):
+        assert self._plan.steps[1].parameters == (90, 0.5)
+        assert self._plan.steps[2].parameters == (90,)
+
+    def test_reset_hook(self):
+        assert self._plan.steps[0].reset == self._driver.reset_and_start_timer
+        assert self._plan.steps[1].reset == None
+        self._plan.steps[0].start()
+        assert self._driver.resets == 1
+
+    def test_run(self):
+        assert self._plan.steps[0].run() == True
+        assert self._driver.calls == [('drive_time', 1.0, 1, 0.5)]
+
+    def test_errors(self):
+        assert len(self._plan.errors) == 2
+        assert "unknown command 'unknown_command'" in self._plan.errors[0]
+        assert "unknown command '_private'" in self._plan.errors[1]
+
+    def test_stops_at_end(self):
+        commands = [step.command for step in self._plan.steps]
+        assert 'wait_time' not in commands
+
+    def test_all_unknown(self):
+        a = autoscript.AutoScript(os.path.realpath('test1.as'))
+        plan = a.compile([self._driver])
+        assert plan.steps == []
+        assert len(plan.errors) == 3
+
+    def test_arity_mismatch_reported(self):
+        class Owner(object):
+            def cmd1(self, a):
+                return True
+        a = autoscript.AutoScript(os.path.realpath('test1.as'))
+        plan = a.compile([Owner()])
+        assert plan.errors[0] == "Command 1: 'cmd1' expects 1 parameters, got 3"
+
+    def test_missing_reset(self):
+        class Owner(object):
+            def drive_time(self, duration, direction, speed):
+                return True
+        plan = self._as.compile([Owner(), self._driver, self._shooter])
+        assert plan.steps[0].command == 'turn'
+        assert "'drive_time' has no reset_and_start_timer" in plan.errors[0]
+
+    def test_get_next_step(self):
+        steps = [self._plan.get_next_step() for i in range(5)]
+        assert steps[:4] == self._plan.steps
+        assert steps[4] == None
+        self._plan.restart()
+        assert self._plan.get_next_step() == self._plan.steps[0]
+
+    def test_compile_without_parse(self):
+        plan = autoscript.AutoScript().compile([self._driver])
+        assert plan.steps == []
+        assert plan.errors == []
+
+
+class TestAutoScriptLibrary:
+    """Test the AutoScriptLibrary class."""
+
+    def setup_method(self, method):
+        """Setup each test."""
+        self._driver = Driver()
+
+    def _write(self, tmpdir, name, text, mtime):
+        script = tmpdir.join(name)
+        script.write(text)
+        os.utime(str(script), (mtime, mtime))
+        return os.path.realpath(str(script))
+
+    def test_refresh_compiles_all(self, tmpdir):
+        a = self._write(tmpdir, 'a.as', 'turn,90\n', 1000)
+        b = self._write(tmpdir, 'b.as', 'bogus\n', 1000)
+        lib = autoscript.AutoScriptLibrary(str(tmpdir), [self._driver])
+        assert lib.refresh() == [a, b]
+        assert lib.get_filenames() == [a, b]
+        assert [s.command for s in lib.get_plan(a).steps] == ['turn']
+        assert len(lib.get_plan(b).errors) == 1
+
+    def test_refresh_only_changed(self, tmpdir):
+        a = self._write(tmpdir, 'a.as', 'turn,90\n', 1000)
+        b = self._write(tmpdir, 'b.as', 'turn,45\n', 1000)
+        lib = autoscript.AutoScriptLibrary(str(tmpdir), [self._driver])
+        lib.refresh()
+        plan_a = lib.get_plan(a)
+        assert lib.refresh() == []
+        self._write(tmpdir, 'b.as', 'turn,30\nturn,60\n', 2000)
+        assert lib.refresh() == [b]
+        assert lib.get_plan(a) is plan_a
+        assert len(lib.get_plan(b).steps) == 2
+
+    def test_refresh_removed(self, tmpdir):
+        a = self._write(tmpdir, 'a.as', 'turn,90\n', 1000)
+        lib = autoscript.AutoScriptLibrary(str(tmpdir), [self._driver])
+        lib.refresh()
+        tmpdir.join('a.as').remove()
+        assert lib.refresh() == []
+        assert lib.get_filenames() == []
+        assert lib.get_plan(a) == None
+
+    def test_get_plan_restarts(self, tmpdir):
+        a = self._write(tmpdir, 'a.as', 'turn,90\n', 1000)
+        lib = autoscript.AutoScriptLibrary(str(tmpdir), [self._driver])
+        lib.refresh()
+        plan = lib.get_plan(a)
+        assert plan.get_next_step() != None
+        assert plan.get_next_step() == None
+        plan = lib.get_plan(a)
+        assert plan.get_next_step() != None
+
+    def test_get_plan_unknown(self, tmpdir):
+        lib = autoscript.AutoScriptLibrary(str(tmpdir), [self._driver])
+        assert lib.get_plan('nothing.as') == None
+
+
+class Feeder(object):
+    """Owner of timed autoscript commands used for compiling groups."""
+
+    def __init__(self):
+        self.runs = 0
+        self.resets = 0
+
+    def reset_and_start_timer(self):
+        self.resets += 1
+
+    def feed_time(self, duration):
+        self.runs += 1
+        return self.runs >= duration
+
+    def feed_forever(self):
+        return False
+
+    def wait_time(self, duration):
+        return True
+
+
+class TestAutoScriptGroups:
+    """Test compiling and running groups of concurrent commands."""
+
+    def setup_method(self, method):
+        """Setup each test."""
+        self._driver = Driver()
+        self._feeder = Feeder()
+        self._stopped = []
+        self._subsystems = {self._driver: 'drive', self._feeder: 'feed'}
+        self._stop_hooks = {'drive': lambda: self._stopped.append('drive'),
+                            'feed': lambda: self._stopped.append('feed')}
+
+    def _compile(self, tmpdir, text, requirements=None):
+        script = tmpdir.join('group.as')
+        script.write(text)
+        a = autoscript.AutoScript(str(script))
+        return a.compile([self._driver, self._feeder],
+                         subsystems=self._subsystems,
+                         requirements=requirements,
+                         stop_hooks=self._stop_hooks)
+
+    def test_group_all(self, tmpdir):
+        plan = self._compile(tmpdir, 'group_all\nturn,90\nfeed_time,2\n'
+                                     'end_group\nturn,45\n')
+        assert plan.errors == []
+        assert len(plan.steps) == 2
+        group = plan.steps[0]
+        assert isinstance(group, autoscript.GroupStep)
+        assert group.wait_for_all == True
+        assert [m.command for m in group.members] == ['turn', 'feed_time']
+        assert group.requirements == ('drive', 'feed')
+        group.start()
+        assert self._feeder.resets == 1
+        assert group.run() == False
+        assert group.run() == True
+        assert self._driver.calls == [('turn', 90, 1.0)]
+        assert self._stopped == []
+
+    def test_group_any_stops_unfinished(self, tmpdir):
+        plan = self._compile(tmpdir, 'group_any\nturn,90\nfeed_forever\n'
+                                     'end_group\n')
+        group = plan.steps[0]
+        assert group.wait_for_all == False
+        group.start()
+        assert group.run() == True
+        assert self._stopped == ['feed']
+
+    def test_subsystem_conflict(self, tmpdir):
+        plan = self._compile(tmpdir, 'group_all\nturn,90\ndrive_time,1,1,1\n'
+                                     'end_group\nturn,45\n')
+        assert [s.command for s in plan.steps] == ['turn']
+        assert plan.errors == ["Command 1: 'turn' and 'drive_time' both use "
+                               "the drive"]
+
+    def test_requirements_override(self, tmpdir):
+        plan = self._compile(tmpdir, 'group_all\nturn,90\nfeed_time,2\n'
+                                     'end_group\n',
+                             requirements={'turn': ('feed',)})
+        assert plan.steps == []
+        assert "both use the feed" in plan.errors[0]
+
+    def test_timer_conflict(self, tmpdir):
+        self._subsystems = {}
+        plan = self._compile(tmpdir, 'group_all\nfeed_time,2\nwait_time,1\n'
+                                     'end_group\n')
+        assert plan.steps == []
+        assert "share a timer" in plan.errors[0]
+
+    def test_nested_group(self, tmpdir):
+        plan = self._compile(tmpdir, 'group_all\ngroup_any\nturn,90\n'
+                                     'end_group\n')
+        assert "can't be nested" in plan.errors[0]
+        assert len(plan.steps) == 1
+
+    def test_end_group_without_group(self, tmpdir):
+        plan = self._compile(tmpdir, 'turn,90\nend_group\n')
+        assert len(plan.steps) == 1
+        assert "'end_group' without a group" in plan.errors[0]
+
+    def test_unterminated_group(self, tmpdir):
+        plan = self._compile(tmpdir, 'group_all\nturn,90\n')
+        assert plan.steps == []
+        assert "'group_all' has no 'end_group'" in plan.errors[0]
+
+    def test_unknown_member(self, tmpdir):
+        plan = self._compile(tmpdir, 'group_all\nturn,90\nbogus\n'
+                                     'end_group\n')
+        assert len(plan.steps) == 1
+        assert [m.command for m in plan.steps[0].members] == ['turn']
+        assert "unknown command 'bogus'" in plan.errors[0]
+
+    def test_step_stop_hooks(self, tmpdir):
+        plan = self._compile(tmpdir, 'turn,90\n')
+        assert plan.steps[0].requirements == ('drive',)
+        plan.steps[0].stop()
+        assert self._stopped == ['drive']
+
+
+class Arm(object):
+    """Owner of an autoscript command written as a routine."""
+
+    def __init__(self):
+        self.ticks = 0
+        self.closed = False
+
+    def raise_arm(self, ticks):
+        try:
+            for i in range(ticks):
+                self.ticks += 1
+                yield
+        finally:
+            self.closed = True
+
+
+class TestAutoScriptRoutines:
+    """Test running commands that are generator functions."""
+
+    def setup_method(self, method):
+        """Setup each test."""
+        self._arm = Arm()
+
+    def _compile(self, tmpdir, text):
+        script = tmpdir.join('routine.as')
+        script.write(text)
+        a = autoscript.AutoScript(str(script))
+        return a.compile([self._arm])
+
+    def test_routine_runs_until_finished(self, tmpdir):
+        plan = self._compile(tmpdir, 'raise_arm,2\n')
+        assert plan.errors == []
+        step = plan.get_next_step()
+        step.start()
+        assert step.run() == False
+        assert step.run() == False
+        assert step.run() == True
+        assert self._arm.ticks == 2
+
+    def test_routine_restarts(self, tmpdir):
+        plan = self._compile(tmpdir, 'raise_arm,1\n')
+        step = plan.get_next_step()
+        step.start()
+        assert step.run() == False
+        step.start()
+        assert step.run() == False
+        assert step.run() == True
+        assert self._arm.ticks == 2
+
+    def test_stop_closes_routine(self, tmpdir):
+        plan = self._compile(tmpdir, 'raise_arm,5\n')
+        step = plan.get_next_step()
+        step.start()
+        step.run()
+        step.stop()
+        assert self._arm.closed == True
+        assert self._arm.ticks == 1
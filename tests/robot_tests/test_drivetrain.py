@@ -0,0 +1,102 @@
+"""This module tests the drivetrain module.
+
+    Packages(s) required:
+    - pytest
+
+"""
+
+# Imports
+import pytest
+import os
+import common
+import drivetrain
+import sensorsampler
+
+PARAMETERS_FILE = os.path.join(os.path.dirname(__file__), '..', '..',
+                               'parameter_files', 'drivetrain.par')
+
+
+class FakeRobotDrive:
+    """A robot drive that records what it's told to do."""
+
+    def __init__(self):
+        self.arcade = []
+        self.tank = []
+
+    def ArcadeDrive(self, linear, turn, squared):
+        self.arcade.append((linear, turn))
+
+    def TankDrive(self, left, right, squared):
+        self.tank.append((left, right))
+
+
+class TestDriveTrain:
+    """Test the DriveTrain class."""
+
+    def setup_method(self, method):
+        """Setup each test."""
+        self._drive_train = drivetrain.DriveTrain(PARAMETERS_FILE)
+        self._robot_drive = FakeRobotDrive()
+        self._drive_train._robot_drive = self._robot_drive
+
+    def teardown_method(self, method):
+        """Clean up after each test."""
+        self._drive_train.dispose()
+
+    def _start_brake(self):
+        """Start a drive_to_range brake."""
+        self._drive_train._stop_action.start(10.0)
+
+    def test_reset_and_start_timer_ends_brake(self):
+        self._start_brake()
+        self._drive_train.reset_and_start_timer()
+        assert not self._drive_train._stop_action.is_started()
+
+    def test_set_robot_state_ends_brake(self):
+        self._start_brake()
+        self._drive_train.set_robot_state(common.ProgramState.TELEOP)
+        assert not self._drive_train._stop_action.is_started()
+
+    def test_arcade_drive_ends_brake(self):
+        self._start_brake()
+        self._drive_train.arcade_drive(0.5, 0.0, False)
+        assert not self._drive_train._stop_action.is_started()
+        assert self._robot_drive.arcade == [(0.5, 0.0)]
+
+    def test_tank_drive_ends_brake(self):
+        self._start_brake()
+        self._drive_train.tank_drive(0.5, 0.5, False)
+        assert not self._drive_train._stop_action.is_started()
+        assert self._robot_drive.tank == [(0.5, 0.5)]
+
+    def test_register_sensors(self):
+        sampler = sensorsampler.SensorSampler()
+        self._drive_train.register_sensors(sampler)
+        assert sampler.get_buffer('gyro_angle') is not None
+        assert sampler.get_buffer('acceleration') is not None
+        assert sampler.get_buffer('range') is None
+
+    def test_reset_sensors(self):
+        self._drive_train._gyro_angle = 45.0
+        self._drive_train.reset_sensors()
+        assert self._drive_train.get_heading() == 0.0
+
+    def test_directional_drive_forward_right(self):
+        # drivetrain.par drives forward with negative speeds
+        self._drive_train.directional_drive(0.5, 0.2)
+        assert self._robot_drive.arcade == [(-0.5, 0.2)]
+
+    def test_directional_drive_backward_left(self):
+        self._drive_train.directional_drive(-0.3, -0.2)
+        assert self._robot_drive.arcade == [(0.3, -0.2)]
+
+    def test_directional_drive_ends_brake(self):
+        self._start_brake()
+        self._drive_train.directional_drive(0.0, 0.0)
+        assert not self._drive_train._stop_action.is_started()
+        assert self._robot_drive.arcade == [(0.0, 0.0)]
+
+    def test_directional_drive_without_robot_drive(self):
+        self._drive_train._robot_drive = None
+        self._drive_train.directional_drive(0.5, 0.2)
+        assert self._robot_drive.arcade == []
@@ -0,0 +1,63 @@
+"""This module tests the lcdbuffer module.
+
+    Packages(s) required:
+    - pytest
+
+"""
+
+# Imports
+import pytest
+import lcdbuffer
+
+
+class TestLCDBuffer:
+    """Test the LCDBuffer class."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, clock):
+        """Setup each test."""
+        self._clock = clock
+        self._lcd = lcdbuffer.LCDBuffer(3, 10, self._clock.time)
+
+    def test_first_changes_are_every_line(self):
+        assert self._lcd.get_changes() == [(0, ' ' * 10), (1, ' ' * 10),
+                                           (2, ' ' * 10)]
+        assert self._lcd.get_changes() == []
+
+    def test_only_changed_lines(self):
+        self._lcd.get_changes()
+        self._lcd.write(1, 'Range: 5.0')
+        assert self._lcd.get_changes() == [(1, 'Range: 5.0')]
+        self._lcd.write(1, 'Range: 5.0')
+        assert self._lcd.get_changes() == []
+
+    def test_long_text_is_cut(self):
+        self._lcd.write(0, 'A very long line of text')
+        assert self._lcd.get_line(0) == 'A very lon'
+
+    def test_priority(self):
+        self._lcd.write(0, 'Range', 0)
+        self._lcd.write(0, 'Swapped', 1)
+        self._lcd.write(0, 'Range 2', 0)
+        assert self._lcd.get_lines() == ['Swapped', '', '']
+
+    def test_hold_expires(self):
+        self._lcd.write(0, 'Range', 0)
+        self._lcd.write(0, 'Power', 1, 3.0)
+        self._lcd.get_changes()
+        self._clock.now += 2.9
+        assert self._lcd.get_changes() == []
+        self._clock.now += 0.1
+        assert self._lcd.get_changes() == [(0, 'Range     ')]
+        assert self._lcd.get_line(0) == 'Range'
+
+    def test_clear(self):
+        self._lcd.write(0, 'Range', 0)
+        self._lcd.write(0, 'Power', 1)
+        self._lcd.write(2, 'More', 1)
+        self._lcd.clear(1)
+        assert self._lcd.get_lines() == ['Range', '', '']
+
+    def test_line_out_of_range(self):
+        self._lcd.write(3, 'Nowhere')
+        assert self._lcd.get_lines() == ['', '', '']
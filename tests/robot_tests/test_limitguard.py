@@ -0,0 +1,174 @@
+"""This module tests the limitguard module.
+
+    Packages(s) required:
+    - pytest
+
+"""
+
+# Imports
+import pytest
+import limitguard
+import motorgroup
+import time
+
+
+class FakeEncoder:
+    """An encoder that reports whatever position it's given."""
+
+    def __init__(self):
+        self.position = 0
+        self.fail = False
+
+    def Get(self):
+        if self.fail:
+            raise IOError("encoder read failed")
+        return self.position
+
+
+class FakeController:
+    """A motor controller that records what it's set to."""
+
+    def __init__(self):
+        self.values = []
+
+    def Set(self, value, sync_group):
+        self.values.append(value)
+
+
+class TestLimitGuard:
+    """Test the LimitGuard class."""
+
+    def setup_method(self, method):
+        """Setup each test."""
+        self._encoder = FakeEncoder()
+        self._controller = FakeController()
+        self._motors = motorgroup.MotorGroup(0)
+        self._motors.add_motor(self._controller, 1.0)
+        self._guard = limitguard.LimitGuard(self._encoder.Get, self._motors,
+                                            1000, 100, -1.0, 0.001)
+
+    def test_inside_limits(self):
+        self._encoder.position = 500
+        self._motors.set(-0.5)
+        self._guard.check()
+        assert not self._guard.is_tripped()
+        assert self._guard.trips == 0
+        assert self._controller.values == [-0.5]
+
+    def test_max_limit_stops_motors(self):
+        self._motors.set(-0.5)
+        self._encoder.position = 1010
+        self._guard.check()
+        assert self._guard.is_tripped()
+        assert self._guard.trips == 1
+        assert self._controller.values == [-0.5, 0.0]
+        assert self._motors.get_inhibited() == -1
+
+    def test_min_limit_stops_motors(self):
+        self._motors.set(0.5)
+        self._encoder.position = 90
+        self._guard.check()
+        assert self._guard.trips == 1
+        assert self._controller.values == [0.5, 0.0]
+        assert self._motors.get_inhibited() == 1
+
+    def test_can_move_back_inside(self):
+        self._encoder.position = 1010
+        self._guard.check()
+        self._motors.set(0.5)
+        assert self._controller.values == [0.5]
+
+    def test_overshoot_recorded(self):
+        self._encoder.position = 1010
+        self._guard.check()
+        self._encoder.position = 1025
+        self._guard.check()
+        self._encoder.position = 1020
+        self._guard.check()
+        assert self._guard.trips == 1
+        assert self._guard.last_overshoot == 25
+        assert self._guard.max_overshoot == 25
+        self._encoder.position = 500
+        self._guard.check()
+        self._encoder.position = 1005
+        self._guard.check()
+        assert self._guard.trips == 2
+        assert self._guard.last_overshoot == 5
+        assert self._guard.max_overshoot == 25
+
+    def test_released_inside_limits(self):
+        self._encoder.position = 1010
+        self._guard.check()
+        self._encoder.position = 900
+        self._guard.check()
+        assert not self._guard.is_tripped()
+        assert self._motors.get_inhibited() == 0
+
+    def test_disabled(self):
+        self._guard.set_enabled(False)
+        self._motors.set(-0.5)
+        self._encoder.position = 1010
+        self._guard.check()
+        assert not self._guard.is_enabled()
+        assert self._guard.trips == 0
+        assert self._controller.values == [-0.5]
+
+    def test_disable_releases_inhibit(self):
+        self._encoder.position = 1010
+        self._guard.check()
+        self._guard.set_enabled(False)
+        assert self._motors.get_inhibited() == 0
+        self._motors.set(-0.5)
+        assert self._controller.values == [-0.5]
+
+    def test_negative_min_limit_stops_motors(self):
+        guard = limitguard.LimitGuard(self._encoder.Get, self._motors,
+                                      610, -10, -1.0)
+        self._encoder.position = -5
+        guard.check()
+        assert not guard.is_tripped()
+        self._motors.set(0.5)
+        self._encoder.position = -20
+        guard.check()
+        assert guard.trips == 1
+        assert guard.last_overshoot == 10
+        assert self._controller.values == [0.5, 0.0]
+        assert self._motors.get_inhibited() == 1
+        # Moving down is inhibited, moving back up isn't
+        self._motors.set(0.3)
+        self._motors.set(-0.3)
+        assert self._controller.values == [0.5, 0.0, 0.0, -0.3]
+
+    def test_zero_min_limit(self):
+        guard = limitguard.LimitGuard(self._encoder.Get, self._motors,
+                                      1000, 0)
+        self._encoder.position = -5
+        guard.check()
+        assert guard.trips == 1
+
+    def test_no_limits(self):
+        guard = limitguard.LimitGuard(self._encoder.Get, self._motors,
+                                      0, None)
+        self._encoder.position = -50
+        guard.check()
+        self._encoder.position = 5000
+        guard.check()
+        assert guard.trips == 0
+
+    def test_read_errors_counted(self):
+        self._encoder.fail = True
+        self._guard.check()
+        assert self._guard.errors == 1
+        assert self._guard.trips == 0
+
+    def test_thread(self):
+        self._motors.set(-0.5)
+        self._encoder.position = 1010
+        self._guard.start()
+        deadline = time.time() + 1.0
+        while not self._guard.is_tripped() and time.time() < deadline:
+            time.sleep(0.001)
+        self._guard.stop()
+        self._guard.join(1.0)
+        assert not self._guard.is_alive()
+        assert self._guard.trips == 1
@@ -0,0 +1,103 @@
+"""This module tests the loopprofiler module.
+
+    Packages(s) required:
+    - pytest
+
+"""
+
+# Imports
+import os
+import pstats
+import pytest
+import loopprofiler
+
+
+def busy_work():
+    return sum(range(100))
+
+
+class TestLoopProfiler:
+    """Test the LoopProfiler class."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, clock):
+        """Setup each test."""
+        self._clock = clock
+
+    def _create(self, tmpdir, iterations=3):
+        self._flag = str(tmpdir.join('profile'))
+        return loopprofiler.LoopProfiler(iterations, self._flag,
+                                         str(tmpdir), 1.0, self._clock.time)
+
+    def test_constructor(self, tmpdir):
+        lp = self._create(tmpdir)
+        assert lp.armed == False
+        assert lp.last_filename == None
+        assert lp.is_available() == True
+
+    def test_not_armed_does_nothing(self, tmpdir):
+        lp = self._create(tmpdir)
+        lp.begin()
+        assert lp.end() == None
+        assert tmpdir.listdir() == []
+
+    def test_profiles_n_iterations(self, tmpdir):
+        lp = self._create(tmpdir)
+        assert lp.arm() == True
+        for i in range(2):
+            lp.begin()
+            busy_work()
+            assert lp.end('teleop') == None
+            assert lp.armed == True
+        lp.begin()
+        busy_work()
+        filename = lp.end('teleop')
+        assert lp.armed == False
+        assert filename == lp.last_filename
+        assert os.path.basename(filename).startswith('profile_teleop_')
+        assert os.path.exists(filename[:-4] + '.prof')
+        with open(filename) as report:
+            text = report.read()
+        assert 'busy_work' in text
+        stats = pstats.Stats(filename[:-4] + '.prof').stats
+        calls = [value[1] for key, value in stats.items()
+                 if key[2] == 'busy_work']
+        assert calls == [3]
+
+    def test_arm_iterations(self, tmpdir):
+        lp = self._create(tmpdir)
+        lp.arm(1)
+        lp.begin()
+        assert lp.end() != None
+
+    def test_arm_twice(self, tmpdir):
+        lp = self._create(tmpdir)
+        assert lp.arm() == True
+        assert lp.arm() == False
+
+    def test_flag_file(self, tmpdir):
+        lp = self._create(tmpdir)
+        tmpdir.join('profile').write('2')
+        assert lp.check_flag_file() == True
+        assert lp.armed == True
+        assert not os.path.exists(self._flag)
+        lp.begin()
+        assert lp.end() == None
+        lp.begin()
+        assert lp.end() != None
+
+    def test_empty_flag_file_uses_default(self, tmpdir):
+        lp = self._create(tmpdir, iterations=1)
+        tmpdir.join('profile').write('')
+        assert lp.check_flag_file() == True
+        lp.begin()
+        assert lp.end() != None
+
+    def test_flag_file_check_is_throttled(self, tmpdir):
+        lp = self._create(tmpdir)
+        assert lp.check_flag_file() == False
+        tmpdir.join('profile').write('')
+        self._clock.now += 0.5
+        assert lp.check_flag_file() == False
+        self._clock.now += 0.5
+        assert lp.check_flag_file() == True
@@ -0,0 +1,100 @@
+"""This module tests the looptimer module.
+
+    Packages(s) required:
+    - pytest
+
+"""
+
+# Imports
+import pytest
+import looptimer
+
+
+class TestLoopTimer:
+    """Test the LoopTimer class."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, clock):
+        """Setup each test."""
+        self._clock = clock
+        self._lt = looptimer.LoopTimer(0.01, self._clock.sleep,
+                                       self._clock.time)
+
+    def test_constructor(self):
+        assert self._lt.period == 0.01
+        assert self._lt.iterations == 0
+        assert self._lt.overruns == 0
+        assert self._lt.loop_time == None
+        assert self._lt.body_time == None
+        assert self._lt.get_rate() == None
+        assert self._lt.get_mean_jitter() == None
+
+    def test_wait_subtracts_body_time(self):
+        self._clock.now += 0.004
+        assert self._lt.wait() == True
+        assert self._clock.sleeps[-1] == pytest.approx(0.006)
+        assert self._lt.body_time == pytest.approx(0.004)
+        assert self._lt.loop_time == pytest.approx(0.01)
+
+    def test_period_does_not_drift(self):
+        for body in [0.001, 0.007, 0.003, 0.009, 0.0]:
+            self._clock.now += body
+            self._lt.wait()
+        assert self._clock.now == pytest.approx(0.05)
+        assert self._lt.iterations == 5
+        assert self._lt.overruns == 0
+        assert self._lt.get_rate() == pytest.approx(100.0)
+
+    def test_overrun(self):
+        self._clock.now += 0.025
+        assert self._lt.wait() == False
+        assert self._lt.overruns == 1
+        assert self._lt.loop_time == pytest.approx(0.025)
+        assert self._clock.sleeps == []
+        assert self._lt.blocked == 1
+        assert self._lt.blocked_last == True
+        assert self._lt.max_body_time == pytest.approx(0.025)
+
+    def test_late_overrun_is_not_blocked(self):
+        def late_sleep(duration):
+            self._clock.now += duration + 0.008
+        self._lt = looptimer.LoopTimer(0.01, late_sleep, self._clock.time)
+        self._lt.wait()
+        self._clock.now += 0.003
+        assert self._lt.wait() == False
+        assert self._lt.overruns == 1
+        assert self._lt.blocked == 0
+        assert self._lt.blocked_last == False
+
+    def test_overrun_restarts_schedule(self):
+        self._clock.now += 0.025
+        self._lt.wait()
+        self._clock.now += 0.002
+        assert self._lt.wait() == True
+        assert self._clock.sleeps[-1] == pytest.approx(0.008)
+        assert self._clock.now == pytest.approx(0.035)
+
+    def test_jitter(self):
+        def late_sleep(duration):
+            self._clock.now += duration + 0.001
+        self._lt = looptimer.LoopTimer(0.01, late_sleep, self._clock.time)
+        self._lt.wait()
+        self._lt.wait()
+        assert self._lt.max_jitter == pytest.approx(0.001)
+        assert self._lt.get_mean_jitter() == pytest.approx(0.001)
+        assert self._lt.loop_time == pytest.approx(0.01)
+
+    def test_start_clears_statistics(self):
+        self._clock.now += 0.025
+        self._lt.wait()
+        self._lt.start()
+        assert self._lt.iterations == 0
+        assert self._lt.overruns == 0
+        assert self._lt.loop_time == None
+
+    def test_summary(self):
+        self._lt.wait()
+        summary = self._lt.get_summary()
+        assert "1 loops" in summary
+        assert "0 overruns" in summary
+        assert "0 blocked" in summary
@@ -0,0 +1,74 @@
+"""This module tests the motionprofile module.
+
+    Packages(s) required:
+    - pytest
+
+"""
+
+# Imports
+import pytest
+import motionprofile
+
+
+class TestTrapezoidalProfile:
+    """Test the TrapezoidalProfile class."""
+
+    def setup_method(self, method):
+        """Setup each test."""
+        self._profile = motionprofile.TrapezoidalProfile(10.0, 2.0, 1.0)
+
+    def test_duration(self):
+        # 2s to accelerate, 2s to decelerate, and 6ft to cruise at 2ft/s
+        assert self._profile.duration == pytest.approx(7.0)
+
+    def test_acceleration(self):
+        assert self._profile.get_setpoint(0.0) == (0.0, 0.0)
+        position, velocity = self._profile.get_setpoint(1.0)
+        assert position == pytest.approx(0.5)
+        assert velocity == pytest.approx(1.0)
+
+    def test_cruise(self):
+        position, velocity = self._profile.get_setpoint(3.0)
+        assert position == pytest.approx(4.0)
+        assert velocity == pytest.approx(2.0)
+
+    def test_deceleration(self):
+        position, velocity = self._profile.get_setpoint(6.0)
+        assert position == pytest.approx(9.5)
+        assert velocity == pytest.approx(1.0)
+
+    def test_finished(self):
+        assert not self._profile.is_finished(6.9)
+        assert self._profile.is_finished(7.0)
+        assert self._profile.get_setpoint(8.0) == (10.0, 0.0)
+
+    def test_never_exceeds_limits(self):
+        previous_velocity = 0.0
+        for i in range(71):
+            position, velocity = self._profile.get_setpoint(i * 0.1)
+            assert velocity <= 2.0 + 1e-9
+            assert abs(velocity - previous_velocity) <= 0.1 + 1e-9
+            previous_velocity = velocity
+
+    def test_short_move(self):
+        # Too short to reach the maximum velocity
+        p = motionprofile.TrapezoidalProfile(1.0, 2.0, 1.0)
+        assert p.duration == pytest.approx(2.0)
+        position, velocity = p.get_setpoint(1.0)
+        assert position == pytest.approx(0.5)
+        assert velocity == pytest.approx(1.0)
+
+    def test_backward(self):
+        p = motionprofile.TrapezoidalProfile(-10.0, 2.0, 1.0)
+        assert p.duration == pytest.approx(7.0)
+        position, velocity = p.get_setpoint(3.0)
+        assert position == pytest.approx(-4.0)
+        assert velocity == pytest.approx(-2.0)
+
+    def test_empty_move(self):
+        p = motionprofile.TrapezoidalProfile(0.0, 2.0, 1.0)
+        assert p.duration == 0.0
+        assert p.is_finished(0.0)
+        p = motionprofile.TrapezoidalProfile(5.0, 0.0, 1.0)
+        assert p.get_setpoint(1.0) == (5.0, 0.0)
+
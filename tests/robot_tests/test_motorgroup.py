@@ -0,0 +1,125 @@
+"""This module tests the motorgroup module.
+
+    Packages(s) required:
+    - pytest
+
+"""
+
+# Imports
+import pytest
+import motorgroup
+
+
+class FakeController:
+    """A motor controller that records what it's set to."""
+
+    def __init__(self):
+        self.values = []
+
+    def Set(self, value, sync_group):
+        self.values.append(value)
+
+
+class TestMotorGroup:
+    """Test the MotorGroup class."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, clock):
+        """Setup each test."""
+        self._clock = clock
+        self._left = FakeController()
+        self._right = FakeController()
+        self._group = motorgroup.MotorGroup(0.1, self._clock.time)
+
+    def test_constructor(self):
+        assert len(self._group) == 0
+        assert not self._group.is_enabled()
+        assert self._group.get_speed() is None
+
+    def test_add_motor(self):
+        assert self._group.add_motor(self._left, -1.0)
+        assert not self._group.add_motor(None, 1.0)
+        assert len(self._group) == 1
+        assert self._group.is_enabled()
+
+    def test_set_applies_inversion(self):
+        self._group.add_motor(self._left, -1.0)
+        self._group.add_motor(self._right, 1.0)
+        self._group.set(0.5)
+        assert self._left.values == [-0.5]
+        assert self._right.values == [0.5]
+        assert self._group.get_speed() == 0.5
+
+    def test_unchanged_speed_not_written(self):
+        self._group.add_motor(self._left)
+        self._group.set(0.5)
+        self._group.set(0.5)
+        self._group.set(0.5)
+        assert self._left.values == [0.5]
+        assert self._group.writes == 1
+        assert self._group.suppressed == 2
+        self._group.set(0.25)
+        assert self._left.values == [0.5, 0.25]
+
+    def test_refresh_period(self):
+        self._group.add_motor(self._left)
+        self._group.set(0.5)
+        self._clock.now = 0.05
+        self._group.set(0.5)
+        assert len(self._left.values) == 1
+        self._clock.now = 0.1
+        self._group.set(0.5)
+        assert len(self._left.values) == 2
+        self._clock.now = 0.15
+        self._group.set(0.5)
+        assert len(self._left.values) == 2
+
+    def test_no_refresh_period(self):
+        group = motorgroup.MotorGroup(0.0, self._clock.time)
+        group.add_motor(self._left)
+        group.set(0.5)
+        group.set(0.5)
+        assert self._left.values == [0.5, 0.5]
+
+    def test_stop(self):
+        self._group.add_motor(self._left)
+        self._group.set(0.5)
+        self._group.stop()
+        self._group.stop()
+        assert self._left.values == [0.5, 0.0]
+
+    def test_invalidate(self):
+        self._group.add_motor(self._left)
+        self._group.set(0.5)
+        self._group.invalidate()
+        assert self._group.get_speed() is None
+        self._group.set(0.5)
+        assert self._left.values == [0.5, 0.5]
+
+    def test_inhibit_stops_moving_motors(self):
+        self._group.add_motor(self._left, 1.0)
+        self._group.set(0.5)
+        assert self._group.inhibit(1)
+        assert self._left.values == [0.5, 0.0]
+        assert self._group.get_inhibited() == 1
+
+    def test_inhibit_other_direction(self):
+        self._group.add_motor(self._left, 1.0)
+        self._group.set(0.5)
+        assert not self._group.inhibit(-1)
+        assert self._left.values == [0.5]
+
+    def test_inhibited_speed_replaced(self):
+        self._group.add_motor(self._left, 1.0)
+        self._group.inhibit(1)
+        self._group.set(0.5)
+        self._group.set(-0.5)
+        assert self._left.values == [0.0, -0.5]
+
+    def test_release_inhibit(self):
+        self._group.add_motor(self._left, 1.0)
+        self._group.inhibit(1)
+        self._group.inhibit(0)
+        self._group.set(0.5)
+        assert self._left.values == [0.5]
+        assert self._group.get_inhibited() == 0
@@ -0,0 +1,119 @@
+"""This module tests the odometry module.
+
+    Packages(s) required:
+    - pytest
+
+"""
+
+# Imports
+import pytest
+import odometry
+
+
+class TestOdometry:
+    """Test the Odometry class."""
+
+    def setup_method(self, method):
+        """Setup each test."""
+        self._od = odometry.Odometry(1.0, 0.25, 5.0)
+
+    def test_constructor(self):
+        assert self._od.get_pose() == (0.0, 0.0, 0.0)
+        assert self._od.get_distance() == 0.0
+        assert self._od.get_velocity() == 0.0
+        assert self._od.get_covariance() == ((0.0, 0.0), (0.0, 0.0))
+
+    def test_constant_acceleration(self):
+        for i in range(100):
+            self._od.predict(2.0, 0.0, 0.01)
+        assert self._od.get_velocity() == pytest.approx(2.0)
+        assert self._od.get_distance() == pytest.approx(1.0)
+        x, y, heading = self._od.get_pose()
+        assert x == pytest.approx(1.0)
+        assert y == pytest.approx(0.0)
+
+    def test_independent_of_step_size(self):
+        fine = odometry.Odometry()
+        for i in range(100):
+            fine.predict(2.0, 0.0, 0.001)
+        for i in range(10):
+            self._od.predict(2.0, 0.0, 0.01)
+        assert fine.get_distance() == pytest.approx(self._od.get_distance())
+
+    def test_heading_moves_pose(self):
+        self._od.predict(2.0, 90.0, 1.0)
+        x, y, heading = self._od.get_pose()
+        assert x == pytest.approx(0.0, abs=1e-9)
+        assert y == pytest.approx(1.0)
+        assert heading == 90.0
+
+    def test_covariance_grows(self):
+        self._od.predict(0.0, 0.0, 0.1)
+        first = self._od.get_covariance()
+        self._od.predict(0.0, 0.0, 0.1)
+        second = self._od.get_covariance()
+        assert second[0][0] > first[0][0]
+        assert second[1][1] > first[1][1]
+
+    def test_range_correction(self):
+        self._od.reset(0.0, 10.0)
+        for i in range(100):
+            self._od.predict(0.0, 0.0, 0.01)
+        assert self._od.get_distance() == 0.0
+        variance = self._od.get_covariance()[0][0]
+        assert self._od.correct_range(8.0) == True
+        assert 0.0 < self._od.get_distance() < 2.0
+        assert self._od.get_covariance()[0][0] < variance
+        for i in range(300):
+            self._od.predict(0.0, 0.0, 0.01)
+            self._od.correct_range(8.0)
+        assert self._od.get_distance() == pytest.approx(2.0, abs=0.2)
+
+    def test_range_ignored_without_reference(self):
+        assert self._od.correct_range(8.0) == False
+
+    def test_range_ignored_after_turning(self):
+        self._od.reset(0.0, 10.0)
+        self._od.predict(0.0, 30.0, 0.1)
+        assert self._od.correct_range(8.0) == False
+
+    def test_range_ignored_while_moving_fast(self):
+        od = odometry.Odometry(1.0, 0.25, 5.0, 1.0)
+        od.reset(0.0, 10.0)
+        for i in range(100):
+            od.predict(2.0, 0.0, 0.01)
+        assert od.get_velocity() > 1.0
+        distance = od.get_distance()
+        assert od.correct_range(8.0) == False
+        assert od.get_distance() == distance
+
+    def test_range_used_while_moving_slowly(self):
+        od = odometry.Odometry(1.0, 0.25, 5.0, 1.0)
+        od.reset(0.0, 10.0)
+        for i in range(100):
+            od.predict(0.5, 0.0, 0.01)
+        assert od.correct_range(9.5) == True
+
+    def test_range_drop_is_forward(self):
+        self._od.reset(0.0, 10.0)
+        self._od.predict(0.0, 0.0, 1.0)
+        self._od.correct_range(9.0)
+        assert self._od.get_distance() > 0.0
+        self._od.reset(0.0, 10.0)
+        self._od.predict(0.0, 0.0, 1.0)
+        self._od.correct_range(11.0)
+        assert self._od.get_distance() < 0.0
+
+    def test_stationary_stops_drift(self):
+        for i in range(10):
+            self._od.predict(0.5, 0.0, 0.01)
+        assert self._od.get_velocity() > 0.0
+        self._od.correct_velocity(0.0, 0.0)
+        assert self._od.get_velocity() == 0.0
+        assert self._od.get_covariance()[1][1] == 0.0
+
+    def test_reset(self):
+        self._od.predict(1.0, 0.0, 1.0)
+        self._od.reset(45.0)
+        assert self._od.get_pose() == (0.0, 0.0, 45.0)
+        assert self._od.get_velocity() == 0.0
@@ -0,0 +1,119 @@
+"""This module tests the phasetimer module.
+
+    Packages(s) required:
+    - pytest
+
+"""
+
+# Imports
+import pytest
+import phasetimer
+
+
+class TestPhaseStatistics:
+    """Test the PhaseStatistics class."""
+
+    def setup_method(self, method):
+        """Setup each test."""
+        self._ps = phasetimer.PhaseStatistics('test', 4, 0.001, 10)
+
+    def test_constructor(self):
+        assert self._ps.name == 'test'
+        assert self._ps.count == 0
+        assert self._ps.maximum == 0.0
+        assert self._ps.get_history() == []
+        assert self._ps.get_histogram() == []
+        assert self._ps.get_percentile(0.5) == None
+
+    def test_ring_buffer_wraps(self):
+        for duration in [0.001, 0.002, 0.003, 0.004, 0.005, 0.006]:
+            self._ps.record(duration)
+        assert self._ps.get_history() == [0.003, 0.004, 0.005, 0.006]
+        assert self._ps.count == 6
+
+    def test_percentiles(self):
+        for i in range(99):
+            self._ps.record(0.0005)
+        self._ps.record(0.0075)
+        assert self._ps.get_percentile(0.5) == pytest.approx(0.001)
+        assert self._ps.get_percentile(0.99) == pytest.approx(0.001)
+        assert self._ps.get_percentile(1.0) == pytest.approx(0.0075)
+        assert self._ps.maximum == 0.0075
+
+    def test_percentile_capped_at_maximum(self):
+        self._ps.record(0.0002)
+        assert self._ps.get_percentile(0.5) == 0.0002
+
+    def test_overflow_bin(self):
+        self._ps.record(1.0)
+        assert self._ps.get_histogram() == [(pytest.approx(0.01), 1)]
+        assert self._ps.get_percentile(0.99) == pytest.approx(0.01)
+
+
+class TestPhaseTimer:
+    """Test the PhaseTimer class."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, clock):
+        """Setup each test."""
+        self._clock = clock
+        self._pt = phasetimer.PhaseTimer(['read', 'write'], 10, 0.001, 50,
+                                         self._clock.time)
+
+    def _run_iteration(self, read, write):
+        self._pt.start()
+        self._clock.now += read
+        self._pt.mark('read')
+        self._clock.now += write
+        self._pt.mark('write')
+        self._pt.finish()
+
+    def test_records_each_phase(self):
+        self._run_iteration(0.002, 0.005)
+        assert self._pt.get_statistics('read').get_history() == \
+               [pytest.approx(0.002)]
+        assert self._pt.get_statistics('write').get_history() == \
+               [pytest.approx(0.005)]
+        assert self._pt.get_statistics('total').get_history() == \
+               [pytest.approx(0.007)]
+
+    def test_phase_marked_twice(self):
+        self._pt.start()
+        self._clock.now += 0.001
+        self._pt.mark('read')
+        self._clock.now += 0.002
+        self._pt.mark('write')
+        self._clock.now += 0.003
+        self._pt.mark('read')
+        self._pt.finish()
+        assert self._pt.get_statistics('read').get_history() == \
+               [pytest.approx(0.004)]
+        assert self._pt.get_statistics('read').count == 1
+
+    def test_finish_without_start(self):
+        self._pt.finish()
+        assert self._pt.get_statistics('total').count == 0
+
+    def test_summary_lines(self):
+        self._run_iteration(0.002, 0.005)
+        lines = self._pt.get_summary_lines()
+        assert len(lines) == 3
+        assert lines[0].startswith('total')
+        assert lines[1].startswith('write')
+        assert lines[2].startswith('read')
+        for line in lines:
+            assert len(line) <= 21
+
+    def test_summary_lines_empty(self):
+        assert self._pt.get_summary_lines() == []
+
+    def test_dump(self, tmpdir):
+        self._run_iteration(0.002, 0.005)
+        self._run_iteration(0.001, 0.003)
+        filename = str(tmpdir.join('timing.txt'))
+        self._pt.dump(filename)
+        with open(filename) as dump:
+            lines = dump.read().splitlines()
+        assert lines[0].startswith('read: count 2')
+        assert 'read,write,total' in lines
+        assert lines[-1] == '0.001000,0.003000,0.004000'
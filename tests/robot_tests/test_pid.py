@@ -0,0 +1,108 @@
+"""This module tests the pid module.
+
+    Packages(s) required:
+    - pytest
+
+"""
+
+# Imports
+import pytest
+import pid
+
+
+class TestPIDController:
+    """Test the PIDController class."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, clock):
+        """Setup each test."""
+        self._clock = clock
+
+    def test_proportional(self):
+        c = pid.PIDController(0.5, clock=self._clock.time)
+        assert c.update(1.0) == 0.5
+        assert c.update(-1.0) == -0.5
+        assert c.update(0.0) == 0.0
+
+    def test_output_limit(self):
+        c = pid.PIDController(2.0, clock=self._clock.time)
+        assert c.update(1.0) == 1.0
+        assert c.update(1.0, 0.3) == 0.3
+        assert c.update(-1.0, 0.3) == -0.3
+
+    def test_feed_forward(self):
+        c = pid.PIDController(0.1, feed_forward=0.2, clock=self._clock.time)
+        assert c.update(1.0) == pytest.approx(0.3)
+        assert c.update(-1.0) == pytest.approx(-0.3)
+        assert c.update(0.0) == 0.0
+
+    def test_derivative_uses_time(self):
+        c = pid.PIDController(0.0, 0.0, 0.1, clock=self._clock.time)
+        # The first update has nothing to compare against
+        assert c.update(1.0) == 0.0
+        self._clock.now = 0.1
+        assert c.update(0.5) == pytest.approx(-0.5)
+        self._clock.now = 0.3
+        assert c.update(0.0) == pytest.approx(-0.25)
+
+    def test_integral_uses_time(self):
+        c = pid.PIDController(0.0, 1.0, clock=self._clock.time)
+        assert c.update(1.0) == 0.0
+        self._clock.now = 0.1
+        assert c.update(1.0) == pytest.approx(0.1)
+        self._clock.now = 0.3
+        assert c.update(1.0) == pytest.approx(0.3)
+
+    def test_explicit_dt(self):
+        c = pid.PIDController(0.0, 1.0, clock=self._clock.time)
+        assert c.update(2.0, dt=0.25) == pytest.approx(0.5)
+
+    def test_integral_limit(self):
+        c = pid.PIDController(0.0, 2.0, integral_limit=0.2,
+                              clock=self._clock.time)
+        for i in range(10):
+            output = c.update(1.0, dt=0.1)
+        assert output == pytest.approx(0.2)
+        # Unwinds as soon as the error changes sign
+        assert c.update(-1.0, dt=0.1) == pytest.approx(0.0)
+
+    def test_no_windup_at_limit(self):
+        c = pid.PIDController(1.0, 1.0, clock=self._clock.time)
+        for i in range(100):
+            c.update(2.0, dt=0.1)
+        # The integral didn't grow while the output was limited
+        assert c.update(0.5, dt=0.1) == pytest.approx(0.55)
+
+    def test_reset_after_pause(self):
+        c = pid.PIDController(0.0, 1.0, 0.1, reset_time=0.5,
+                              clock=self._clock.time)
+        c.update(1.0)
+        self._clock.now = 0.1
+        assert c.update(1.0) == pytest.approx(0.1)
+        self._clock.now = 5.0
+        assert c.update(-1.0) == 0.0
+
+    def test_reset(self):
+        c = pid.PIDController(0.0, 1.0, clock=self._clock.time)
+        c.update(1.0, dt=0.5)
+        c.reset()
+        assert c.update(0.0, dt=0.5) == 0.0
+
+    def test_settles(self):
+        # Drive a simple mechanism whose speed follows the output
+        c = pid.PIDController(4.0, 0.0, 0.2, 0.05, clock=self._clock.time)
+        position = 0.0
+        velocity = 0.0
+        settled = None
+        for i in range(300):
+            self._clock.now = i * 0.01
+            output = c.update(1.0 - position)
+            velocity += (output * 2.0 - velocity) * 0.1
+            position += velocity * 0.01
+            if abs(1.0 - position) < 0.02 and abs(velocity) < 0.05:
+                if settled is None:
+                    settled = i
+            else:
+                settled = None
+        assert settled is not None
+        assert settled < 200
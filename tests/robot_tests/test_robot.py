@@ -0,0 +1,166 @@
+"""This module tests the robot module.
+
+    Packages(s) required:
+    - pytest
+
+"""
+
+# Imports
+import pytest
+import os
+import lcdbuffer
+import robot
+import target
+import userinterface
+
+PARAMETERS_FILE = os.path.join(os.path.dirname(__file__), '..', '..',
+                               'parameter_files', 'robot.par')
+UI_PARAMETERS_FILE = os.path.join(os.path.dirname(__file__), '..', '..',
+                                  'parameter_files', 'userinterface.par')
+
+
+class FakeDriveTrain:
+    """A drive train whose sensors are set by the test."""
+
+    def __init__(self):
+        self.heading = 0.0
+        self.distance = 0.0
+        self.range = 0.0
+        self.drives = []
+
+    def get_heading(self):
+        return self.heading
+
+    def get_distance_traveled(self):
+        return self.distance
+
+    def get_range(self):
+        return self.range
+
+    def directional_drive(self, linear, turn):
+        self.drives.append((linear, turn))
+
+
+def step(routine):
+    """Run a routine for one loop, and return True if it's still running."""
+    try:
+        next(routine)
+    except StopIteration:
+        return False
+    return True
+
+
+class TestAimCombinedDrive:
+    """Test aiming by driving and turning at the same time."""
+
+    def setup_method(self, method):
+        """Setup each test."""
+        # Only the aiming parameters are needed, so skip the constructor,
+        # which creates all of the subsystems and starts the target server
+        self._robot = robot.MyRobot.__new__(robot.MyRobot)
+        self._robot._parameters_file = PARAMETERS_FILE
+        self._robot.load_parameters()
+        self._drive_train = FakeDriveTrain()
+        self._robot._drive_train = self._drive_train
+        self._target = None
+
+    def _aim(self):
+        """Start aiming at whatever the current target is."""
+        return self._robot._aim_combined_drive(lambda: self._target)
+
+    def _new_frame(self, distance, angle):
+        """Receive a new camera frame with a target on the left."""
+        self._target = target.Target(target.Side.LEFT, distance, angle)
+
+    def test_disabled_by_default(self):
+        assert not self._robot._aim_combined
+
+    def test_drives_and_turns(self):
+        # 3 feet too far and 20 degrees to the right
+        self._new_frame(10.3, 20.0)
+        routine = self._aim()
+        assert step(routine)
+        assert self._drive_train.drives[-1] == pytest.approx((0.5, 0.4))
+
+    def test_holds_setpoints_between_frames(self):
+        self._new_frame(10.3, 20.0)
+        routine = self._aim()
+        assert step(routine)
+        # Without a new frame, the gyro and odometry close the errors
+        self._drive_train.heading = 15.0
+        self._drive_train.distance = 2.0
+        assert step(routine)
+        assert self._drive_train.drives[-1] == pytest.approx((0.3, 0.225))
+        self._drive_train.heading = 19.5
+        self._drive_train.distance = 2.8
+        assert not step(routine)
+        assert self._drive_train.drives[-1] == (0.0, 0.0)
+
+    def test_new_frame_sets_new_setpoints(self):
+        self._new_frame(10.3, 20.0)
+        routine = self._aim()
+        assert step(routine)
+        self._drive_train.heading = 15.0
+        self._drive_train.distance = 2.0
+        # The camera now sees the target 2 degrees to the left
+        self._new_frame(8.3, -2.0)
+        assert step(routine)
+        assert self._drive_train.drives[-1] == pytest.approx((0.3, -0.18))
+
+    def test_stops_when_aimed(self):
+        self._new_frame(7.5, 0.5)
+        assert not step(self._aim())
+        assert self._drive_train.drives == [(0.0, 0.0)]
+
+    def test_stops_without_target(self):
+        self._new_frame(10.3, 20.0)
+        routine = self._aim()
+        assert step(routine)
+        self._target = None
+        assert not step(routine)
+        assert self._drive_train.drives[-1] == (0.0, 0.0)
+
+    def test_stops_for_unknown_side(self):
+        self._target = target.Target(target.Side.UNKNOWN, 10.3, 20.0)
+        assert not step(self._aim())
+        assert self._drive_train.drives == [(0.0, 0.0)]
+
+
+class TestLCDStatus:
+    """Test the status text shown on the Driver Station LCD."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, clock):
+        """Setup each test."""
+        self._clock = clock
+        self._robot = robot.MyRobot.__new__(robot.MyRobot)
+        self._robot._parameters_file = PARAMETERS_FILE
+        self._robot.load_parameters()
+        self._robot._displayed_range = None
+        self._robot._autoscript_filename = 'twoball.as'
+        self._drive_train = FakeDriveTrain()
+        self._robot._drive_train = self._drive_train
+        self._ui = userinterface.UserInterface(UI_PARAMETERS_FILE)
+        self._lcd = lcdbuffer.LCDBuffer(clock=self._clock.time)
+        self._ui._lcd_buffer = self._lcd
+        self._robot._user_interface = self._ui
+        yield
+        self._ui.dispose()
+
+    def test_autoscript_shown_after_message_time(self):
+        self._robot._print_autoscript()
+        self._drive_train.range = 12.3
+        self._robot._print_range()
+        self._clock.now += self._ui._message_display_time + 1.0
+        self._drive_train.range = 10.1
+        self._robot._print_range()
+        assert self._lcd.get_line(0) == 'Range: 10.1'
+        assert self._lcd.get_line(1) == 'twoball.as'
+
+    def test_autoscript_returns_after_message(self):
+        self._robot._print_autoscript()
+        self._ui.output_user_message('Profiling...', True)
+        self._ui.output_user_message('Controls swapped', False)
+        assert self._lcd.get_line(1) == 'Controls swapped'
+        self._clock.now += self._ui._message_display_time
+        assert self._lcd.get_line(1) == 'twoball.as'
@@ -0,0 +1,150 @@
+"""This module tests the sensorsampler module.
+
+    Packages(s) required:
+    - pytest
+
+"""
+
+# Imports
+import time
+import pytest
+import sensorsampler
+
+
+class TestRingBuffer:
+    """Test the RingBuffer class."""
+
+    def setup_method(self, method):
+        """Setup each test."""
+        self._rb = sensorsampler.RingBuffer(4)
+
+    def test_constructor(self):
+        assert self._rb.size == 4
+        assert len(self._rb) == 0
+        assert self._rb.get_latest() == None
+        assert self._rb.get_window(0.0) == []
+
+    def test_latest(self):
+        self._rb.append(1.0, 10)
+        self._rb.append(2.0, 20)
+        assert self._rb.get_latest() == (2.0, 20)
+        assert len(self._rb) == 2
+
+    def test_wraps(self):
+        for i in range(6):
+            self._rb.append(float(i), i * 10)
+        assert len(self._rb) == 4
+        assert self._rb.count == 6
+        assert self._rb.get_latest() == (5.0, 50)
+        assert self._rb.get_window(0.0) == [(2.0, 20), (3.0, 30), (4.0, 40),
+                                            (5.0, 50)]
+
+    def test_window(self):
+        for i in range(4):
+            self._rb.append(float(i), i)
+        assert self._rb.get_window(1.5) == [(2.0, 2), (3.0, 3)]
+        assert self._rb.get_window(1.0, 2.0) == [(1.0, 1), (2.0, 2)]
+
+    def test_clear(self):
+        self._rb.append(1.0, 10)
+        self._rb.clear()
+        assert len(self._rb) == 0
+        assert self._rb.get_latest() == None
+        self._rb.append(2.0, 20)
+        assert self._rb.get_window(0.0) == [(2.0, 20)]
+
+
+class TestSensorSampler:
+    """Test the SensorSampler class."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, clock):
+        """Setup each test."""
+        self._clock = clock
+        self._ss = sensorsampler.SensorSampler(0.002, 10, self._clock.time)
+        self._value = 0
+
+    def _read(self):
+        self._value += 1
+        return self._value
+
+    def test_sample(self):
+        buf = self._ss.add_sensor('count', self._read)
+        assert self._ss.get_buffer('count') is buf
+        assert buf.size == 10
+        assert self._ss.get_latest('count') == None
+        self._ss.sample()
+        self._clock.now += 0.002
+        self._ss.sample()
+        assert self._ss.get_latest('count') == 2
+        assert self._ss.samples == 2
+        assert buf.get_latest() == (pytest.approx(0.002), 2)
+
+    def test_buffer_size(self):
+        buf = self._ss.add_sensor('count', self._read, 3)
+        assert buf.size == 3
+
+    def test_window(self):
+        self._ss.add_sensor('count', self._read)
+        for i in range(5):
+            self._ss.sample()
+            self._clock.now += 0.002
+        assert [value for timestamp, value
+                in self._ss.get_window('count', 0.005)] == [4, 5]
+
+    def test_unknown_sensor(self):
+        assert self._ss.get_latest('nothing') == None
+        assert self._ss.get_window('nothing', 1.0) == []
+
+    def test_sensor_error(self):
+        def broken():
+            raise IOError("no sensor")
+        self._ss.add_sensor('broken', broken)
+        self._ss.add_sensor('count', self._read)
+        self._ss.sample()
+        assert self._ss.errors == 1
+        assert self._ss.get_latest('broken') == None
+        assert self._ss.get_latest('count') == 1
+
+    def test_thread(self):
+        ss = sensorsampler.SensorSampler(0.001)
+        ss.add_sensor('count', self._read)
+        ss.start()
+        time.sleep(0.05)
+        ss.stop()
+        ss.join(1.0)
+        assert not ss.is_alive()
+        assert ss.samples > 5
+        assert ss.get_latest('count') == self._value
+
+
+class TestFitMotion:
+    """Test the fit_motion function."""
+
+    def test_too_few_samples(self):
+        assert sensorsampler.fit_motion([]) == (0.0, 0.0)
+        assert sensorsampler.fit_motion([(1.0, 5.0)]) == (0.0, 0.0)
+
+    def test_two_samples(self):
+        velocity, acceleration = sensorsampler.fit_motion([(1.0, 5.0),
+                                                           (1.5, 6.0)])
+        assert velocity == pytest.approx(2.0)
+        assert acceleration == 0.0
+
+    def test_constant_velocity(self):
+        samples = [(100.0 + i * 0.01, 3.0 * i * 0.01) for i in range(10)]
+        velocity, acceleration = sensorsampler.fit_motion(samples)
+        assert velocity == pytest.approx(3.0)
+        assert acceleration == pytest.approx(0.0, abs=1e-6)
+
+    def test_constant_acceleration(self):
+        # p = 1 + 2t + 2t^2, so at t = 0.09 v = 2.36 and a = 4
+        samples = [(i * 0.01, 1.0 + 2.0 * (i * 0.01) + 2.0 * (i * 0.01) ** 2)
+                   for i in range(10)]
+        velocity, acceleration = sensorsampler.fit_motion(samples)
+        assert velocity == pytest.approx(2.36)
+        assert acceleration == pytest.approx(4.0)
+
+    def test_same_time(self):
+        samples = [(1.0, 1.0), (1.0, 2.0), (1.0, 3.0)]
+        assert sensorsampler.fit_motion(samples) == (0.0, 0.0)
@@ -0,0 +1,58 @@
+"""This module tests the shotcalibration module.
+
+    Packages(s) required:
+    - pytest
+
+"""
+
+# Imports
+import os
+import pytest
+import shotcalibration
+
+
+class TestShotCalibration:
+    """Test the ShotCalibration class."""
+
+    def setup_method(self, method):
+        """Setup each test."""
+        self._cal = shotcalibration.ShotCalibration()
+        self._cal.add_shot(1000.0, 10.0)
+        self._cal.add_shot(600.0, 6.0)
+        self._cal.add_shot(800.0, 8.0)
+
+    def test_empty(self):
+        cal = shotcalibration.ShotCalibration()
+        assert len(cal) == 0
+        assert cal.get_velocity(8.0) is None
+
+    def test_calibrated_distance(self):
+        assert len(self._cal) == 3
+        assert self._cal.get_velocity(8.0) == 800.0
+
+    def test_interpolates(self):
+        assert self._cal.get_velocity(7.0) == pytest.approx(700.0)
+        assert self._cal.get_velocity(9.5) == pytest.approx(950.0)
+
+    def test_outside_calibration(self):
+        assert self._cal.get_velocity(2.0) == 600.0
+        assert self._cal.get_velocity(20.0) == 1000.0
+
+    def test_save_and_load(self, tmpdir):
+        path = str(tmpdir.join("shots.csv"))
+        assert self._cal.save(path)
+        cal = shotcalibration.ShotCalibration(path)
+        assert len(cal) == 3
+        assert cal.get_velocity(7.0) == pytest.approx(700.0)
+
+    def test_load_skips_bad_lines(self, tmpdir):
+        path = str(tmpdir.join("shots.csv"))
+        with open(path, "w") as f:
+            f.write("velocity,distance\n500,5\nnot,a number\n\n700,7\n")
+        cal = shotcalibration.ShotCalibration(path)
+        assert len(cal) == 2
+        assert cal.get_velocity(6.0) == pytest.approx(600.0)
+
+    def test_load_missing_file(self):
+        assert not self._cal.load("no_such_file.csv")
+        assert len(self._cal) == 0
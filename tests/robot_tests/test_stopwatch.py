@@ -242,3 +242,44 @@ class TestStopwatch:
         assert isinstance(val, float)
         assert val > 0
 
+
+class TestTimedAction:
+    """Test the TimedAction class."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, clock):
+        """Setup each test."""
+        self._clock = clock
+        self._ta = stopwatch.TimedAction(self._clock.time)
+
+    def test_constructor(self):
+        assert self._ta.is_started() == False
+        assert self._ta.is_running() == False
+        assert self._ta.is_expired() == False
+        assert self._ta.get_remaining() == None
+
+    def test_runs_for_duration(self):
+        self._ta.start(0.5)
+        assert self._ta.is_started() == True
+        assert self._ta.is_running() == True
+        assert self._ta.get_remaining() == pytest.approx(0.5)
+        self._clock.now += 0.4
+        assert self._ta.is_running() == True
+        assert self._ta.is_expired() == False
+        self._clock.now += 0.1
+        assert self._ta.is_running() == False
+        assert self._ta.is_expired() == True
+        assert self._ta.get_remaining() == 0.0
+
+    def test_cancel(self):
+        self._ta.start(0.5)
+        self._ta.cancel()
+        assert self._ta.is_started() == False
+        assert self._ta.is_running() == False
+        assert self._ta.is_expired() == False
+
+    def test_restart(self):
+        self._ta.start(0.5)
+        self._clock.now += 1.0
+        self._ta.start(0.5)
+        assert self._ta.is_running() == True
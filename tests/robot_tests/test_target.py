@@ -7,6 +7,7 @@
 
 # Imports
 import pytest
+import os
 import target
 
 
@@ -25,3 +26,133 @@ class TestTarget:
         assert t.angle == values['angle']
         assert t.is_hot == values['is_hot']
         assert t.confidence == values['confidence']
+
+    def test_default_constructor(self):
+        t = target.Target()
+        assert t.side == None
+        assert t.distance == None
+        assert t.angle == None
+        assert t.is_hot == None
+        assert t.confidence == None
+        assert t.no_targets == False
+
+    def test_positional_constructor(self):
+        t = target.Target(target.Side.RIGHT, 12.0, 3.5, True, 90.0, False)
+        assert t.side == target.Side.RIGHT
+        assert t.distance == 12.0
+        assert t.angle == 3.5
+        assert t.is_hot == True
+        assert t.confidence == 90.0
+        assert t.no_targets == False
+
+    def test_no_instance_dictionary(self):
+        t = target.Target()
+        assert not hasattr(t, '__dict__')
+        with pytest.raises(AttributeError):
+            t.unknown = 1
+
+    def test_from_dict_ignores_unknown_keys(self):
+        t = target.Target.from_dict({'side':0, 'angle':1.0, 'extra':5})
+        assert t.side == 0
+        assert t.angle == 1.0
+        assert t.distance == None
+        assert t.no_targets == False
+
+    def test_from_dict_not_hot_by_default(self):
+        t = target.Target.from_dict({'side':0})
+        assert t.is_hot is False
+
+    def test_driver_station_copy_matches(self):
+        robot_file = target.__file__
+        driver_station_file = os.path.join(os.path.dirname(robot_file), '..',
+                                           'driver_station', 'target.py')
+        with open(robot_file) as robot_copy:
+            with open(driver_station_file) as driver_station_copy:
+                assert robot_copy.read() == driver_station_copy.read()
+
+
+class TestDecodeTargets:
+    """Test the decode_targets function."""
+
+    def test_decode_list(self):
+        data = ('[{"side": 1, "distance": 10.1, "angle": -5.0, '
+                '"is_hot": true, "confidence": 80.0, "no_targets": false}, '
+                '{"side": 0, "distance": 8.0, "angle": 2.0, '
+                '"is_hot": false, "confidence": 0.0, "no_targets": false}]')
+        targets = target.decode_targets(data)
+        assert len(targets) == 2
+        assert isinstance(targets[0], target.Target)
+        assert targets[0].side == 1
+        assert targets[0].distance == 10.1
+        assert targets[0].angle == -5.0
+        assert targets[0].is_hot == True
+        assert targets[0].confidence == 80.0
+        assert targets[1].side == 0
+        assert targets[1].is_hot == False
+
+    def test_decode_no_targets(self):
+        data = ('[{"side": "None", "distance": "None", "angle": "None", '
+                '"is_hot": "None", "confidence": "None", "no_targets": true}]')
+        targets = target.decode_targets(data)
+        assert len(targets) == 1
+        assert targets[0].no_targets == True
+
+    def test_decode_not_a_list(self):
+        assert target.decode_targets('{"side": 1}') == None
+
+    def test_decode_skips_non_objects(self):
+        targets = target.decode_targets('[1, {"side": 1}, "abc"]')
+        assert len(targets) == 1
+        assert targets[0].side == 1
+
+    def test_decode_invalid_json(self):
+        with pytest.raises(ValueError):
+            target.decode_targets('[{"side": 1')
+
+
+class TestTargetSnapshot:
+    """Test the TargetSnapshot class."""
+
+    def setup_method(self, method):
+        """Setup each test."""
+        self._left = target.Target(target.Side.LEFT, 10.0, -12.0, False, 60.0)
+        self._left_best = target.Target(target.Side.LEFT, 11.0, 8.0, True,
+                                        90.0)
+        self._right = target.Target(target.Side.RIGHT, 12.0, 3.0, False, 70.0)
+
+    def test_empty(self):
+        snapshot = target.TargetSnapshot()
+        assert len(snapshot) == 0
+        assert not snapshot
+        assert snapshot.nearest == None
+        assert snapshot.any_hot == False
+        assert snapshot.get_best(target.Side.LEFT) == None
+        assert snapshot.get_best(target.Side.EITHER) == None
+        assert snapshot.is_hot(target.Side.EITHER) == False
+
+    def test_selections(self):
+        snapshot = target.TargetSnapshot([self._left, self._left_best,
+                                          self._right])
+        assert len(snapshot) == 3
+        assert snapshot.targets == (self._left, self._left_best, self._right)
+        assert snapshot.nearest is self._right
+        assert snapshot.get_best(target.Side.LEFT) is self._left_best
+        assert snapshot.get_best(target.Side.RIGHT) is self._right
+        assert snapshot.get_best(target.Side.EITHER) is self._left_best
+        assert snapshot.any_hot == True
+
+    def test_left_side_is_not_ignored(self):
+        snapshot = target.TargetSnapshot([self._left_best, self._right])
+        assert snapshot.is_hot(target.Side.LEFT) == True
+        assert snapshot.is_hot(target.Side.RIGHT) == False
+        assert snapshot.is_hot(target.Side.EITHER) == True
+
+    def test_from_message(self):
+        snapshot = target.TargetSnapshot.from_message([self._right])
+        assert snapshot.targets == (self._right,)
+
+    def test_from_message_no_targets(self):
+        marker = target.Target(no_targets=True)
+        assert len(target.TargetSnapshot.from_message([marker])) == 0
+        assert len(target.TargetSnapshot.from_message(None)) == 0
+        assert len(target.TargetSnapshot.from_message('abc')) == 0
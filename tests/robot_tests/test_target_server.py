@@ -0,0 +1,69 @@
+"""This module tests the target_server module.
+
+    Packages(s) required:
+    - pytest
+
+"""
+
+# Imports
+import pytest
+import queue
+import socket
+import threading
+import target_server
+import telemetry
+
+
+class TestServerWithQueue:
+    """Test the ServerWithQueue and TargetHandler classes over loopback."""
+
+    def setup_method(self, method):
+        """Setup each test."""
+        self._queue = queue.Queue(1)
+        self._telemetry = telemetry.Telemetry()
+        self._telemetry.update(gyro_angle=5.0, program_state=2)
+        self._server = target_server.ServerWithQueue(('127.0.0.1', 0),
+                                                     target_server.TargetHandler,
+                                                     self._queue,
+                                                     self._telemetry, 0.01)
+        self._thread = threading.Thread(target=self._server.serve_forever)
+        self._thread.daemon = True
+        self._thread.start()
+        self._sock = socket.create_connection(self._server.server_address, 5)
+
+    def teardown_method(self, method):
+        """Clean up after each test."""
+        self._sock.close()
+        self._server.shutdown()
+        self._server.server_close()
+
+    def test_receive_targets(self):
+        self._sock.sendall(b'[{"side": 1, "distance": 10.1, "angle": -5.0, '
+                           b'"is_hot": true, "confidence": 80.0, '
+                           b'"no_targets": false}]\n')
+        targets = self._queue.get(timeout=5)
+        assert len(targets) == 1
+        assert targets[0].side == 1
+        assert targets[0].distance == 10.1
+        assert targets[0].is_hot == True
+
+    def test_invalid_json_is_skipped(self):
+        self._sock.sendall(b'[{"side": 1\n[{"side": 0}]\n')
+        targets = self._queue.get(timeout=5)
+        assert len(targets) == 1
+        assert targets[0].side == 0
+
+    def test_receive_telemetry(self):
+        decoder = telemetry.TelemetryDecoder()
+        stream = self._sock.makefile('rb')
+        assert decoder.decode(stream.readline().decode('utf-8'))
+        assert decoder.values['gyro_angle'] == pytest.approx(5.0)
+        assert decoder.values['program_state'] == 2
+        self._telemetry.update(gyro_angle=7.5)
+        for i in range(100):
+            decoder.decode(stream.readline().decode('utf-8'))
+            if decoder.values['gyro_angle'] == pytest.approx(7.5):
+                break
+        assert decoder.values['gyro_angle'] == pytest.approx(7.5)
+        assert decoder.synchronized
+        stream.close()
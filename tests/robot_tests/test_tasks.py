@@ -0,0 +1,153 @@
+"""This module tests the tasks module.
+
+    Packages(s) required:
+    - pytest
+
+"""
+
+# Imports
+import pytest
+import tasks
+
+
+class Routine(object):
+    """A routine that records how far it got."""
+
+    def __init__(self, ticks, clock=None, tick_time=0.0):
+        self.ticks = ticks
+        self.count = 0
+        self.closed = False
+        self._clock = clock
+        self._tick_time = tick_time
+
+    def run(self):
+        try:
+            for i in range(self.ticks):
+                self.count += 1
+                if self._clock:
+                    self._clock.now += self._tick_time
+                yield
+        finally:
+            self.closed = True
+
+
+def failing_routine():
+    yield
+    raise ValueError("routine failed")
+
+
+class TestTaskScheduler:
+    """Test the TaskScheduler class."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, clock):
+        """Setup each test."""
+        self._clock = clock
+        self._ts = tasks.TaskScheduler(self._clock.time)
+
+    def test_constructor(self):
+        assert self._ts.is_idle() == True
+        assert self._ts.get_statistics() == []
+
+    def test_runs_until_finished(self):
+        routine = Routine(2)
+        self._ts.start('r', routine.run())
+        assert self._ts.is_running('r') == True
+        self._ts.run()
+        self._ts.run()
+        assert self._ts.is_running('r') == True
+        self._ts.run()
+        assert self._ts.is_running('r') == False
+        assert self._ts.is_idle() == True
+        assert routine.count == 2
+        stats = self._ts.get_statistics()[0]
+        assert stats.started == 1
+        assert stats.completed == 1
+        assert stats.cancelled == 0
+        assert stats.ticks == 3
+
+    def test_tasks_run_together(self):
+        first = Routine(3)
+        second = Routine(3)
+        self._ts.start('first', first.run(), ('drive',))
+        self._ts.start('second', second.run(), ('shooter',))
+        self._ts.run()
+        assert first.count == 1
+        assert second.count == 1
+        assert self._ts.get_owner('drive') == 'first'
+        assert self._ts.get_owner('shooter') == 'second'
+        assert self._ts.get_owner('feeder') == None
+
+    def test_preempts_same_subsystem(self):
+        first = Routine(3)
+        second = Routine(3)
+        self._ts.start('first', first.run(), ('drive', 'shooter'))
+        self._ts.run()
+        self._ts.start('second', second.run(), ('shooter',))
+        assert first.closed == True
+        assert self._ts.is_running('first') == False
+        assert self._ts.get_owner('drive') == None
+        assert self._ts.get_owner('shooter') == 'second'
+
+    def test_restart_same_name(self):
+        first = Routine(3)
+        second = Routine(3)
+        self._ts.start('r', first.run())
+        self._ts.start('r', second.run())
+        self._ts.run()
+        assert first.count == 0
+        assert second.count == 1
+        assert self._ts.get_statistics()[0].started == 2
+        assert self._ts.get_statistics()[0].cancelled == 1
+
+    def test_cancel(self):
+        routine = Routine(3)
+        self._ts.start('r', routine.run())
+        self._ts.run()
+        assert self._ts.cancel('r') == True
+        assert self._ts.cancel('r') == False
+        assert routine.closed == True
+
+    def test_cancel_requiring(self):
+        first = Routine(3)
+        second = Routine(3)
+        self._ts.start('first', first.run(), ('drive',))
+        self._ts.start('second', second.run(), ('shooter',))
+        self._ts.cancel_requiring('drive')
+        assert self._ts.is_running('first') == False
+        assert self._ts.is_running('second') == True
+
+    def test_cancel_all(self):
+        self._ts.start('first', Routine(3).run())
+        self._ts.start('second', Routine(3).run())
+        self._ts.cancel_all()
+        assert self._ts.is_idle() == True
+
+    def test_task_started_during_run(self):
+        routine = Routine(1)
+
+        def starter():
+            self._ts.start('started', routine.run())
+            yield
+
+        self._ts.start('starter', starter())
+        self._ts.run()
+        assert self._ts.is_running('started') == True
+
+    def test_exception_removes_task(self):
+        self._ts.start('bad', failing_routine())
+        self._ts.run()
+        with pytest.raises(ValueError):
+            self._ts.run()
+        assert self._ts.is_idle() == True
+        assert self._ts.get_statistics()[0].cancelled == 1
+
+    def test_statistics_timing(self):
+        routine = Routine(2, self._clock, 0.002)
+        self._ts.start('r', routine.run())
+        self._ts.run()
+        self._ts.run()
+        stats = self._ts.get_statistics()[0]
+        assert stats.total_time == pytest.approx(0.004)
+        assert stats.max_time == pytest.approx(0.002)
+        assert stats.get_summary().startswith('r: 1 started, 0 completed')
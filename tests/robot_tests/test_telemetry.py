@@ -0,0 +1,109 @@
+"""This module tests the telemetry module.
+
+    Packages(s) required:
+    - pytest
+
+"""
+
+# Imports
+import pytest
+import json
+import telemetry
+
+
+class TestTelemetry:
+    """Test the Telemetry class."""
+
+    def setup_method(self, method):
+        """Setup each test."""
+        self._t = telemetry.Telemetry()
+
+    def test_constructor(self):
+        values = self._t.get_values()
+        assert len(values) == len(telemetry.FIELDS)
+        for value in values.values():
+            assert value == None
+
+    def test_update(self):
+        self._t.update(gyro_angle=12.5, range=7.3)
+        values = self._t.get_values()
+        assert values['gyro_angle'] == 12.5
+        assert values['range'] == 7.3
+        assert values['encoder_count'] == None
+
+    def test_get_values_is_a_copy(self):
+        values = self._t.get_values()
+        values['gyro_angle'] = 5.0
+        assert self._t.get_values()['gyro_angle'] == None
+
+
+class TestTelemetryEncoder:
+    """Test the TelemetryEncoder and TelemetryDecoder classes."""
+
+    def setup_method(self, method):
+        """Setup each test."""
+        self._encoder = telemetry.TelemetryEncoder(key_interval=10)
+        self._decoder = telemetry.TelemetryDecoder()
+        self._values = {'gyro_angle': 12.3, 'range': 7.5, 'encoder_count': 300,
+                        'program_state': 3, 'loop_time': 0.0102}
+
+    def test_first_record_is_key(self):
+        record = json.loads(self._encoder.encode(self._values))
+        assert record['n'] == 0
+        assert record['k'] == 1
+        assert record['g'] == 123
+        assert record['r'] == 75
+        assert record['e'] == 300
+        assert record['s'] == 3
+        assert record['l'] == 102
+
+    def test_unchanged_record_is_empty(self):
+        self._encoder.encode(self._values)
+        record = json.loads(self._encoder.encode(self._values))
+        assert record == {'n': 1}
+
+    def test_delta_record(self):
+        self._encoder.encode(self._values)
+        self._values['gyro_angle'] = 10.0
+        self._values['encoder_count'] = 310
+        record = json.loads(self._encoder.encode(self._values))
+        assert record == {'n': 1, 'g': -23, 'e': 10}
+
+    def test_key_interval(self):
+        for i in range(10):
+            self._encoder.encode(self._values)
+        record = json.loads(self._encoder.encode(self._values))
+        assert record['n'] == 10
+        assert record['k'] == 1
+
+    def test_missing_field_forces_key(self):
+        self._encoder.encode(self._values)
+        self._values['range'] = None
+        record = json.loads(self._encoder.encode(self._values))
+        assert record['k'] == 1
+        assert 'r' not in record
+
+    def test_round_trip(self):
+        for i in range(25):
+            self._values['gyro_angle'] = i * 1.5
+            self._values['encoder_count'] = 300 - i * 7
+            assert self._decoder.decode(self._encoder.encode(self._values))
+            decoded = self._decoder.values
+            assert decoded['gyro_angle'] == pytest.approx(i * 1.5)
+            assert decoded['encoder_count'] == 300 - i * 7
+            assert decoded['range'] == pytest.approx(7.5)
+            assert decoded['loop_time'] == pytest.approx(0.0102)
+        assert self._decoder.synchronized
+
+    def test_decoder_waits_for_key_after_gap(self):
+        self._decoder.decode(self._encoder.encode(self._values))
+        self._encoder.encode(self._values)
+        self._values['gyro_angle'] = 20.0
+        assert not self._decoder.decode(self._encoder.encode(self._values))
+        assert not self._decoder.synchronized
+        assert self._decoder.values['gyro_angle'] == pytest.approx(12.3)
+
+    def test_decoder_ignores_invalid_records(self):
+        assert not self._decoder.decode('not json')
+        assert not self._decoder.decode('[1, 2]')
+        assert not self._decoder.decode('{"g": 5}')
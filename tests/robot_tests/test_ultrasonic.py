@@ -42,3 +42,93 @@ class TestRangeFinder:
         r = ultrasonic.RangeFinder(4)
         assert r.get_range_in_feet() == 0.0
 
+
+    def test_filtered_range_decimation(self):
+        r = ultrasonic.RangeFinder(5, 3, 50, 2, 1.0)
+        readings = [5.0, 2.0, 6.0, 3.0, 7.0, 4.0, 8.0]
+        r.get_range_in_feet = lambda: readings.pop(0)
+        # Until the window is full the current reading is returned
+        assert r.get_filtered_range_in_feet() == 5.0
+        assert r.get_filtered_range_in_feet() == 2.0
+        assert r.get_filtered_range_in_feet() == 6.0
+        assert r.get_filtered_range_in_feet() == 3.0
+        assert r.get_filtered_range_in_feet() == 7.0
+        # Only every 2nd reading is filtered: 2.0, 3.0 and 4.0
+        assert r.get_filtered_range_in_feet() == 3.0
+        assert r.get_filtered_range_in_feet() == 3.0
+
+    def test_filtered_range_floor(self):
+        r = ultrasonic.RangeFinder(6, 1, 50, 1, 1.0)
+        readings = [0.5, 2.0, 0.5]
+        r.get_range_in_feet = lambda: readings.pop(0)
+        assert r.get_filtered_range_in_feet() == 0.5
+        assert r.get_filtered_range_in_feet() == 2.0
+        assert r.get_filtered_range_in_feet() == 2.0
+
+    def test_filtered_range_decimation_period(self, clock):
+        r = ultrasonic.RangeFinder(7, 2, 100, 5, 1.0, 0.1, clock.time)
+        readings = [2.0, 9.0, 3.0]
+        r.get_range_in_feet = lambda: readings.pop(0)
+        assert r.get_filtered_range_in_feet() == 2.0
+        clock.now += 0.05
+        assert r.get_filtered_range_in_feet() == 9.0
+        clock.now += 0.05
+        assert r.get_filtered_range_in_feet() == 3.0
+
+
+class TestPercentileFilter:
+    """Test the PercentileFilter class."""
+
+    def setup_method(self, method):
+        """Setup each test."""
+        self._filter = ultrasonic.PercentileFilter(21, 90)
+
+    def test_constructor(self):
+        assert self._filter.window == 21
+        assert self._filter.percentile == 90
+        assert len(self._filter) == 0
+        assert self._filter.get_value() is None
+
+    def test_matches_sorted_index(self):
+        # The 90th percentile of 21 values is the 19th smallest
+        values = [float((i * 7) % 21) for i in range(21)]
+        for value in values:
+            self._filter.add(value)
+        assert self._filter.is_full()
+        assert self._filter.get_value() == sorted(values)[18]
+
+    def test_evicts_oldest(self):
+        f = ultrasonic.PercentileFilter(3, 100)
+        for value in [9.0, 1.0, 2.0]:
+            f.add(value)
+        assert f.get_value() == 9.0
+        f.add(3.0)
+        assert len(f) == 3
+        assert f.get_value() == 3.0
+
+    def test_duplicate_values(self):
+        f = ultrasonic.PercentileFilter(3, 0)
+        for value in [2.0, 2.0, 5.0, 5.0]:
+            f.add(value)
+        assert f.get_value() == 2.0
+        f.add(5.0)
+        assert f.get_value() == 5.0
+
+    def test_median(self):
+        f = ultrasonic.PercentileFilter(5, 50)
+        for value in [5.0, 1.0, 4.0, 2.0, 3.0]:
+            f.add(value)
+        assert f.get_value() == 3.0
+
+    def test_percentile_limits(self):
+        f = ultrasonic.PercentileFilter(0, 150)
+        assert f.window == 1
+        assert f.percentile == 100
+        f.add(4.0)
+        assert f.get_value() == 4.0
+
+    def test_clear(self):
+        self._filter.add(1.0)
+        self._filter.clear()
+        assert len(self._filter) == 0
+        assert self._filter.get_value() is None
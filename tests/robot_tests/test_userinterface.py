@@ -0,0 +1,113 @@
+"""This module tests the userinterface module.
+
+    Packages(s) required:
+    - pytest
+
+"""
+
+# Imports
+import pytest
+import os
+import userinterface
+from userinterface import JoystickAxis, JoystickButtons, UserControllers
+
+PARAMETERS_FILE = os.path.join(os.path.dirname(__file__), '..', '..',
+                               'parameter_files', 'userinterface.par')
+
+
+class FakeJoystick:
+    """A joystick with buttons and axes that are set by the test."""
+
+    def __init__(self):
+        self.buttons = set()
+        self.axes = {}
+
+    def GetRawButton(self, button):
+        return button in self.buttons
+
+    def GetRawAxis(self, axis):
+        return self.axes.get(axis, 0.0)
+
+
+class TestUserInterface:
+    """Test the UserInterface button and axis snapshot."""
+
+    def setup_method(self, method):
+        """Setup each test."""
+        self._ui = userinterface.UserInterface(PARAMETERS_FILE)
+        self._driver = FakeJoystick()
+        self._scoring = FakeJoystick()
+        self._ui._controller_1 = self._driver
+        self._ui._controller_2 = self._scoring
+
+    def teardown_method(self, method):
+        """Clean up after each test."""
+        self._ui.dispose()
+
+    def _next_loop(self):
+        """Store the button states and read the controllers, like a loop."""
+        self._ui.store_button_states(UserControllers.DRIVER)
+        self._ui.store_button_states(UserControllers.SCORING)
+        self._ui.update()
+
+    def test_press(self):
+        self._ui.update()
+        self._driver.buttons.add(JoystickButtons.A)
+        self._next_loop()
+        driver = UserControllers.DRIVER
+        assert self._ui.button_pressed(driver, JoystickButtons.A)
+        assert self._ui.button_state_changed(driver, JoystickButtons.A)
+        assert not self._ui.button_released(driver, JoystickButtons.A)
+        assert self._ui.get_button_state(driver, JoystickButtons.A) == 1
+        assert not self._ui.button_pressed(driver, JoystickButtons.B)
+
+    def test_hold(self):
+        self._driver.buttons.add(JoystickButtons.A)
+        self._ui.update()
+        self._next_loop()
+        driver = UserControllers.DRIVER
+        assert not self._ui.button_pressed(driver, JoystickButtons.A)
+        assert not self._ui.button_state_changed(driver, JoystickButtons.A)
+        assert self._ui.get_button_state(driver, JoystickButtons.A) == 1
+
+    def test_release(self):
+        self._driver.buttons.add(JoystickButtons.A)
+        self._ui.update()
+        self._driver.buttons.discard(JoystickButtons.A)
+        self._next_loop()
+        driver = UserControllers.DRIVER
+        assert self._ui.button_released(driver, JoystickButtons.A)
+        assert self._ui.button_state_changed(driver, JoystickButtons.A)
+        assert not self._ui.button_pressed(driver, JoystickButtons.A)
+        assert self._ui.get_button_state(driver, JoystickButtons.A) == 0
+
+    def test_not_stored(self):
+        self._ui.update()
+        self._driver.buttons.add(JoystickButtons.A)
+        self._ui.update()
+        self._ui.update()
+        driver = UserControllers.DRIVER
+        assert self._ui.button_pressed(driver, JoystickButtons.A)
+
+    def test_controllers_separate(self):
+        self._scoring.buttons.add(JoystickButtons.X)
+        self._next_loop()
+        assert self._ui.button_pressed(UserControllers.SCORING,
+                                       JoystickButtons.X)
+        assert not self._ui.button_pressed(UserControllers.DRIVER,
+                                           JoystickButtons.X)
+
+    def test_snapshot_until_update(self):
+        self._ui.update()
+        self._driver.buttons.add(JoystickButtons.A)
+        assert self._ui.get_button_state(UserControllers.DRIVER,
+                                         JoystickButtons.A) == 0
+
+    def test_axis_dead_band(self):
+        self._driver.axes[JoystickAxis.LEFTY] = 0.5
+        self._driver.axes[JoystickAxis.RIGHTX] = 0.01
+        self._ui.update()
+        driver = UserControllers.DRIVER
+        assert self._ui.get_axis_value(driver, JoystickAxis.LEFTY) == 0.5
+        assert self._ui.get_axis_value(driver, JoystickAxis.RIGHTX) == 0.0
+        assert self._ui.get_axis_value(driver, 20) == 0.0